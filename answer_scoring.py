@@ -0,0 +1,160 @@
+"""
+TalentScout - Answer Scoring
+Background pipeline that scores candidate answers with the LLM, several
+answers per request, without holding up the conversation.
+"""
+
+import json
+import os
+import queue
+import threading
+import time
+
+from json_stream import extract_json_array
+from metrics import metrics
+from questions import request_completion
+
+# Scoring settings (ANSWER_SCORING=0 disables the pipeline)
+ANSWER_SCORING = os.getenv('ANSWER_SCORING', '1') == '1'
+ANSWER_SCORING_WORKERS = int(os.getenv('ANSWER_SCORING_WORKERS', '2'))
+ANSWER_SCORING_BATCH_SIZE = int(os.getenv('ANSWER_SCORING_BATCH_SIZE', '8'))
+ANSWER_SCORING_BATCH_WAIT = float(os.getenv('ANSWER_SCORING_BATCH_WAIT', '0.5'))
+ANSWER_SCORING_QUEUE_SIZE = int(os.getenv('ANSWER_SCORING_QUEUE_SIZE', '1000'))
+ANSWER_SCORING_TIMEOUT = float(os.getenv('ANSWER_SCORING_TIMEOUT', '30'))
+
+# Longest answer sent for scoring, in characters
+MAX_ANSWER_CHARS = 2000
+# Rough completion budget for one score and its feedback
+TOKENS_PER_SCORE_ESTIMATE = 60
+
+SCORING_SYSTEM_PROMPT = "You are a technical interviewer grading candidate answers. Respond with valid JSON."
+
+
+class ScoringJob:
+    """One answer waiting to be scored."""
+
+    __slots__ = ('question_id', 'tech', 'question', 'answer', 'on_score', 'queued_at')
+
+    def __init__(self, question_id, tech, question, answer, on_score):
+        self.question_id = question_id
+        self.tech = tech
+        self.question = question
+        self.answer = answer[:MAX_ANSWER_CHARS]
+        self.on_score = on_score
+        self.queued_at = time.monotonic()
+
+
+def build_scoring_prompt(jobs):
+    """Return the prompt asking for a score for every job in the batch."""
+    answers = [{'id': str(i), 'tech': job.tech, 'question': job.question, 'answer': job.answer}
+               for i, job in enumerate(jobs)]
+    return f"""Score each candidate answer below from 1 (wrong or missing) to 10 (complete and correct).
+{json.dumps(answers, ensure_ascii=False, indent=1)}
+Format as a JSON object with one entry per answer id:
+{{"scores": [{{"id": "0", "score": 7, "feedback": "One sentence on what was good or missing."}}]}}"""
+
+
+def parse_scores(content, count):
+    """Map answer index to {'score', 'feedback'} from the model's reply; skip unusable entries."""
+    parsed = extract_json_array(content)
+    if not parsed:
+        metrics.inc('llm_json_parse_failures_total', kind='score')
+
+    scores = {}
+    for entry in parsed:
+        if not isinstance(entry, dict):
+            continue
+        try:
+            index = int(entry.get('id'))
+            score = int(entry.get('score'))
+        except (TypeError, ValueError):
+            continue
+        if 0 <= index < count:
+            scores[index] = {'score': min(10, max(1, score)), 'feedback': str(entry.get('feedback', ''))}
+    return scores
+
+
+class AnswerScorer:
+    """Bounded job queue drained by a small pool of batching workers.
+
+    submit() never blocks: when the queue is full the answer is left unscored
+    and counted. Each worker takes the first queued job, gathers up to
+    batch_size - 1 more for batch_wait seconds, scores them in one LLM request
+    and hands every result to its job's on_score(question_id, result) callback.
+    """
+
+    def __init__(self, workers=ANSWER_SCORING_WORKERS, batch_size=ANSWER_SCORING_BATCH_SIZE,
+                 batch_wait=ANSWER_SCORING_BATCH_WAIT, queue_size=ANSWER_SCORING_QUEUE_SIZE,
+                 timeout=ANSWER_SCORING_TIMEOUT):
+        self.batch_size = max(1, batch_size)
+        self.batch_wait = batch_wait
+        self.timeout = timeout
+        self._queue = queue.Queue(maxsize=queue_size)
+        for i in range(max(1, workers)):
+            threading.Thread(target=self._worker, name=f'answer-scoring-{i}', daemon=True).start()
+        metrics.gauge_callback('answer_scoring_queue_depth', self._queue.qsize)
+
+    def submit(self, question_id, tech, question, answer, on_score):
+        """Queue an answer for scoring; return False if it was dropped."""
+        try:
+            self._queue.put_nowait(ScoringJob(question_id, tech, question, answer, on_score))
+        except queue.Full:
+            metrics.inc('answers_scored_total', status='dropped')
+            return False
+        return True
+
+    def _next_batch(self):
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.batch_wait
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _worker(self):
+        while True:
+            batch = self._next_batch()
+            try:
+                self.score_batch(batch)
+            except Exception as e:
+                metrics.inc('answers_scored_total', len(batch), status='failed')
+                metrics.inc('answer_scoring_errors_total', error=type(e).__name__)
+
+    def score_batch(self, jobs):
+        """Score jobs in one request and deliver the results that came back."""
+        metrics.observe('answer_scoring_batch_size', len(jobs), buckets=(1, 2, 4, 8, 16, 32))
+        content = request_completion(
+            'score', build_scoring_prompt(jobs),
+            max_tokens=TOKENS_PER_SCORE_ESTIMATE * len(jobs) + 50,
+            timeout=self.timeout, system=SCORING_SYSTEM_PROMPT
+        )
+        scores = parse_scores(content, len(jobs))
+
+        now = time.monotonic()
+        for index, job in enumerate(jobs):
+            result = scores.get(index)
+            if result is None:
+                metrics.inc('answers_scored_total', status='failed')
+                continue
+            job.on_score(job.question_id, {'tech': job.tech, **result})
+            metrics.inc('answers_scored_total', status='scored')
+            metrics.observe('answer_scoring_lag_seconds', now - job.queued_at)
+
+
+_scorer = None
+_scorer_lock = threading.Lock()
+
+
+def get_answer_scorer():
+    """Return the process-wide answer scorer, or None when scoring is off or no API key is set."""
+    global _scorer
+    if not ANSWER_SCORING or not os.getenv('OPENAI_API_KEY'):
+        return None
+    if _scorer is None:
+        with _scorer_lock:
+            if _scorer is None:
+                _scorer = AnswerScorer()
+    return _scorer
@@ -4,15 +4,68 @@ An AI-powered chatbot that collects candidate information and generates technica
 """
 
 import streamlit as st
-import openai
 import os
 import re
-import json
-from datetime import datetime
 from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
+# Streamlit re-executes this script on every interaction; anything that only
+# needs doing once per process goes through st.cache_resource below
+
+
+@st.cache_resource
+def load_environment():
+    """Load .env once per process, before the app modules read their settings."""
+    load_dotenv()
+
+
+load_environment()
+
+from engine import (  # noqa: E402
+    SessionState,
+    handle_message,
+    load_session,
+    start_questions,
+    start_session_reaper,
+    take_generation_errors,
+)
+from metrics import metrics, start_exporters  # noqa: E402
+from profiling import is_admin_token, profile_rerun  # noqa: E402
+from session_store import get_session_store  # noqa: E402
+
+STYLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static', 'style.css')
+
+CANDIDATE_FIELDS = {
+    'name': 'Full Name',
+    'email': 'Email',
+    'phone': 'Phone',
+    'experience': 'Experience',
+    'position': 'Position',
+    'location': 'Location',
+}
+
+
+@st.cache_resource
+def start_process():
+    """Start the background services once per process."""
+    # Serve /metrics or dump JSONL snapshots if configured
+    start_exporters()
+    start_session_reaper()
+
+
+@st.cache_resource
+def page_style():
+    """Read and minify the stylesheet once per process."""
+    with open(STYLE_PATH, encoding='utf-8') as f:
+        css = f.read()
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.DOTALL)
+    css = re.sub(r'\s*([{}:;,])\s*', r'\1', re.sub(r'\s+', ' ', css)).strip()
+    return f'<style>{css}</style>'
+
+
+start_process()
+
+# App behaviour settings
+CHAT_WINDOW = int(os.getenv('CHAT_WINDOW', '20'))
 
 # Configure Streamlit page
 st.set_page_config(
@@ -22,197 +75,32 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS styling
-st.markdown("""
-    <style>
-    @import url('https://fonts.googleapis.com/css2?family=Poppins:wght@400;500;600;700&family=Roboto:wght@400;500;700&display=swap');
-    
-    .stApp {
-        background: linear-gradient(135deg, #F5F7FA 0%, #E4E8EC 100%);
-    }
-    
-    .header-container {
-        background: linear-gradient(135deg, #1E3A5F 0%, #2C5282 100%);
-        padding: 20px 30px;
-        border-radius: 15px;
-        margin-bottom: 25px;
-        box-shadow: 0 4px 15px rgba(30, 58, 95, 0.3);
-    }
-    
-    .header-title {
-        font-family: 'Poppins', sans-serif;
-        color: #FFFFFF;
-        font-size: 28px;
-        font-weight: 700;
-        margin: 0;
-    }
-    
-    .header-subtitle {
-        font-family: 'Roboto', sans-serif;
-        color: #B8C5D6;
-        font-size: 14px;
-        margin-top: 5px;
-    }
-    
-    .chat-container {
-        max-height: 500px;
-        overflow-y: auto;
-        padding: 20px;
-        background: white;
-        border-radius: 15px;
-        box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-        margin-bottom: 20px;
-    }
-    
-    .message {
-        padding: 15px 20px;
-        border-radius: 15px;
-        margin-bottom: 12px;
-        font-family: 'Roboto', sans-serif;
-        font-size: 15px;
-        line-height: 1.6;
-        animation: fadeIn 0.3s ease-in;
-    }
-    
-    @keyframes fadeIn {
-        from { opacity: 0; transform: translateY(10px); }
-        to { opacity: 1; transform: translateY(0); }
-    }
-    
-    .bot-message {
-        background: linear-gradient(135deg, #E3F2FD 0%, #BBDEFB 100%);
-        color: #1E3A5F;
-        border-left: 4px solid #1E3A5F;
-        margin-right: 50px;
-    }
-    
-    .user-message {
-        background: linear-gradient(135deg, #E8F5E9 0%, #C8E6C9 100%);
-        color: #1B5E20;
-        border-right: 4px solid #2E7D32;
-        margin-left: 50px;
-    }
-    
-    .stTextInput > div > div > input {
-        border-radius: 25px;
-        padding: 12px 20px;
-        font-family: 'Roboto', sans-serif;
-        font-size: 15px;
-        border: 2px solid #E0E0E0;
-    }
-    
-    .stTextInput > div > div > input:focus {
-        border-color: #1E3A5F;
-        box-shadow: 0 0 0 3px rgba(30, 58, 95, 0.1);
-    }
-    
-    .stButton > button {
-        border-radius: 25px;
-        padding: 12px 30px;
-        font-family: 'Poppins', sans-serif;
-        font-weight: 600;
-        background: linear-gradient(135deg, #1E3A5F 0%, #2C5282 100%);
-        color: white;
-        border: none;
-        transition: all 0.3s ease;
-    }
-    
-    .stButton > button:hover {
-        transform: translateY(-2px);
-        box-shadow: 0 4px 15px rgba(30, 58, 95, 0.4);
-    }
-    
-    .sidebar-title {
-        font-family: 'Poppins', sans-serif;
-        color: #1E3A5F;
-        font-size: 18px;
-        font-weight: 600;
-        margin-bottom: 15px;
-        padding-bottom: 10px;
-        border-bottom: 2px solid #1E3A5F;
-    }
-    
-    .info-item {
-        font-family: 'Roboto', sans-serif;
-        margin-bottom: 12px;
-        padding: 10px;
-        background: #F5F7FA;
-        border-radius: 8px;
-    }
-    
-    .info-label {
-        color: #666;
-        font-size: 12px;
-        text-transform: uppercase;
-        letter-spacing: 0.5px;
-    }
-    
-    .info-value {
-        color: #1E3A5F;
-        font-size: 15px;
-        font-weight: 500;
-        margin-top: 3px;
-    }
-    
-    .tech-tag {
-        display: inline-block;
-        padding: 5px 12px;
-        background: linear-gradient(135deg, #FF6F00 0%, #FF8F00 100%);
-        color: white;
-        border-radius: 20px;
-        font-size: 13px;
-        font-family: 'Roboto', sans-serif;
-        margin: 3px;
-    }
-    
-    .question-card {
-        background: linear-gradient(135deg, #FFF8E1 0%, #FFECB3 100%);
-        padding: 20px;
-        border-radius: 12px;
-        border-left: 4px solid #FF6F00;
-        margin: 10px 0;
-    }
-    
-    .question-tech {
-        color: #FF6F00;
-        font-weight: 600;
-        font-size: 13px;
-        text-transform: uppercase;
-        letter-spacing: 1px;
-    }
-    
-    .question-text {
-        color: #5D4037;
-        font-size: 16px;
-        margin-top: 8px;
-        line-height: 1.5;
-    }
-    
-    .exit-banner {
-        background: linear-gradient(135deg, #FFEBEE 0%, #FFCDD2 100%);
-        padding: 15px 20px;
-        border-radius: 10px;
-        border-left: 4px solid #D32F2F;
-        color: #C62828;
-        font-family: 'Roboto', sans-serif;
-    }
-    </style>
-""", unsafe_allow_html=True)
+
+def restore_session(expired=False):
+    """Resume the session named in the URL from the session store, or start a new one."""
+    state = load_session(st.query_params.get('sid'))
+    if state is None:
+        state = SessionState()
+        if expired:
+            state.add_message("⏱️ Your previous session timed out after a period of inactivity. Let's start again!")
+    if get_session_store() is not None:
+        st.query_params['sid'] = state.session_id
+    return state
 
 
 def initialize_session_state():
     """Initialize all session state variables."""
+    previous = st.session_state.get('session')
+    if previous is None or previous.stage == 'expired':
+        # The idle-session reaper evicted this tab's session
+        st.session_state.session = restore_session(expired=previous is not None)
+        st.session_state.chat_fragments = []
+        st.session_state.chat_fragments_start = 0
+
     defaults = {
-        'conversation_stage': 'greeting',
-        'candidate_info': {},
-        'messages': [],
-        'current_question_index': 0,
-        'generated_questions': {},
-        'tech_stack': [],
-        'current_tech_index': 0,
-        'questions_asked': [],
-        'waiting_for_answer': False,
-        'current_question': None,
+        'chat_fragments': [],
+        'chat_fragments_start': 0,
+        'chat_window': CHAT_WINDOW,
     }
     
     for key, value in defaults.items():
@@ -220,254 +108,39 @@ def initialize_session_state():
             st.session_state[key] = value
 
 
-def validate_email(email):
-    """Validate email format."""
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return re.match(pattern, email) is not None
-
-
-def validate_phone(phone):
-    """Validate phone number (minimum 10 digits)."""
-    digits = re.sub(r'\D', '', phone)
-    return len(digits) >= 10
-
-
-def parse_tech_stack(tech_string):
-    """Parse and normalize tech stack input."""
-    if not tech_string:
-        return []
-    
-    techs = [t.strip() for t in tech_string.split(',')]
-    techs = [t for t in techs if t]
-    
-    normalization_map = {
-        'react': 'React', 'reactjs': 'React',
-        'angular': 'Angular', 'angularjs': 'Angular',
-        'vue': 'Vue.js', 'vuejs': 'Vue.js',
-        'node': 'Node.js', 'nodejs': 'Node.js',
-        'python': 'Python', 'django': 'Django', 'flask': 'Flask',
-        'java': 'Java', 'spring': 'Spring', 'springboot': 'Spring Boot',
-        'javascript': 'JavaScript', 'typescript': 'TypeScript',
-        'mysql': 'MySQL', 'mongodb': 'MongoDB',
-        'postgresql': 'PostgreSQL', 'postgres': 'PostgreSQL',
-        'redis': 'Redis', 'docker': 'Docker', 'kubernetes': 'Kubernetes',
-        'aws': 'AWS', 'azure': 'Azure', 'gcp': 'GCP', 'git': 'Git',
-    }
-    
-    normalized = []
-    for tech in techs:
-        tech_lower = tech.lower()
-        normalized.append(normalization_map.get(tech_lower, tech))
-    
-    return list(set(normalized))
-
-
-def generate_questions_with_llm(tech_stack):
-    """Generate technical questions using OpenAI API."""
-    if not tech_stack:
-        return {}
-    
-    api_key = os.getenv('OPENAI_API_KEY')
-    if not api_key:
-        return generate_fallback_questions(tech_stack)
-    
-    try:
-        openai.api_key = api_key
-        questions = {}
-        
-        for tech in tech_stack:
-            prompt = f"""Generate 3 intermediate-level technical interview questions for {tech}.
-Format as JSON array: ["Q1", "Q2", "Q3"]"""
-
-            response = openai.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are a technical interview question generator. Respond with valid JSON."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=500
-            )
-            
-            content = response.choices[0].message.content
-            try:
-                tech_questions = json.loads(content)
-                questions[tech] = tech_questions
-            except json.JSONDecodeError:
-                questions[tech] = generate_fallback_for_tech(tech)
-        
-        return questions
-        
-    except Exception as e:
-        st.error(f"Error generating questions: {str(e)}")
-        return generate_fallback_questions(tech_stack)
-
-
-def generate_fallback_questions(tech_stack):
-    """Generate fallback questions when API is not available."""
-    fallback_data = {
-        'Python': [
-            "Explain the difference between list and tuple in Python.",
-            "What are Python decorators and how would you create one?",
-            "Describe the concept of Python's Global Interpreter Lock (GIL).",
-        ],
-        'Django': [
-            "Explain the Django ORM and how model queries work.",
-            "What is Django middleware and how do you create custom middleware?",
-            "Describe Django's authentication system.",
-        ],
-        'React': [
-            "Explain the difference between useState and useEffect hooks.",
-            "What is the Virtual DOM and how does React use it?",
-            "Describe React's component lifecycle methods.",
-        ],
-        'JavaScript': [
-            "Explain closures in JavaScript with an example.",
-            "What is the difference between == and ===?",
-            "Describe the event loop in JavaScript.",
-        ],
-        'Java': [
-            "Explain the difference between abstract class and interface.",
-            "What is the purpose of the 'final' keyword in Java?",
-            "Describe the Java garbage collection mechanism.",
-        ],
-        'Spring Boot': [
-            "What is dependency injection in Spring?",
-            "Explain the difference between @Component, @Service, and @Repository.",
-            "How does Spring Boot auto-configuration work?",
-        ],
-        'MySQL': [
-            "Explain the difference between INNER JOIN and LEFT JOIN.",
-            "What are database indexes and how do they improve performance?",
-            "Describe the concept of database normalization.",
-        ],
-        'MongoDB': [
-            "Explain the difference between SQL and NoSQL databases.",
-            "What are MongoDB aggregation pipelines?",
-            "Describe MongoDB's document structure.",
-        ],
-        'Node.js': [
-            "Explain the event-driven architecture of Node.js.",
-            "What is the purpose of package.json in a Node.js project?",
-            "Describe asynchronous programming in Node.js.",
-        ],
-    }
-    
-    questions = {}
-    for tech in tech_stack:
-        questions[tech] = fallback_data.get(tech, [
-            f"Explain your experience with {tech}.",
-            f"What are the best practices for using {tech}?",
-            f"Describe a challenging project you worked on using {tech}.",
-        ])
-    
-    return questions
-
-
-def generate_fallback_for_tech(tech):
-    """Generate fallback questions for a single technology."""
-    return [
-        f"Explain your experience with {tech}.",
-        f"What are the best practices for using {tech}?",
-        f"Describe a challenging project you worked on using {tech}.",
-    ]
-
-
-def get_next_question():
-    """Get the next question from the generated pool."""
-    questions = st.session_state.generated_questions
-    tech_stack = st.session_state.tech_stack
-    
-    if not questions or not tech_stack:
-        return None, None
-    
-    for tech in tech_stack:
-        if tech in questions:
-            tech_questions = questions[tech]
-            for i, q in enumerate(tech_questions):
-                question_id = f"{tech}_{i}"
-                if question_id not in st.session_state.questions_asked:
-                    st.session_state.questions_asked.append(question_id)
-                    return q, tech
-    
-    return None, None
+def display_message(message, is_user=False):
+    """Display a message in the chat."""
+    css_class = "user-message" if is_user else "bot-message"
+    st.markdown(f'<div class="message {css_class}">{message}</div>', unsafe_allow_html=True)
 
 
-def check_exit_keywords(message):
-    """Check if message contains exit keywords."""
-    exit_keywords = ['exit', 'quit', 'bye', 'goodbye', 'thank you', 'thanks for your time']
-    return any(keyword in message.lower() for keyword in exit_keywords)
+def render_message_html(msg):
+    """Render a single chat message to its HTML fragment."""
+    css_class = "user-message" if msg.is_user else "bot-message"
+    return f'<div class="message {css_class}">{msg.text}</div>'
 
 
-def process_message(message):
-    """Process user message based on current conversation stage."""
-    
-    if check_exit_keywords(message):
-        return 'exit', None
-    
-    stage = st.session_state.conversation_stage
-    
-    if stage == 'greeting':
-        return 'name', "Great! Let's get started. What is your full name?"
-    
-    elif stage == 'name':
-        if len(message.strip()) < 2:
-            return 'name', "Please enter a valid name (at least 2 characters)."
-        st.session_state.candidate_info['name'] = message.strip()
-        return 'email', "Nice to meet you! What is your email address?"
-    
-    elif stage == 'email':
-        if not validate_email(message):
-            return 'email', "Please enter a valid email address (e.g., john@example.com)."
-        st.session_state.candidate_info['email'] = message.strip()
-        return 'phone', "Thank you! What is your phone number?"
-    
-    elif stage == 'phone':
-        if not validate_phone(message):
-            return 'phone', "Please enter a valid phone number (at least 10 digits)."
-        st.session_state.candidate_info['phone'] = message.strip()
-        return 'experience', "How many years of experience do you have?"
-    
-    elif stage == 'experience':
-        try:
-            exp = int(message.strip())
-            if exp < 0:
-                return 'experience', "Please enter a valid number of years (0 or more)."
-            st.session_state.candidate_info['experience'] = exp
-            return 'position', "What position are you applying for?"
-        except ValueError:
-            return 'experience', "Please enter a valid number for years of experience."
-    
-    elif stage == 'position':
-        if len(message.strip()) < 2:
-            return 'position', "Please enter a valid position name."
-        st.session_state.candidate_info['position'] = message.strip()
-        return 'location', "What is your current location (city)?"
+def render_chat_html(window):
+    """Build the chat transcript HTML for the last `window` messages.
     
-    elif stage == 'location':
-        if len(message.strip()) < 2:
-            return 'location', "Please enter a valid location."
-        st.session_state.candidate_info['location'] = message.strip()
-        return 'tech_stack', "Please enter your tech stack (comma-separated technologies, e.g., Python, Django, MySQL, React)"
+    Fragments are rendered once per message and cached in session state, so
+    each rerun only renders messages added since the previous one. Only the
+    visible window is cached; paging further back renders from the transcript.
+    """
+    fragments = st.session_state.chat_fragments
+    start = st.session_state.chat_fragments_start
+    messages = st.session_state.session.messages
+    total = len(messages)
+    first = max(0, total - window) if window else 0
     
-    elif stage == 'tech_stack':
-        techs = parse_tech_stack(message)
-        if not techs:
-            return 'tech_stack', "Please enter at least one technology in your tech stack."
-        st.session_state.tech_stack = techs
-        st.session_state.candidate_info['tech_stack'] = techs
-        return 'generating_questions', None
+    if first < start or first > start + len(fragments):
+        fragments[:] = [render_message_html(msg) for msg in messages[first:total]]
+    else:
+        fragments.extend(render_message_html(msg) for msg in messages[start + len(fragments):total])
+        del fragments[:first - start]
+    st.session_state.chat_fragments_start = first
     
-    elif stage == 'answering':
-        return 'next_question', None
-    
-    return stage, None
-
-
-def display_message(message, is_user=False):
-    """Display a message in the chat."""
-    css_class = "user-message" if is_user else "bot-message"
-    st.markdown(f'<div class="message {css_class}">{message}</div>', unsafe_allow_html=True)
+    return '<div class="chat-container">' + ''.join(fragments) + '</div>'
 
 
 def display_question(question, tech):
@@ -482,20 +155,11 @@ def display_question(question, tech):
 
 def display_candidate_info():
     """Display candidate information in sidebar."""
-    info = st.session_state.candidate_info
+    info = st.session_state.session.candidate_info
     
     st.markdown('<div class="sidebar-title">📋 Candidate Information</div>', unsafe_allow_html=True)
     
-    fields = {
-        'name': 'Full Name',
-        'email': 'Email',
-        'phone': 'Phone',
-        'experience': 'Experience',
-        'position': 'Position',
-        'location': 'Location',
-    }
-    
-    for key, label in fields.items():
+    for key, label in CANDIDATE_FIELDS.items():
         if key in info:
             value = info[key]
             if key == 'experience':
@@ -513,9 +177,17 @@ def display_candidate_info():
         st.markdown(f'<div style="margin-top: 5px;">{techs_html}</div>', unsafe_allow_html=True)
 
 
+def profiling_flagged():
+    """True once an admin has opened this session with ?profile=<PROFILE_ADMIN_TOKEN>."""
+    if is_admin_token(st.query_params.get('profile')):
+        st.session_state.profiling = True
+    return st.session_state.get('profiling', False)
+
+
 def main():
     """Main application function."""
     
+    st.markdown(page_style(), unsafe_allow_html=True)
     initialize_session_state()
     
     st.markdown("""
@@ -531,39 +203,38 @@ def main():
         display_candidate_info()
     
     with col_main:
-        chat_html = '<div class="chat-container">'
-        
-        for msg in st.session_state.messages:
-            is_user = msg['is_user']
-            css_class = "user-message" if is_user else "bot-message"
-            chat_html += f'<div class="message {css_class}">{msg["text"]}</div>'
+        state = st.session_state.session
+        window = st.session_state.chat_window
+        hidden = len(state.messages) - window
+        if hidden > 0:
+            if st.button(f"⬆ Show earlier messages ({hidden} hidden)", key="show_earlier"):
+                st.session_state.chat_window += CHAT_WINDOW
+                st.rerun()
+        elif window > CHAT_WINDOW and len(state.messages) > CHAT_WINDOW:
+            if st.button("⬇ Show recent messages only", key="show_recent"):
+                st.session_state.chat_window = CHAT_WINDOW
+                st.rerun()
         
-        chat_html += '</div>'
-        st.markdown(chat_html, unsafe_allow_html=True)
+        st.markdown(render_chat_html(window), unsafe_allow_html=True)
         
-        stage = st.session_state.conversation_stage
+        stage = state.stage
         
         if stage == 'generating_questions':
             with st.spinner('🔄 Generating technical questions based on your tech stack...'):
-                tech_stack = st.session_state.tech_stack
-                questions = generate_questions_with_llm(tech_stack)
-                st.session_state.generated_questions = questions
+                question, tech = start_questions(state, on_error=st.error)
             
-            question, tech = get_next_question()
             if question:
-                st.session_state.current_question = question
-                st.session_state.current_tech = tech
-                st.session_state.waiting_for_answer = True
-                st.session_state.conversation_stage = 'answering'
-                
-                display_message(f"Great! I've generated technical questions based on your tech stack: {', '.join(tech_stack)}", False)
+                display_message(f"Great! I've generated technical questions based on your tech stack: {', '.join(state.tech_stack)}", False)
                 display_question(question, tech)
             else:
                 display_message("I wasn't able to generate questions. Would you like to continue with the application process?", False)
         
-        elif stage == 'answering' and st.session_state.get('waiting_for_answer'):
-            question = st.session_state.current_question
-            tech = st.session_state.current_tech
+        elif stage == 'answering' and state.waiting_for_answer:
+            # Technologies still generating in the background can fail later on
+            for error in take_generation_errors(state):
+                st.error(error)
+            question = state.current_question
+            tech = state.current_tech
             if question:
                 display_question(question, tech)
         
@@ -576,63 +247,7 @@ def main():
         
         if st.button("Send ➤"):
             if user_input.strip():
-                st.session_state.messages.append({
-                    'text': user_input,
-                    'is_user': True,
-                    'timestamp': datetime.now().isoformat()
-                })
-                
-                new_stage, response = process_message(user_input)
-                
-                if new_stage == 'exit':
-                    name = st.session_state.candidate_info.get('name', 'Candidate')
-                    exit_message = f"👋 Thank you for your time, {name}! Our recruitment team will contact you shortly. Have a great day!"
-                    st.session_state.messages.append({
-                        'text': exit_message,
-                        'is_user': False,
-                        'timestamp': datetime.now().isoformat()
-                    })
-                    display_message(exit_message, False)
-                    st.session_state.conversation_stage = 'ended'
-                
-                elif new_stage == 'generating_questions':
-                    st.session_state.conversation_stage = new_stage
-                    st.rerun()
-                
-                elif new_stage == 'next_question':
-                    st.session_state.messages.append({
-                        'text': "Thank you for your answer! Let me ask the next question.",
-                        'is_user': False,
-                        'timestamp': datetime.now().isoformat()
-                    })
-                    
-                    question, tech = get_next_question()
-                    if question:
-                        st.session_state.current_question = question
-                        st.session_state.current_tech = tech
-                        st.session_state.messages.append({
-                            'text': f"**{tech}**: {question}",
-                            'is_user': False,
-                            'timestamp': datetime.now().isoformat()
-                        })
-                    else:
-                        name = st.session_state.candidate_info.get('name', 'Candidate')
-                        final_message = f"🎉 Thank you, {name}! You've completed the technical assessment. Our team will review your responses and get back to you soon."
-                        st.session_state.messages.append({
-                            'text': final_message,
-                            'is_user': False,
-                            'timestamp': datetime.now().isoformat()
-                        })
-                        st.session_state.conversation_stage = 'ended'
-                
-                elif response:
-                    st.session_state.messages.append({
-                        'text': response,
-                        'is_user': False,
-                        'timestamp': datetime.now().isoformat()
-                    })
-                    st.session_state.conversation_stage = new_stage
-                
+                handle_message(state, user_input)
                 st.rerun()
         
         if stage == 'ended':
@@ -645,4 +260,7 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    session = st.session_state.get('session')
+    label = session.session_id[:12] if session is not None else 'new'
+    with metrics.timer('rerun_seconds'), profile_rerun(label, profiling_flagged()):
+        main()
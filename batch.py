@@ -0,0 +1,249 @@
+"""
+TalentScout - Batch Mode
+Prepare question sets for a file of pre-registered candidates.
+
+Usage:
+    python batch.py candidates.csv --output questions.jsonl
+    python batch.py candidates.jsonl --output questions.jsonl --workers 16
+    python batch.py candidates.csv --output questions.jsonl --restart
+
+Input rows need name, email, phone and tech_stack fields; experience,
+position and location are copied through when present. CSV tech stacks are
+comma-separated, JSONL ones may also be lists. Each input row produces one
+output line, in input order, and progress is checkpointed next to the output
+so an interrupted run resumes where it stopped.
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+
+from dotenv import load_dotenv
+
+# Load environment variables before the modules below read their settings
+load_dotenv()
+
+from engine import parse_tech_stack, validate_email, validate_phone  # noqa: E402
+from metrics import metrics  # noqa: E402
+from questions import generate_questions_with_llm  # noqa: E402
+from tech_taxonomy import lookup_key  # noqa: E402
+
+CANDIDATE_FIELDS = ('name', 'email', 'phone', 'experience', 'position', 'location')
+
+# Distinct tech stacks whose questions are kept in memory for reuse
+STACK_MEMO_SIZE = 10000
+
+
+def read_candidates(path, fmt=None, skip=0):
+    """Yield (row number, record) from a CSV or JSONL file, starting after skip rows."""
+    fmt = fmt or ('csv' if path.lower().endswith('.csv') else 'jsonl')
+    with open(path, newline='', encoding='utf-8') as f:
+        if fmt == 'csv':
+            rows = csv.DictReader(f)
+        else:
+            rows = (json.loads(line) for line in f if line.strip())
+        for row_number, record in enumerate(rows):
+            if row_number >= skip:
+                yield row_number, record
+
+
+def prepare_candidate(record):
+    """Validate one input record and return (candidate info, tech stack, errors)."""
+    info = {field: str(record.get(field) or '').strip() for field in CANDIDATE_FIELDS}
+    errors = []
+
+    if not validate_email(info['email']):
+        errors.append('invalid email')
+    if not validate_phone(info['phone']):
+        errors.append('invalid phone')
+    if info['experience']:
+        try:
+            info['experience'] = int(info['experience'])
+            if info['experience'] < 0:
+                errors.append('invalid experience')
+        except ValueError:
+            errors.append('invalid experience')
+
+    tech_stack = record.get('tech_stack') or ''
+    if isinstance(tech_stack, list):
+        tech_stack = ', '.join(str(tech) for tech in tech_stack)
+    techs = parse_tech_stack(tech_stack)
+    if not techs:
+        errors.append('empty tech stack')
+
+    info['tech_stack'] = techs
+    return info, techs, errors
+
+
+def stack_key(techs):
+    """Key under which identical stacks, in any order or spelling, share questions."""
+    return tuple(sorted(lookup_key(tech) for tech in techs))
+
+
+def generate_stack(techs):
+    """Generate questions for one tech stack, returning (questions, errors)."""
+    errors = []
+    questions = generate_questions_with_llm(techs, on_error=errors.append)
+    return questions, errors
+
+
+class Checkpoint:
+    """Rows written and output size, saved atomically beside the output file."""
+
+    def __init__(self, path):
+        self.path = path
+        self.rows = 0
+        self.offset = 0
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                saved = json.load(f)
+            self.rows, self.offset = saved['rows'], saved['offset']
+
+    def save(self, rows, offset):
+        self.rows, self.offset = rows, offset
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'rows': rows, 'offset': offset, 'updated': time.time()}, f)
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class StackScheduler:
+    """Runs one generation per distinct tech stack and shares it with every row that needs it."""
+
+    def __init__(self, executor, memo_size=STACK_MEMO_SIZE):
+        self.executor = executor
+        self.memo_size = memo_size
+        self._futures = OrderedDict()
+        self.submitted = 0
+        self.reused = 0
+
+    def submit(self, techs):
+        key = stack_key(techs)
+        future = self._futures.get(key)
+        if future is not None:
+            self._futures.move_to_end(key)
+            self.reused += 1
+            return future
+
+        future = self.executor.submit(generate_stack, techs)
+        self._futures[key] = future
+        self.submitted += 1
+        if len(self._futures) > self.memo_size:
+            self._futures.popitem(last=False)
+        return future
+
+
+def build_result(row_number, info, techs, errors, future):
+    """Return the output record for a row once its questions are ready."""
+    result = {'row': row_number, 'candidate': info}
+    if errors:
+        result.update(status='invalid', errors=errors, questions={})
+        return result
+
+    try:
+        questions, generation_errors = future.result()
+    except Exception as e:
+        result.update(status='failed', errors=[str(e)], questions={})
+        return result
+
+    # Questions were generated for whichever row first had this stack; map
+    # them back onto this candidate's spelling and order of the techs
+    by_key = {lookup_key(tech): tech_questions for tech, tech_questions in questions.items()}
+    result.update(
+        status='ok',
+        errors=generation_errors,
+        questions={tech: by_key.get(lookup_key(tech), []) for tech in techs},
+    )
+    return result
+
+
+def run_batch(source, output, fmt=None, workers=8, window=None, checkpoint_every=100,
+              restart=False, log=print):
+    """Stream candidates from source into output, resuming from the last checkpoint."""
+    checkpoint = Checkpoint(f"{output}.ckpt")
+    if restart or not os.path.exists(output):
+        checkpoint.clear()
+        checkpoint = Checkpoint(checkpoint.path)
+
+    # Anything written after the last checkpoint is rewritten on resume
+    if checkpoint.rows:
+        out = open(output, 'r+b')
+        out.seek(checkpoint.offset)
+        out.truncate()
+        log(f"Resuming after {checkpoint.rows} rows")
+    else:
+        out = open(output, 'wb')
+
+    window = window or workers * 4
+    counts = {'ok': 0, 'invalid': 0, 'failed': 0}
+    rows_done = checkpoint.rows
+    started = time.perf_counter()
+
+    def write(pending_row):
+        nonlocal rows_done
+        result = build_result(*pending_row)
+        out.write((json.dumps(result, ensure_ascii=False) + '\n').encode('utf-8'))
+        counts[result['status']] += 1
+        metrics.inc('batch_candidates_total', status=result['status'])
+        rows_done += 1
+        if rows_done % checkpoint_every == 0:
+            out.flush()
+            os.fsync(out.fileno())
+            checkpoint.save(rows_done, out.tell())
+            log(f"{rows_done} rows written ({rows_done / (time.perf_counter() - started):.1f}/s)")
+
+    with out, ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='batch') as executor:
+        scheduler = StackScheduler(executor)
+        # Rows are written in input order; at most `window` wait on generation
+        pending = deque()
+        for row_number, record in read_candidates(source, fmt, skip=checkpoint.rows):
+            info, techs, errors = prepare_candidate(record)
+            future = None if errors else scheduler.submit(techs)
+            pending.append((row_number, info, techs, errors, future))
+            while len(pending) > window or (pending and pending[0][4] is None):
+                write(pending.popleft())
+            while pending and pending[0][4] is not None and pending[0][4].done():
+                write(pending.popleft())
+
+        while pending:
+            write(pending.popleft())
+
+        out.flush()
+        os.fsync(out.fileno())
+        checkpoint.save(rows_done, out.tell())
+
+    log(f"Done: {rows_done} rows ({counts['ok']} ok, {counts['invalid']} invalid, "
+        f"{counts['failed']} failed); {scheduler.submitted} stacks generated, "
+        f"{scheduler.reused} reused")
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate question sets for a file of candidates.")
+    parser.add_argument('source', help="CSV or JSONL file of candidates")
+    parser.add_argument('--output', required=True, help="JSONL file to write results to")
+    parser.add_argument('--format', choices=('csv', 'jsonl'), help="input format (default: from the extension)")
+    parser.add_argument('--workers', type=int, default=8, help="tech stacks generated concurrently")
+    parser.add_argument('--window', type=int, help="rows waiting on generation at once (default: 4 x workers)")
+    parser.add_argument('--checkpoint-every', type=int, default=100, help="rows between checkpoints")
+    parser.add_argument('--restart', action='store_true', help="ignore any checkpoint and start over")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.source):
+        sys.exit(f"No such file: {args.source}")
+
+    run_batch(args.source, args.output, args.format, args.workers, args.window,
+              args.checkpoint_every, args.restart)
+
+
+if __name__ == "__main__":
+    main()
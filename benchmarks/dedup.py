@@ -0,0 +1,120 @@
+"""
+TalentScout - Deduplication Benchmark
+Measures the near-duplicate question index on synthetic questions: insert
+rate, lookup latency at full size, and how often reworded questions are
+caught versus unrelated ones flagged.
+
+Usage:
+    python benchmarks/dedup.py
+    python benchmarks/dedup.py --size 300000 --techs 500
+
+Results are written to benchmarks/results/ as JSON so runs can be compared.
+"""
+
+import argparse
+import json
+import os
+import random
+import resource
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+RESULTS_DIR = os.path.join(ROOT, 'benchmarks', 'results')
+
+from question_dedup import NearDuplicateIndex  # noqa: E402
+
+OPENERS = ["Explain", "Describe", "What is", "How would you use", "Discuss"]
+REWORDED_OPENERS = ["Can you explain", "Tell me about", "What do you know about", "Describe how", "Give an example of"]
+SYLLABLES = ['ka', 'lo', 'mi', 'ren', 'tos', 'vel', 'quar', 'zen', 'dri', 'pol', 'sut', 'nex', 'bri', 'cor']
+
+
+def make_vocabulary(size, rng):
+    words = set()
+    while len(words) < size:
+        words.add(''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))))
+    return sorted(words)
+
+
+def make_question(rng, vocabulary):
+    return rng.sample(vocabulary, rng.randint(3, 6))
+
+
+def render(topic, opener):
+    return f"{opener} the {' '.join(topic)} in practice?"
+
+
+def reword(topic, rng):
+    """Same topic words in a different order behind a different opener."""
+    topic = list(topic)
+    rng.shuffle(topic)
+    return render(topic, rng.choice(REWORDED_OPENERS))
+
+
+def run(size, techs, probes, seed):
+    rng = random.Random(seed)
+    vocabulary = make_vocabulary(20000, rng)
+    scopes = [f"tech-{i}" for i in range(techs)]
+    index = NearDuplicateIndex()
+    # Keep every step-th stored question for the probes, so memory growth is the index's own
+    step = max(1, size // probes)
+    stored = []
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    started = time.perf_counter()
+    for i in range(size):
+        topic, scope = make_question(rng, vocabulary), rng.choice(scopes)
+        if index.add(render(topic, rng.choice(OPENERS)), scope) and i % step == 0:
+            stored.append((topic, scope))
+    build_seconds = time.perf_counter() - started
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    latencies, caught, flagged = [], 0, 0
+    for _ in range(probes):
+        topic, scope = rng.choice(stored)
+        start = time.perf_counter()
+        caught += index.contains(reword(topic, rng), scope)
+        latencies.append(time.perf_counter() - start)
+        flagged += index.contains(render(make_question(rng, vocabulary), rng.choice(OPENERS)), scope)
+    latencies.sort()
+
+    return {
+        'stored': len(index),
+        'build_seconds': build_seconds,
+        'adds_per_second': size / build_seconds,
+        'lookup_p50_ms': statistics.median(latencies) * 1000,
+        'lookup_p99_ms': latencies[int(len(latencies) * 0.99)] * 1000,
+        'reworded_caught': caught / probes,
+        'unrelated_flagged': flagged / probes,
+        'max_rss_growth_mb': (rss_after - rss_before) / 1024,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the near-duplicate question index.")
+    parser.add_argument('--size', type=int, default=100000, help="questions inserted")
+    parser.add_argument('--techs', type=int, default=200, help="distinct technology scopes")
+    parser.add_argument('--probes', type=int, default=2000, help="reworded and unrelated lookups")
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--output', help="result file (default: benchmarks/results/dedup-<timestamp>.json)")
+    args = parser.parse_args(argv)
+
+    report = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'config': {k: v for k, v in vars(args).items() if k != 'output'},
+        'results': run(args.size, args.techs, args.probes, args.seed),
+    }
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    output = args.output or os.path.join(RESULTS_DIR, f"dedup-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+    print(json.dumps(report['results'], indent=2))
+    print(f"\nSaved results to {output}")
+
+
+if __name__ == "__main__":
+    main()
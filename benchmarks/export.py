@@ -0,0 +1,133 @@
+"""
+TalentScout - Transcript Export Benchmark
+Pushes a day's worth of synthetic finished interviews through the transcript
+exporter and reads the segments back: enqueue latency seen by the ended
+stage, export throughput, compression ratio, and reader throughput and peak
+memory.
+
+Usage:
+    python benchmarks/export.py
+    python benchmarks/export.py --sessions 50000 --compression zstd
+
+Results are written to benchmarks/results/ as JSON so runs can be compared.
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+RESULTS_DIR = os.path.join(ROOT, 'benchmarks', 'results')
+
+from transcript_export import TranscriptExporter, read_segment, segments  # noqa: E402
+
+TECHS = ['Python', 'Go', 'Kubernetes', 'React', 'PostgreSQL', 'Kafka', 'Rust', 'Java', 'AWS', 'Django']
+WORDS = ('service latency cache queue index cluster deploy rollback schema migration thread lock '
+         'async memory profile retry timeout shard replica pipeline container network').split()
+
+
+def make_record(i, rng, messages):
+    techs = rng.sample(TECHS, 3)
+    questions = [{'id': f"{tech}_{n}", 'tech': tech, 'question': f"Explain how {tech} handles {rng.choice(WORDS)}."}
+                 for n, tech in enumerate(techs * 2)]
+    start = 1767225600 + i * 4
+    return {
+        'session_id': f"bench{i:08d}",
+        'exported_at': '2026-01-01T09:00:00',
+        'candidate_info': {
+            'name': f"Candidate {i}", 'email': f"candidate{i}@example.com", 'phone': '+1 555 0100',
+            'experience': rng.randint(0, 20), 'position': 'Backend Engineer', 'location': 'Berlin',
+            'tech_stack': techs,
+        },
+        'tech_stack': techs,
+        'questions': questions,
+        'messages': [{'text': ' '.join(rng.choices(WORDS, k=rng.randint(5, 40))), 'is_user': n % 2 == 1,
+                      'timestamp': f"2026-01-01T09:{(start + n * 20) // 60 % 60:02d}:{(start + n * 20) % 60:02d}"}
+                     for n in range(messages)],
+    }
+
+
+def run(sessions, messages, compression, segment_mb, seed, directory):
+    rng = random.Random(seed)
+    records = [make_record(i, rng, messages) for i in range(sessions)]
+    raw_bytes = sum(len(json.dumps(r, ensure_ascii=False, separators=(',', ':')).encode('utf-8')) + 1
+                    for r in records)
+
+    exporter = TranscriptExporter(directory, compression=compression,
+                                  segment_bytes=segment_mb * 1024 * 1024, flush_interval=0.2)
+    latencies = []
+    started = time.perf_counter()
+    for record in records:
+        start = time.perf_counter()
+        exporter.submit(record)
+        latencies.append(time.perf_counter() - start)
+    exporter.close()
+    export_seconds = time.perf_counter() - started
+    latencies.sort()
+
+    paths = segments(directory)
+    compressed = sum(os.path.getsize(path) for path in paths)
+    del records
+
+    started = time.perf_counter()
+    read = sum(1 for path in paths for _ in read_segment(path))
+    read_seconds = time.perf_counter() - started
+
+    tracemalloc.start()
+    for _ in read_segment(paths[-1]):
+        pass
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'sessions': sessions,
+        'raw_megabytes': raw_bytes / 1e6,
+        'compressed_megabytes': compressed / 1e6,
+        'compression_ratio': raw_bytes / compressed,
+        'segments': len(paths),
+        'submit_p50_us': statistics.median(latencies) * 1e6,
+        'submit_p99_us': latencies[int(len(latencies) * 0.99)] * 1e6,
+        'export_sessions_per_second': sessions / export_seconds,
+        'export_raw_mb_per_second': raw_bytes / 1e6 / export_seconds,
+        'read_sessions': read,
+        'read_sessions_per_second': read / read_seconds,
+        'read_peak_kb': peak / 1024,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the transcript exporter.")
+    parser.add_argument('--sessions', type=int, default=20000, help="finished interviews exported")
+    parser.add_argument('--messages', type=int, default=40, help="messages per interview")
+    parser.add_argument('--compression', choices=['gzip', 'zstd'], default='gzip')
+    parser.add_argument('--segment-mb', type=int, default=8, help="segment size before rotation")
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--output', help="result file (default: benchmarks/results/export-<timestamp>.json)")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        results = run(args.sessions, args.messages, args.compression, args.segment_mb, args.seed, directory)
+    report = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'config': {k: v for k, v in vars(args).items() if k != 'output'},
+        'results': results,
+    }
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    output = args.output or os.path.join(RESULTS_DIR, f"export-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+    print(json.dumps(results, indent=2))
+    print(f"\nSaved results to {output}")
+
+
+if __name__ == "__main__":
+    main()
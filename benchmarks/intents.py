@@ -0,0 +1,181 @@
+"""
+TalentScout - Intent Classification Benchmark
+Scores the intent classifier on synthetic candidate messages that are not in
+its training data, against the phrase check alone and the old substring
+check, and measures load time and per-message latency.
+
+Usage:
+    python benchmarks/intents.py
+    python benchmarks/intents.py --per-class 1000
+
+Results are written to benchmarks/results/ as JSON so runs can be compared.
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+RESULTS_DIR = os.path.join(ROOT, 'benchmarks', 'results')
+
+from intent import (  # noqa: E402
+    ANSWER, EXIT, FIELD_VALUE, INTENT_DATA_PATH, OFF_TOPIC, IntentClassifier, IntentModel,
+)
+
+FIELD_STAGES = ['name', 'email', 'phone', 'experience', 'position', 'location', 'tech_stack']
+
+FIRST_NAMES = ['Olivia', 'Rahul', 'Sofia', 'Kenji', 'Fatima', 'Lucas', 'Amara', 'Mateo', 'Ingrid', 'Tunde']
+LAST_NAMES = ['Nakamura', 'Okafor', 'Rossi', 'Kowalski', 'Iyer', 'Dubois', 'Haddad', 'Silva', 'Berg', 'Novak']
+POSITIONS = ['Platform Engineer', 'Mobile Developer', 'Cloud Architect', 'Junior Python Developer',
+             'Staff Engineer', 'Data Engineer', 'Security Engineer', 'Embedded Software Engineer']
+CITIES = ['Munich', 'Pune', 'Austin, TX', 'Madrid', 'Warsaw, Poland', 'Singapore', 'Nairobi', 'Dublin']
+TECHS = ['Python', 'Go', 'Rust', 'Kotlin', 'Vue.js', 'PostgreSQL', 'Redis', 'GraphQL', 'Flutter',
+         'Elixir', 'Scala', 'Spark', 'Airflow', 'Ansible', 'Azure', 'Next.js']
+
+TOPICS = ['the connection pool', 'a read replica', 'the garbage collector', 'a B-tree index',
+          'the scheduler', 'a circuit breaker', 'optimistic locking', 'the build cache',
+          'a bloom filter', 'the service mesh', 'memoization', 'backpressure']
+CLAIMS = ['reduces tail latency under load', 'keeps the write path simple', 'avoids lock contention',
+          'trades memory for speed', 'has to be invalidated when the schema changes',
+          'needs a timeout or it blocks forever', 'is what I tuned in my last job']
+TECHNICAL_EXITS = ['the worker calls exit after draining the queue', 'os.exit skips deferred calls in Go',
+                   'ctrl-c makes the REPL quit', 'we quit the retry loop after five attempts',
+                   'the client sends a bye frame before closing the socket']
+SHORT_ANSWERS = ['{tech}', 'not really sure', "I've never used it", 'I would use {tech}', 'no clue',
+                 'yes, with {tech}', 'my go-to is {tech}']
+TENTATIVE_ANSWERS = ['maybe {topic}?', 'is it {topic}?', 'would {topic} help here?', 'something with {topic}?']
+ANSWER_OPENERS = ['', 'I think ', 'In my experience ', 'thank you for asking, ', 'thank you, so ',
+                  'good question, ', 'honestly ', 'not 100% sure but ']
+
+EXIT_CORES = ['bye', 'goodbye', 'exit', 'quit', 'thank you', 'thanks for your time', 'end the interview']
+EXIT_LEADS = ['', 'ok ', 'alright, ', 'sorry, I have to run, ', 'I need to stop now, ',
+              "I'd like to stop here, ", "that's everything, ", 'please ']
+EXIT_TAILS = ['', '!', '.', ', have a good day', ', see you', ' :)']
+
+OFF_TOPIC_MESSAGES = [
+    "what's the weather in {city}?", "is the {position} role remote?", "how much does a {position} earn here?",
+    "can you tell me a funny story?", "are you a human or a bot?", "who built this assistant?",
+    "what is the office like in {city}?", "when will the recruiter call me?", "how long is this going to take?",
+    "do you offer relocation to {city}?", "what's your name?", "can you recommend a book?",
+    "is there a free lunch?", "do you know who won the match yesterday?", "can you just give me the answer?",
+]
+
+
+def answer_message(rng):
+    roll = rng.random()
+    if roll < 0.1:
+        return rng.choice(SHORT_ANSWERS).format(tech=rng.choice(TECHS))
+    if roll < 0.2:
+        return rng.choice(TENTATIVE_ANSWERS).format(topic=rng.choice(TOPICS))
+    if roll < 0.4:
+        body = rng.choice(TECHNICAL_EXITS)
+    else:
+        body = f"{rng.choice(TOPICS)} {rng.choice(CLAIMS)} in {rng.choice(TECHS)}"
+    return rng.choice(ANSWER_OPENERS) + body
+
+
+def field_message(rng, stage):
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    return {
+        'name': f"{first} {last}",
+        'email': f"{first.lower()}.{last.lower()}@mail.example",
+        'phone': f"+{rng.randint(1, 99)} {rng.randint(100, 999)} {rng.randint(1000000, 9999999)}",
+        'experience': rng.choice([str(rng.randint(0, 25)), f"{rng.randint(1, 25)} years"]),
+        'position': rng.choice(POSITIONS),
+        'location': rng.choice(CITIES),
+        'tech_stack': ', '.join(rng.sample(TECHS, rng.randint(1, 4))),
+    }[stage]
+
+
+def make_cases(per_class, seed):
+    """Return (message, answering, expected) triples, per_class of each label."""
+    rng = random.Random(seed)
+    cases = []
+    for _ in range(per_class):
+        cases.append((answer_message(rng), True, ANSWER))
+        stage = rng.choice(FIELD_STAGES)
+        cases.append((field_message(rng, stage), False, FIELD_VALUE))
+        cases.append((rng.choice(EXIT_LEADS) + rng.choice(EXIT_CORES) + rng.choice(EXIT_TAILS),
+                      rng.random() < 0.5, EXIT))
+        cases.append((rng.choice(OFF_TOPIC_MESSAGES).format(city=rng.choice(CITIES), position=rng.choice(POSITIONS)),
+                      rng.random() < 0.5, OFF_TOPIC))
+    return cases
+
+
+def substring_check(message, answering):
+    """The original exit check: any exit keyword anywhere in the message."""
+    keywords = ['exit', 'quit', 'bye', 'goodbye', 'thank you', 'thanks for your time']
+    if any(keyword in message.lower() for keyword in keywords):
+        return EXIT
+    return ANSWER if answering else FIELD_VALUE
+
+
+def score(classify, cases):
+    latencies = []
+    per_label = {label: {'total': 0, 'correct': 0, 'predicted': 0} for label in (EXIT, OFF_TOPIC, ANSWER, FIELD_VALUE)}
+    for message, answering, expected in cases:
+        start = time.perf_counter()
+        predicted = classify(message, answering)
+        latencies.append(time.perf_counter() - start)
+        per_label[expected]['total'] += 1
+        per_label[predicted]['predicted'] += 1
+        per_label[expected]['correct'] += predicted == expected
+    latencies.sort()
+
+    false_exits = per_label[EXIT]['predicted'] - per_label[EXIT]['correct']
+    return {
+        'accuracy': sum(v['correct'] for v in per_label.values()) / len(cases),
+        'recall': {label: v['correct'] / v['total'] for label, v in per_label.items()},
+        'precision': {label: v['correct'] / v['predicted'] if v['predicted'] else None
+                      for label, v in per_label.items()},
+        'false_exit_rate': false_exits / (len(cases) - per_label[EXIT]['total']),
+        'p50_us': statistics.median(latencies) * 1e6,
+        'p99_us': latencies[int(len(latencies) * 0.99)] * 1e6,
+    }
+
+
+def run(per_class, seed):
+    cases = make_cases(per_class, seed)
+
+    start = time.perf_counter()
+    model = IntentModel.from_file(INTENT_DATA_PATH)
+    load_ms = (time.perf_counter() - start) * 1000
+
+    return {
+        'messages': len(cases),
+        'model_load_ms': load_ms,
+        'classifier': score(IntentClassifier(model).classify, cases),
+        'phrases_only': score(IntentClassifier(None).classify, cases),
+        'substring_check': score(substring_check, cases),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the intent classifier.")
+    parser.add_argument('--per-class', type=int, default=500, help="messages generated per intent")
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--output', help="result file (default: benchmarks/results/intent-<timestamp>.json)")
+    args = parser.parse_args(argv)
+
+    report = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'config': {k: v for k, v in vars(args).items() if k != 'output'},
+        'results': run(args.per_class, args.seed),
+    }
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    output = args.output or os.path.join(RESULTS_DIR, f"intent-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+    print(json.dumps(report['results'], indent=2))
+    print(f"\nSaved results to {output}")
+
+
+if __name__ == "__main__":
+    main()
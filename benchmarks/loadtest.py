@@ -0,0 +1,333 @@
+"""
+TalentScout - Load Test
+Simulates concurrent candidates walking the whole conversation against a local
+stub LLM and reports latency, throughput and memory figures.
+
+Usage:
+    python benchmarks/loadtest.py --candidates 200 --latency 0.8
+    python benchmarks/loadtest.py --target server --candidates 500 --error-rate 0.05
+    python benchmarks/loadtest.py --malformed-rate 0.2 --compare benchmarks/results/<earlier>.json
+
+Results are written to benchmarks/results/ as JSON so runs can be compared.
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from stub_llm import StubConfig, StubServer, fake_questions  # noqa: E402
+
+RESULTS_DIR = os.path.join(ROOT, 'benchmarks', 'results')
+
+TECH_STACKS = [
+    "Python, Django, MySQL",
+    "React, Node.js, MongoDB",
+    "Java, Spring Boot, PostgreSQL, Docker",
+    "Go, Kubernetes, AWS",
+    "TypeScript, Angular, Redis",
+    "Python, Flask, PostgreSQL, Docker, AWS",
+    "Vue.js, JavaScript, Git",
+    "Rust, C++, Linux",
+]
+
+POSITIONS = ["Backend Developer", "Frontend Engineer", "DevOps Engineer", "Data Engineer", "Full Stack Developer"]
+
+# Metrics compared by --compare, with whether a higher value is better
+COMPARED_METRICS = {
+    'ttfq.p50': False, 'ttfq.p95': False, 'ttfq.p99': False,
+    'turn.p50': False, 'turn.p95': False, 'turn.p99': False,
+    'throughput_turns_per_s': True,
+    'memory_per_session_bytes': False,
+}
+
+
+def percentiles(values):
+    """Return p50/p95/p99 (nearest rank), mean and max of a list of seconds."""
+    if not values:
+        return {'p50': None, 'p95': None, 'p99': None, 'mean': None, 'max': None}
+    ordered = sorted(values)
+
+    def rank(p):
+        return ordered[min(len(ordered) - 1, max(0, int(round(p / 100 * len(ordered))) - 1))]
+
+    return {
+        'p50': rank(50), 'p95': rank(95), 'p99': rank(99),
+        'mean': statistics.fmean(ordered), 'max': ordered[-1],
+    }
+
+
+def intake_turns(index, rng):
+    """Return the candidate's answers from greeting through tech stack."""
+    return [
+        "hi",
+        f"Candidate {index}",
+        f"candidate{index}@example.com",
+        f"555{index:07d}",
+        str(rng.randint(0, 15)),
+        rng.choice(POSITIONS),
+        "Berlin",
+        rng.choice(TECH_STACKS),
+    ]
+
+
+def check_stub_questions():
+    """Fail fast if deduplication trims the stub's questions, which would also keep them out of the cache."""
+    from question_dedup import NearDuplicateIndex
+    from questions import QUESTIONS_PER_TECH, unique_questions
+
+    for stack in TECH_STACKS:
+        techs = [tech.strip() for tech in stack.split(',')]
+        served = NearDuplicateIndex()
+        for tech in techs:
+            kept = unique_questions(fake_questions(tech, QUESTIONS_PER_TECH), ' '.join(techs), served, 'session')
+            assert len(kept) == QUESTIONS_PER_TECH, f"deduplication kept {len(kept)} stub questions for {tech}"
+
+
+def run_engine_candidate(index, answers, seed):
+    """Walk one candidate through the engine and time every turn."""
+    from engine import SessionState, handle_message, start_questions
+
+    rng = random.Random(seed + index)
+    state = SessionState()
+    turns = []
+    ttfq = None
+
+    for text in intake_turns(index, rng):
+        start = time.perf_counter()
+        handle_message(state, text)
+        if state.stage == 'generating_questions':
+            start_questions(state)
+            ttfq = time.perf_counter() - start
+        turns.append(time.perf_counter() - start)
+
+    for _ in range(answers):
+        if state.stage != 'answering':
+            break
+        start = time.perf_counter()
+        handle_message(state, "Here is my answer to the question.")
+        turns.append(time.perf_counter() - start)
+
+    return {'turns': turns, 'ttfq': ttfq, 'state': state}
+
+
+def run_engine(args):
+    with ThreadPoolExecutor(max_workers=args.candidates) as executor:
+        return list(executor.map(
+            lambda i: run_engine_candidate(i, args.answers, args.seed), range(args.candidates)
+        ))
+
+
+async def run_server_candidate(session, base_url, index, answers, seed):
+    rng = random.Random(seed + index)
+    async with session.post(f"{base_url}/sessions") as response:
+        session_id = (await response.json())['session_id']
+
+    turns = []
+    ttfq = None
+    texts = intake_turns(index, rng) + ["Here is my answer to the question."] * answers
+    for text in texts:
+        start = time.perf_counter()
+        async with session.post(f"{base_url}/sessions/{session_id}/messages", json={'text': text}) as response:
+            result = await response.json()
+        elapsed = time.perf_counter() - start
+        turns.append(elapsed)
+        if ttfq is None and result.get('question'):
+            ttfq = elapsed
+        if result['stage'] == 'ended':
+            break
+
+    return {'turns': turns, 'ttfq': ttfq, 'state': None}
+
+
+async def run_server_async(args):
+    import aiohttp
+    from aiohttp import web
+    import server
+
+    runner = web.AppRunner(server.create_app(args.server_workers), access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    base_url = f"http://127.0.0.1:{port}"
+
+    try:
+        connector = aiohttp.TCPConnector(limit=0)
+        async with aiohttp.ClientSession(connector=connector) as session:
+            return await asyncio.gather(*[
+                run_server_candidate(session, base_url, i, args.answers, args.seed)
+                for i in range(args.candidates)
+            ])
+    finally:
+        await runner.cleanup()
+
+
+def measure_memory(args):
+    """Return traced bytes retained per finished engine session."""
+    sample = min(args.candidates, args.memory_sessions)
+    if not sample:
+        return None
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    with ThreadPoolExecutor(max_workers=sample) as executor:
+        kept = [r['state'] for r in executor.map(
+            lambda i: run_engine_candidate(i, args.answers, args.seed), range(sample)
+        )]
+    gc.collect()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    retained = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    del kept
+    return retained / sample
+
+
+def measure_render(sizes):
+    """Time a steady-state Streamlit rerun and the transcript payload at each transcript size."""
+    from streamlit.testing.v1 import AppTest
+    from engine import SessionState
+
+    results = []
+    for size in sizes:
+        at = AppTest.from_file(os.path.join(ROOT, 'app.py'), default_timeout=60)
+        at.run()
+        state = SessionState()
+        for i in range(size):
+            state.add_message(f"Message {i} with a typical amount of interview text in it.", is_user=i % 2 == 0)
+        state.stage = 'answering'
+        at.session_state['session'] = state
+        at.run()
+
+        timings = []
+        for _ in range(5):
+            start = time.perf_counter()
+            at.run()
+            timings.append(time.perf_counter() - start)
+
+        chat = [m.value for m in at.markdown if '<div class="chat-container">' in m.value]
+        results.append({
+            'messages': size,
+            'rerun_seconds': statistics.median(timings),
+            'chat_bytes': len(chat[0].encode('utf-8')) if chat else 0,
+        })
+    return results
+
+
+def flatten(report):
+    flat = {}
+    for key, value in report.items():
+        if isinstance(value, dict):
+            for sub, subvalue in value.items():
+                flat[f"{key}.{sub}"] = subvalue
+        else:
+            flat[key] = value
+    return flat
+
+
+def compare(report, baseline_path):
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = flatten(json.load(f))
+    current = flatten(report)
+    print(f"\nCompared with {baseline_path}:")
+    for metric, higher_is_better in COMPARED_METRICS.items():
+        old, new = baseline.get(metric), current.get(metric)
+        if not old or new is None:
+            continue
+        change = (new - old) / old * 100
+        worse = change < 0 if higher_is_better else change > 0
+        flag = "  REGRESSION" if worse and abs(change) > 10 else ""
+        print(f"  {metric:28} {old:12.4f} -> {new:12.4f} ({change:+.1f}%){flag}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test TalentScout against a stub LLM.")
+    parser.add_argument('--target', choices=('engine', 'server'), default='engine')
+    parser.add_argument('--candidates', type=int, default=100, help="concurrent simulated candidates")
+    parser.add_argument('--answers', type=int, default=3, help="questions each candidate answers")
+    parser.add_argument('--latency', type=float, default=0.5, help="stub mean latency in seconds")
+    parser.add_argument('--jitter', type=float, default=0.1, help="stub latency standard deviation")
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--malformed-rate', type=float, default=0.0)
+    parser.add_argument('--mode', default=None, help="QUESTION_GEN_MODE to benchmark")
+    parser.add_argument('--cache', action='store_true', help="enable the question cache (fresh temp file)")
+    parser.add_argument('--warmup', type=int, default=2, help="untimed candidates run first")
+    parser.add_argument('--server-workers', type=int, default=256)
+    parser.add_argument('--memory-sessions', type=int, default=50, help="sessions traced for memory (0 to skip)")
+    parser.add_argument('--render-sizes', default='10,100,1000', help="transcript sizes for the rerun benchmark ('' to skip)")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', help="result file (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument('--compare', help="earlier result file to compare against")
+    args = parser.parse_args(argv)
+
+    config = StubConfig(args.latency, args.jitter, args.error_rate, args.malformed_rate, args.seed)
+    stub = StubServer(config).start()
+
+    # Must be set before the app modules are imported: they read settings at import time
+    os.environ['OPENAI_API_KEY'] = 'stub'
+    os.environ['OPENAI_BASE_URL'] = stub.base_url
+    os.environ['QUESTION_BANK_PATH'] = ''
+    os.environ['QUESTION_CACHE_PATH'] = os.path.join(tempfile.mkdtemp(), 'cache.sqlite3') if args.cache else ''
+    if args.mode:
+        os.environ['QUESTION_GEN_MODE'] = args.mode
+
+    check_stub_questions()
+
+    # Pay one-off import and client setup costs before timing anything
+    for i in range(args.warmup):
+        run_engine_candidate(args.candidates + i, args.answers, args.seed)
+    config.requests = config.errors = config.malformed = 0
+
+    start = time.perf_counter()
+    if args.target == 'engine':
+        results = run_engine(args)
+    else:
+        results = asyncio.run(run_server_async(args))
+    wall = time.perf_counter() - start
+
+    turns = [t for r in results for t in r['turns']]
+    ttfq = [r['ttfq'] for r in results if r['ttfq'] is not None]
+    del results
+
+    report = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'config': {k: v for k, v in vars(args).items() if k not in ('output', 'compare')},
+        'candidates_with_questions': len(ttfq),
+        'wall_seconds': wall,
+        'ttfq': percentiles(ttfq),
+        'turn': percentiles(turns),
+        'throughput_turns_per_s': len(turns) / wall if wall else 0.0,
+        'throughput_candidates_per_s': args.candidates / wall if wall else 0.0,
+        'stub': {'requests': config.requests, 'errors': config.errors, 'malformed': config.malformed},
+    }
+
+    report['memory_per_session_bytes'] = measure_memory(args)
+    sizes = [int(s) for s in args.render_sizes.split(',') if s.strip()]
+    report['render'] = measure_render(sizes) if sizes else []
+    stub.stop()
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    output = args.output or os.path.join(RESULTS_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}.json")
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+    print(json.dumps({k: v for k, v in report.items() if k != 'config'}, indent=2))
+    print(f"\nSaved results to {output}")
+    if args.compare:
+        compare(report, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+TalentScout - Candidate Search Benchmark
+Fills a candidate store with synthetic finished interviews and measures
+recruiter query latency: first page with total count, and later pages.
+
+Usage:
+    python benchmarks/search.py
+    python benchmarks/search.py --candidates 300000 --queries 200
+
+Results are written to benchmarks/results/ as JSON so runs can be compared.
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+RESULTS_DIR = os.path.join(ROOT, 'benchmarks', 'results')
+
+from candidate_store import CandidateStore, search_query  # noqa: E402
+
+TECHS = ['Python', 'Go', 'Kubernetes', 'Docker', 'AWS', 'React', 'JavaScript', 'TypeScript', 'Java',
+         'Spring Boot', 'Node.js', 'PostgreSQL', 'MySQL', 'MongoDB', 'Redis', 'Kafka', 'Rust', 'C++',
+         'Django', 'Flask', 'Angular', 'Vue.js', 'Terraform', 'GCP', 'Azure', 'Scala', 'Kotlin', 'Swift']
+CITIES = ['Berlin', 'Munich', 'London', 'Paris', 'Amsterdam', 'Bangalore', 'Hyderabad', 'New York',
+          'San Francisco', 'Toronto', 'Madrid', 'Warsaw', 'Lisbon', 'Dublin', 'Zurich', 'Vienna']
+POSITIONS = ['Backend Engineer', 'Senior Backend Engineer', 'Frontend Developer', 'Full Stack Developer',
+             'DevOps Engineer', 'Site Reliability Engineer', 'Data Engineer', 'Platform Engineer']
+WORDS = ('service latency cache queue index cluster deploy rollback schema migration thread lock '
+         'async memory profile retry timeout shard replica pipeline container network').split()
+
+QUERIES = [
+    ("Kubernetes + Go, 5+ years, Berlin", {}),
+    ("Python, Django", {'min_experience': 3}),
+    ("React + TypeScript", {'location': 'London'}),
+    ("", {'techs': ['Rust'], 'position': 'backend'}),
+    ("Kafka, 8+ years", {}),
+    ("shard replica", {}),
+    ("", {'location': 'Bangalore', 'min_experience': 10}),
+]
+
+
+def make_record(i, rng):
+    techs = rng.sample(TECHS, rng.randint(2, 5))
+    responses = [' '.join(rng.choices(WORDS, k=rng.randint(8, 30))) for _ in range(rng.randint(3, 9))]
+    return {
+        'session_id': f"bench{i:08d}",
+        'candidate_info': {
+            'name': f"Candidate {i}", 'email': f"candidate{i}@example.com",
+            'experience': rng.randint(0, 20), 'position': rng.choice(POSITIONS),
+            'location': rng.choice(CITIES), 'tech_stack': techs,
+        },
+        'tech_stack': techs,
+        'questions': [{'id': f"{techs[0]}_{n}", 'tech': techs[0], 'question': 'q', 'answer': r,
+                       'score': rng.randint(1, 10), 'feedback': ''} for n, r in enumerate(responses[:3])],
+        'responses': responses,
+        'completed_at': time.time(),
+    }
+
+
+def percentile(values, share):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * share))]
+
+
+def run(candidates, queries, seed, path):
+    rng = random.Random(seed)
+    store = CandidateStore(path)
+
+    started = time.perf_counter()
+    for start in range(0, candidates, 1000):
+        store.write_batch([make_record(i, rng) for i in range(start, min(candidates, start + 1000))])
+    load_seconds = time.perf_counter() - started
+
+    first, later, per_query = [], [], {}
+    for n in range(queries):
+        query, filters = QUERIES[n % len(QUERIES)]
+        start = time.perf_counter()
+        page = search_query(store, query, **dict(filters))
+        elapsed = time.perf_counter() - start
+        first.append(elapsed)
+        per_query.setdefault(query or json.dumps(filters), []).append((elapsed, page['total']))
+        if page['next_cursor'] is not None:
+            start = time.perf_counter()
+            search_query(store, query, cursor=page['next_cursor'], **dict(filters))
+            later.append(time.perf_counter() - start)
+
+    return {
+        'candidates': candidates,
+        'load_seconds': load_seconds,
+        'db_megabytes': os.path.getsize(path) / 1e6,
+        'first_page_p50_ms': statistics.median(first) * 1000,
+        'first_page_p95_ms': percentile(first, 0.95) * 1000,
+        'first_page_p99_ms': percentile(first, 0.99) * 1000,
+        'next_page_p50_ms': statistics.median(later) * 1000 if later else None,
+        'next_page_p95_ms': percentile(later, 0.95) * 1000 if later else None,
+        'queries': {query: {'p50_ms': statistics.median(t for t, _ in runs) * 1000, 'matches': runs[0][1]}
+                    for query, runs in per_query.items()},
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark recruiter search over the candidate store.")
+    parser.add_argument('--candidates', type=int, default=100000)
+    parser.add_argument('--queries', type=int, default=140, help="queries run (cycling through the mix)")
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--output', help="result file (default: benchmarks/results/search-<timestamp>.json)")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        results = run(args.candidates, args.queries, args.seed, os.path.join(directory, 'candidates.sqlite3'))
+    report = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'config': {k: v for k, v in vars(args).items() if k != 'output'},
+        'results': results,
+    }
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    output = args.output or os.path.join(RESULTS_DIR, f"search-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+    print(json.dumps(results, indent=2))
+    print(f"\nSaved results to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+TalentScout - Start-up Benchmark
+Measures cold import time of the app's modules in fresh interpreters, and the
+Streamlit app's first run and steady-state rerun time.
+
+Usage:
+    python benchmarks/startup.py
+    python benchmarks/startup.py --runs 10 --compare benchmarks/results/startup-<earlier>.json
+
+Results are written to benchmarks/results/ as JSON so runs can be compared.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT, 'benchmarks', 'results')
+
+MODULES = ['engine', 'questions', 'server', 'batch']
+
+# Metrics compared by --compare (lower is better for all of them)
+COMPARED_METRICS = [
+    'import.engine', 'import.server', 'app.cold_start_seconds',
+    'app.first_run_seconds', 'app.rerun_p50_seconds',
+]
+
+# Run in a fresh interpreter: time the first script run and then the reruns
+APP_PROBE = """
+import json, os, sys, time
+started = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file(sys.argv[1], default_timeout=60)
+loaded = time.perf_counter()
+at.run()
+first = time.perf_counter()
+reruns = []
+for _ in range(int(sys.argv[2])):
+    start = time.perf_counter()
+    at.run()
+    reruns.append(time.perf_counter() - start)
+print(json.dumps({
+    'cold_start_seconds': first - started,
+    'first_run_seconds': first - loaded,
+    'reruns': reruns,
+    'openai_imported': 'openai' in sys.modules,
+    'exceptions': len(at.exception),
+}))
+"""
+
+
+def probe_env():
+    """Environment for probes: no API key, so sessions use fallbacks as they would without one."""
+    env = {k: v for k, v in os.environ.items() if k != 'OPENAI_API_KEY'}
+    env['QUESTION_CACHE_PATH'] = ''
+    env['PYTHONDONTWRITEBYTECODE'] = '1'
+    return env
+
+
+def measure_import(module, runs):
+    """Median cumulative import time of a module in fresh interpreters, from -X importtime."""
+    timings = []
+    imports_openai = False
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                                cwd=ROOT, env=probe_env(), capture_output=True, text=True, check=True)
+        for line in result.stderr.splitlines():
+            if not line.startswith('import time:') or '|' not in line:
+                continue
+            _, cumulative, name = line.split('|')
+            if name.strip() == 'openai':
+                imports_openai = True
+            if name.strip() == module:
+                timings.append(int(cumulative) / 1e6)
+    return {'seconds': statistics.median(timings), 'imports_openai': imports_openai}
+
+
+def measure_app(reruns):
+    """Time the Streamlit app's cold start, first run and steady-state reruns."""
+    result = subprocess.run([sys.executable, '-c', APP_PROBE, os.path.join(ROOT, 'app.py'), str(reruns)],
+                            cwd=ROOT, env=probe_env(), capture_output=True, text=True, check=True)
+    probe = json.loads(result.stdout.strip().splitlines()[-1])
+    timings = sorted(probe.pop('reruns'))
+    probe['rerun_p50_seconds'] = statistics.median(timings)
+    probe['rerun_p95_seconds'] = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+    return probe
+
+
+def flatten(report, prefix=''):
+    flat = {}
+    for key, value in report.items():
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{prefix}{key}."))
+        else:
+            flat[prefix + key] = value
+    return flat
+
+
+def compare(report, baseline_path):
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = flatten(json.load(f))
+    current = flatten(report)
+    print(f"\nCompared with {baseline_path}:")
+    for metric in COMPARED_METRICS:
+        metric_key = metric if metric in current else metric + '.seconds'
+        old, new = baseline.get(metric_key), current.get(metric_key)
+        if not old or new is None:
+            continue
+        change = (new - old) / old * 100
+        flag = "  REGRESSION" if change > 10 else ""
+        print(f"  {metric:28} {old:10.4f} -> {new:10.4f} ({change:+.1f}%){flag}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure TalentScout import and Streamlit rerun time.")
+    parser.add_argument('--runs', type=int, default=5, help="fresh interpreters per module import")
+    parser.add_argument('--reruns', type=int, default=20, help="steady-state app reruns")
+    parser.add_argument('--modules', default=','.join(MODULES), help="modules to import ('' to skip)")
+    parser.add_argument('--skip-app', action='store_true', help="skip the Streamlit app probe")
+    parser.add_argument('--output', help="result file (default: benchmarks/results/startup-<timestamp>.json)")
+    parser.add_argument('--compare', help="earlier result file to compare against")
+    args = parser.parse_args(argv)
+
+    modules = [m.strip() for m in args.modules.split(',') if m.strip()]
+    report = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'config': {k: v for k, v in vars(args).items() if k not in ('output', 'compare')},
+        'import': {module: measure_import(module, args.runs) for module in modules},
+        'app': None if args.skip_app else measure_app(args.reruns),
+    }
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    output = args.output or os.path.join(RESULTS_DIR, f"startup-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+    print(json.dumps({k: v for k, v in report.items() if k != 'config'}, indent=2))
+    print(f"\nSaved results to {output}")
+    if args.compare:
+        compare(report, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+"""
+TalentScout - Stub LLM Server
+Local stand-in for the OpenAI chat-completions endpoint used by the benchmarks.
+
+Usage:
+    python benchmarks/stub_llm.py --port 8799 --latency 0.8 --error-rate 0.02 --malformed-rate 0.05
+
+Point the app at it with OPENAI_BASE_URL=http://127.0.0.1:8799/v1.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import re
+import threading
+import time
+
+from aiohttp import web
+
+# Streamed responses: share of the latency before the first chunk, and chunk
+# size (coarse, so per-chunk overhead in a stub sharing the benchmark process
+# does not dominate)
+STREAM_FIRST_CHUNK = 0.3
+STREAM_CHUNK_CHARS = 64
+
+# Topics the stub's questions are drawn from. Each question gets its own mix,
+# so near-duplicate detection keeps all of them, as it would a real model's
+TOPICS = (
+    'caching', 'retries', 'sharding', 'logging', 'profiling', 'migrations', 'backpressure', 'timeouts',
+    'pagination', 'authentication', 'serialization', 'concurrency', 'indexing', 'deployment', 'rollbacks',
+    'monitoring', 'testing', 'packaging', 'configuration', 'validation', 'streaming', 'batching',
+    'idempotency', 'locking', 'transactions', 'queues', 'encryption', 'compression', 'scheduling',
+    'replication', 'failover', 'tracing', 'throttling', 'versioning', 'debugging', 'benchmarking',
+    'memory', 'recursion', 'immutability', 'inheritance',
+)
+
+
+class StubConfig:
+    """Latency and failure knobs for the stub server."""
+
+    def __init__(self, latency=0.5, jitter=0.1, error_rate=0.0, malformed_rate=0.0, seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.malformed_rate = malformed_rate
+        self.random = random.Random(seed)
+        self.requests = 0
+        self.errors = 0
+        self.malformed = 0
+
+
+def fake_questions(tech, count):
+    questions = []
+    for i in range(count):
+        first, second, third = random.Random(f"{tech}:{i}").sample(TOPICS, 3)
+        questions.append(f"How would you handle {first}, {second} and {third} in {tech}?")
+    return questions
+
+
+def build_content(prompt):
+    """Answer a question-generation prompt with content in the shape it asks for."""
+    listed = re.findall(r'^- (.+)$', prompt, re.MULTILINE)
+    if listed:
+        return json.dumps({tech: fake_questions(tech, 3) for tech in listed})
+
+    if prompt.startswith('Score each candidate answer'):
+        ids = re.findall(r'"id": "(\d+)"', prompt.split('\nFormat as')[0])
+        return json.dumps({'scores': [{'id': i, 'score': 5, 'feedback': "Stub feedback."} for i in ids]})
+
+    match = re.search(r'Generate (\d+) .*? for (.+?)\.\s*$', prompt, re.MULTILINE)
+    questions = fake_questions(match.group(2), int(match.group(1))) if match else fake_questions('this technology', 3)
+    if '"questions"' in prompt:
+        return json.dumps({'questions': questions})
+    return json.dumps(questions)
+
+
+def malform(content, rng):
+    """Damage a response the way real models do: fences, prose, truncation."""
+    kind = rng.choice(('fenced', 'prose', 'truncated'))
+    if kind == 'fenced':
+        return f"```json\n{content}\n```"
+    if kind == 'prose':
+        return f"Sure! Here are your questions:\n{content}\nGood luck!"
+    return content[:max(1, len(content) * 2 // 3)]
+
+
+async def stream_content(request, body, content, delay):
+    """Send content as server-sent chat.completion.chunk events spread over the delay."""
+    response = web.StreamResponse(headers={'Content-Type': 'text/event-stream'})
+    await response.prepare(request)
+    pieces = [content[i:i + STREAM_CHUNK_CHARS] for i in range(0, len(content), STREAM_CHUNK_CHARS)]
+    chunk = {
+        'id': f"chatcmpl-stub-{request.app['config'].requests}",
+        'object': 'chat.completion.chunk',
+        'created': int(time.time()),
+        'model': body.get('model', 'stub'),
+    }
+
+    async def send(choices, **extra):
+        data = json.dumps({**chunk, 'choices': choices, **extra})
+        await response.write(f"data: {data}\n\n".encode('utf-8'))
+
+    for piece in pieces:
+        await asyncio.sleep(delay / max(1, len(pieces)))
+        await send([{'index': 0, 'delta': {'content': piece}, 'finish_reason': None}])
+    await send([{'index': 0, 'delta': {}, 'finish_reason': 'stop'}])
+    if (body.get('stream_options') or {}).get('include_usage'):
+        prompt_tokens = sum(len(m['content'].split()) for m in body['messages'])
+        completion_tokens = len(content.split())
+        await send([], usage={'prompt_tokens': prompt_tokens, 'completion_tokens': completion_tokens,
+                              'total_tokens': prompt_tokens + completion_tokens})
+    await response.write(b"data: [DONE]\n\n")
+    await response.write_eof()
+    return response
+
+
+async def chat_completions(request):
+    config = request.app['config']
+    body = await request.json()
+    config.requests += 1
+
+    delay = max(0.0, config.random.gauss(config.latency, config.jitter))
+    # Streams send their first chunk after a fraction of the latency
+    streamed = bool(body.get('stream'))
+    await asyncio.sleep(delay * STREAM_FIRST_CHUNK if streamed else delay)
+
+    if config.random.random() < config.error_rate:
+        config.errors += 1
+        status = config.random.choice((429, 500, 503))
+        return web.json_response({'error': {'message': 'stub failure', 'type': 'server_error'}}, status=status)
+
+    prompt = body['messages'][-1]['content']
+    content = build_content(prompt)
+    if config.random.random() < config.malformed_rate:
+        config.malformed += 1
+        content = malform(content, config.random)
+    if streamed:
+        return await stream_content(request, body, content, delay * (1 - STREAM_FIRST_CHUNK))
+
+    prompt_tokens = sum(len(m['content'].split()) for m in body['messages'])
+    completion_tokens = len(content.split())
+    return web.json_response({
+        'id': f"chatcmpl-stub-{config.requests}",
+        'object': 'chat.completion',
+        'created': int(time.time()),
+        'model': body.get('model', 'stub'),
+        'choices': [{
+            'index': 0,
+            'message': {'role': 'assistant', 'content': content},
+            'finish_reason': 'stop',
+        }],
+        'usage': {
+            'prompt_tokens': prompt_tokens,
+            'completion_tokens': completion_tokens,
+            'total_tokens': prompt_tokens + completion_tokens,
+        },
+    })
+
+
+async def stats(request):
+    config = request.app['config']
+    return web.json_response({
+        'requests': config.requests,
+        'errors': config.errors,
+        'malformed': config.malformed,
+    })
+
+
+def create_app(config):
+    app = web.Application()
+    app['config'] = config
+    app.router.add_post('/v1/chat/completions', chat_completions)
+    app.router.add_get('/stats', stats)
+    return app
+
+
+class StubServer:
+    """Runs the stub on a background thread so benchmarks can share a process with it."""
+
+    def __init__(self, config, host='127.0.0.1', port=0):
+        self.config = config
+        self.host = host
+        self.port = port
+        self._loop = asyncio.new_event_loop()
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='stub-llm', daemon=True)
+
+    @property
+    def base_url(self):
+        return f"http://{self.host}:{self.port}/v1"
+
+    def _run(self):
+        asyncio.set_event_loop(self._loop)
+        runner = web.AppRunner(create_app(self.config), access_log=None)
+        self._loop.run_until_complete(runner.setup())
+        site = web.TCPSite(runner, self.host, self.port)
+        self._loop.run_until_complete(site.start())
+        self.port = site._server.sockets[0].getsockname()[1]
+        self._runner = runner
+        self._ready.set()
+        self._loop.run_forever()
+        self._loop.run_until_complete(runner.cleanup())
+
+    def start(self):
+        self._thread.start()
+        self._ready.wait()
+        return self
+
+    def stop(self):
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a local stub of the OpenAI chat-completions API.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8799)
+    parser.add_argument('--latency', type=float, default=0.5, help="mean response latency in seconds")
+    parser.add_argument('--jitter', type=float, default=0.1, help="latency standard deviation in seconds")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="fraction of requests failing with 429/5xx")
+    parser.add_argument('--malformed-rate', type=float, default=0.0, help="fraction of responses with broken JSON")
+    parser.add_argument('--seed', type=int)
+    args = parser.parse_args(argv)
+
+    config = StubConfig(args.latency, args.jitter, args.error_rate, args.malformed_rate, args.seed)
+    web.run_app(create_app(config), host=args.host, port=args.port, access_log=None)
+
+
+if __name__ == "__main__":
+    main()
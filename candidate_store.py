@@ -0,0 +1,448 @@
+"""
+TalentScout - Candidate Store
+Searchable SQLite store of finished interviews for recruiters, with full-text
+search and indexes on technology, experience, location and position.
+
+Usage:
+    python candidate_store.py search "Kubernetes + Go, 5+ years, Berlin"
+    python candidate_store.py search --tech Python --location Berlin --limit 50
+    python candidate_store.py show <session_id>
+    python candidate_store.py stats
+"""
+
+import argparse
+import json
+import os
+import queue
+import re
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+
+if __name__ == "__main__":
+    # Run as a command: load .env before this module and its imports read their settings
+    from dotenv import load_dotenv
+    load_dotenv()
+
+from metrics import metrics  # noqa: E402
+from question_scheduler import asked_questions  # noqa: E402
+from tech_taxonomy import get_taxonomy, lookup_key  # noqa: E402
+
+# Store settings (set CANDIDATE_STORE_PATH to an empty string to disable)
+CANDIDATE_STORE_PATH = os.getenv('CANDIDATE_STORE_PATH', '.cache/candidates.sqlite3')
+CANDIDATE_STORE_FLUSH_INTERVAL = float(os.getenv('CANDIDATE_STORE_FLUSH_INTERVAL', '0.2'))
+
+SEARCH_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+# Totals are counted up to this many matches and reported as a lower bound beyond it
+COUNT_LIMIT = 10000
+# Largest number of candidates committed in one write
+MAX_BATCH = 500
+
+# Message the engine sends after each answered question; answers are found by it
+ANSWER_ACKNOWLEDGEMENT = "Thank you for your answer! Let me ask the next question."
+
+# Experience facets run from exp0 to this many years; longer careers share the last one
+MAX_EXPERIENCE_FACET = 40
+
+# The FTS table indexes the candidates table's own columns (external content),
+# kept in step by triggers. Besides the searchable text it indexes a facets
+# column of exact-match tokens for each technology, the city and the years of
+# experience, so every structured filter is answered by FTS5 merging posting
+# lists instead of by scanning rows.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS candidates (
+    id INTEGER PRIMARY KEY,
+    session_id TEXT NOT NULL UNIQUE,
+    name TEXT NOT NULL,
+    email TEXT NOT NULL,
+    experience INTEGER,
+    position TEXT NOT NULL,
+    location TEXT NOT NULL,
+    location_key TEXT NOT NULL,
+    techs TEXT NOT NULL,
+    responses TEXT NOT NULL,
+    facets TEXT NOT NULL,
+    questions_asked INTEGER NOT NULL,
+    average_score REAL,
+    completed_at REAL NOT NULL,
+    record BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_candidates_location ON candidates (location_key);
+CREATE VIRTUAL TABLE IF NOT EXISTS candidates_fts USING fts5(
+    name, position, location, techs, responses, facets,
+    content='candidates', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS candidates_fts_insert AFTER INSERT ON candidates BEGIN
+    INSERT INTO candidates_fts (rowid, name, position, location, techs, responses, facets)
+    VALUES (new.id, new.name, new.position, new.location, new.techs, new.responses, new.facets);
+END;
+CREATE TRIGGER IF NOT EXISTS candidates_fts_delete AFTER DELETE ON candidates BEGIN
+    INSERT INTO candidates_fts (candidates_fts, rowid, name, position, location, techs, responses, facets)
+    VALUES ('delete', old.id, old.name, old.position, old.location, old.techs, old.responses, old.facets);
+END;
+CREATE TRIGGER IF NOT EXISTS candidates_fts_update AFTER UPDATE ON candidates BEGIN
+    INSERT INTO candidates_fts (candidates_fts, rowid, name, position, location, techs, responses, facets)
+    VALUES ('delete', old.id, old.name, old.position, old.location, old.techs, old.responses, old.facets);
+    INSERT INTO candidates_fts (rowid, name, position, location, techs, responses, facets)
+    VALUES (new.id, new.name, new.position, new.location, new.techs, new.responses, new.facets);
+END;
+"""
+
+UPSERT = """
+INSERT INTO candidates (session_id, name, email, experience, position, location, location_key,
+                        techs, responses, facets, questions_asked, average_score, completed_at, record)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (session_id) DO UPDATE SET
+    name = excluded.name, email = excluded.email, experience = excluded.experience,
+    position = excluded.position, location = excluded.location, location_key = excluded.location_key,
+    techs = excluded.techs, responses = excluded.responses, facets = excluded.facets,
+    questions_asked = excluded.questions_asked, average_score = excluded.average_score,
+    completed_at = excluded.completed_at, record = excluded.record
+"""
+
+SUMMARY_COLUMNS = ('session_id', 'name', 'email', 'experience', 'position', 'location', 'techs',
+                   'questions_asked', 'average_score', 'completed_at')
+
+_YEARS = re.compile(r'(\d+)\s*\+?\s*(?:years?|yrs?|y)\b(?:\s+of)?(?:\s+experience)?', re.IGNORECASE)
+_TERM = re.compile(r'\w+')
+# Query words that only join the filters together
+_FILLER = frozenset(['in', 'at', 'of', 'from', 'based', 'located', 'near', 'the', 'a', 'an', 'experience'])
+
+
+def location_key(location):
+    """Index key for a location: the city (the part before any comma), lowercased."""
+    return ' '.join(str(location or '').split(',')[0].lower().split())
+
+
+def tech_facet(tech):
+    """FTS token for a technology: its lookup key hex-encoded, so 'C++' and 'C#' stay apart."""
+    return 'tech' + lookup_key(get_taxonomy().normalize(tech)).encode('utf-8').hex()
+
+
+def city_facet(location):
+    return 'city' + location_key(location).encode('utf-8').hex()
+
+
+def experience_facet(years):
+    return f"exp{min(max(int(years), 0), MAX_EXPERIENCE_FACET)}"
+
+
+def facets(info, techs):
+    """Space-separated facet tokens for a candidate's technologies, city and experience."""
+    tokens = [tech_facet(tech) for tech in techs]
+    if info.get('location'):
+        tokens.append(city_facet(info['location']))
+    if info.get('experience') is not None:
+        tokens.append(experience_facet(info['experience']))
+    return ' '.join(tokens)
+
+
+def candidate_record(state):
+    """Build the stored record for a session: candidate details, questions, answers and scores."""
+    info = state.candidate_info
+    # The engine acknowledges each answer before asking the next question, so
+    # the candidate messages followed by that acknowledgement are the answers,
+    # in the order of questions_asked (the first question itself is not always
+    # in the transcript)
+    responses = [message.text for message in state.messages if message.is_user]
+    answers = dict(zip(state.questions_asked, (
+        message.text for message, reply in zip(state.messages, state.messages[1:])
+        if message.is_user and not reply.is_user and reply.text == ANSWER_ACKNOWLEDGEMENT
+    )))
+
+    questions = []
+    for question_id, tech, text in asked_questions(state.questions_asked, state.generated_questions):
+        score = state.scores.get(question_id) or {}
+        questions.append({
+            'id': question_id, 'tech': tech, 'question': text, 'answer': answers.get(question_id),
+            'score': score.get('score'), 'feedback': score.get('feedback'),
+        })
+
+    return {
+        'session_id': state.session_id,
+        'candidate_info': dict(info),
+        'tech_stack': list(state.tech_stack or info.get('tech_stack', [])),
+        'questions': questions,
+        'responses': responses,
+        'completed_at': time.time(),
+    }
+
+
+def parse_query(text, is_location=None):
+    """Split a free-text query such as "Kubernetes + Go, 5+ years, Berlin" into filters.
+
+    Returns {'techs', 'min_experience', 'location', 'text'}: parts naming a
+    known technology become tech filters, "N years" / "N+ years" a minimum
+    experience, the first part is_location(part) accepts the city, and
+    everything else full-text terms.
+    """
+    techs, terms, min_experience, location = [], [], None, None
+    match = _YEARS.search(text or '')
+    if match:
+        min_experience = int(match.group(1))
+        text = text[:match.start()] + ' ' + text[match.end():]
+
+    taxonomy = get_taxonomy()
+    for part in re.split(r'[,+&/;]|\band\b|\bwith\b', text or ''):
+        part = part.strip()
+        if not part:
+            continue
+        tech = taxonomy.lookup(part)
+        if tech is not None:
+            techs.append(tech)
+            continue
+        words = [word for word in part.split() if word.lower() not in _FILLER]
+        if location is None and words and is_location is not None and is_location(' '.join(words)):
+            location = ' '.join(words)
+        else:
+            terms.extend(words)
+    return {'techs': techs, 'min_experience': min_experience, 'location': location, 'text': ' '.join(terms)}
+
+
+def fts_query(text, column=None):
+    """Quote every word of text as an FTS5 term so user input cannot inject query syntax."""
+    terms = [f'"{term}"' for term in _TERM.findall(text or '')]
+    if not terms:
+        return None
+    query = ' '.join(terms)
+    return f"{column} : ({query})" if column else query
+
+
+class CandidateStore:
+    """SQLite candidate store written through a batching background writer."""
+
+    def __init__(self, path, flush_interval=CANDIDATE_STORE_FLUSH_INTERVAL):
+        self.path = path
+        self.flush_interval = flush_interval
+        self._local = threading.local()
+        self._queue = queue.Queue()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._connect()
+        with conn:
+            conn.executescript(SCHEMA)
+        threading.Thread(target=self._writer, name='candidate-store', daemon=True).start()
+
+    def _connect(self):
+        """Return the connection for the current thread, opening it if needed."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def submit(self, record):
+        """Queue a record for writing; a later record for the same session replaces it."""
+        self._queue.put(record)
+
+    def flush(self):
+        """Block until everything queued so far has been written."""
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait()
+
+    def _writer(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < MAX_BATCH:
+                remaining = deadline - time.monotonic()
+                try:
+                    batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            records = [item for item in batch if isinstance(item, dict)]
+            started = time.perf_counter()
+            try:
+                if records:
+                    self.write_batch(records)
+                    metrics.observe('candidate_store_write_seconds', time.perf_counter() - started)
+                    metrics.inc('candidate_store_records_total', len(records))
+            except Exception as e:
+                metrics.inc('candidate_store_errors_total', error=type(e).__name__)
+            finally:
+                for item in batch:
+                    if isinstance(item, threading.Event):
+                        item.set()
+
+    def write_batch(self, records):
+        """Insert or update records in one transaction."""
+        conn = self._connect()
+        with conn:
+            for record in records:
+                info = record['candidate_info']
+                scores = [q['score'] for q in record['questions'] if q.get('score') is not None]
+                techs = record['tech_stack']
+                conn.execute(UPSERT, (
+                    record['session_id'], info.get('name', ''), info.get('email', ''),
+                    info.get('experience'), info.get('position', ''), info.get('location', ''),
+                    location_key(info.get('location')), ', '.join(techs), '\n'.join(record['responses']),
+                    facets(info, techs), len(record['questions']),
+                    sum(scores) / len(scores) if scores else None, record['completed_at'],
+                    zlib.compress(json.dumps(record, ensure_ascii=False).encode('utf-8')),
+                ))
+
+    def has_location(self, location):
+        """True if any stored candidate is in this city."""
+        return self._connect().execute(
+            "SELECT 1 FROM candidates WHERE location_key = ? LIMIT 1", (location_key(location),)
+        ).fetchone() is not None
+
+    def search(self, text='', techs=(), min_experience=None, max_experience=None, location=None,
+               position=None, cursor=None, limit=SEARCH_PAGE_SIZE):
+        """Return one page of matching candidates, most recent first.
+
+        Every filter must match: all of techs, the experience range, the
+        city, the words of position and the full-text terms of text. Pass the
+        returned next_cursor back to get the following page. total is only
+        counted for the first page, up to COUNT_LIMIT (total_exact is False
+        beyond that).
+        """
+        limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+        terms = [f'facets : "{tech_facet(tech)}"' for tech in techs]
+        if location:
+            terms.append(f'facets : "{city_facet(location)}"')
+        if min_experience is not None or max_experience is not None:
+            low = 0 if min_experience is None else int(min_experience)
+            high = MAX_EXPERIENCE_FACET if max_experience is None else int(max_experience)
+            years = range(max(low, 0), min(high, MAX_EXPERIENCE_FACET) + 1)
+            terms.append(f"facets : ({' OR '.join(experience_facet(y) for y in years) or 'exp_none'})")
+        terms.extend(q for q in (fts_query(text), fts_query(position, 'position')) if q)
+        match = ' AND '.join(f"({term})" for term in terms)
+
+        if match:
+            source, key, where, params = "candidates_fts f", "f.rowid", ["candidates_fts MATCH ?"], [match]
+        else:
+            source, key, where, params = "candidates c", "c.id", [], []
+
+        conn = self._connect()
+        total = None
+        if cursor is None:
+            total = conn.execute(
+                f"SELECT COUNT(*) FROM (SELECT 1 FROM {source} WHERE {' AND '.join(where) or '1'} LIMIT ?)",
+                params + [COUNT_LIMIT + 1]
+            ).fetchone()[0]
+        else:
+            where.append(f"{key} < ?")
+            params.append(int(cursor))
+        if match:
+            source += " JOIN candidates c ON c.id = f.rowid"
+        rows = conn.execute(
+            f"SELECT {key}, {', '.join('c.' + col for col in SUMMARY_COLUMNS)} FROM {source} "
+            f"WHERE {' AND '.join(where) or '1'} ORDER BY {key} DESC LIMIT ?",
+            params + [limit + 1]
+        ).fetchall()
+
+        results = [dict(zip(SUMMARY_COLUMNS, row[1:])) for row in rows[:limit]]
+        return {
+            'results': results,
+            'next_cursor': rows[limit - 1][0] if len(rows) > limit else None,
+            'total': None if total is None else min(total, COUNT_LIMIT),
+            'total_exact': None if total is None else total <= COUNT_LIMIT,
+        }
+
+    def get(self, session_id):
+        """Return the full stored record for a session, or None."""
+        row = self._connect().execute(
+            "SELECT record FROM candidates WHERE session_id = ?", (session_id,)
+        ).fetchone()
+        return json.loads(zlib.decompress(row[0])) if row else None
+
+    def stats(self):
+        conn = self._connect()
+        return {
+            'candidates': conn.execute("SELECT COUNT(*) FROM candidates").fetchone()[0],
+            'cities': conn.execute("SELECT COUNT(DISTINCT location_key) FROM candidates").fetchone()[0],
+        }
+
+
+def search_query(store, query='', **filters):
+    """Search with a free-text query; explicit filters take precedence over what it implies."""
+    parsed = parse_query(query, store.has_location)
+    techs = list(filters.pop('techs', None) or []) + parsed['techs']
+    for name in ('min_experience', 'location'):
+        if filters.get(name) is None:
+            filters[name] = parsed[name]
+    return store.search(text=parsed['text'], techs=techs, **filters)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_candidate_store():
+    """Return the process-wide candidate store, or None when CANDIDATE_STORE_PATH is empty."""
+    global _store
+    if not CANDIDATE_STORE_PATH:
+        return None
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = CandidateStore(CANDIDATE_STORE_PATH)
+    return _store
+
+
+def cmd_search(args, store):
+    started = time.perf_counter()
+    page = search_query(store, args.query, techs=args.tech, min_experience=args.min_experience,
+                        location=args.location, position=args.position, cursor=args.cursor,
+                        limit=args.limit)
+    elapsed = (time.perf_counter() - started) * 1000
+    for row in page['results']:
+        score = f"{row['average_score']:.1f}" if row['average_score'] is not None else '-'
+        print(f"{row['session_id']}  {row['name']:<24} {row['experience'] or 0:>2}y  "
+              f"{row['location']:<16} {row['position']:<24} score {score:>4}  {row['techs']}")
+    total = f"{page['total']} matches, " if page['total'] is not None else ''
+    print(f"\n{total}{len(page['results'])} shown in {elapsed:.1f} ms")
+    if page['next_cursor'] is not None:
+        print(f"Next page: --cursor {page['next_cursor']}")
+
+
+def cmd_show(args, store):
+    record = store.get(args.session_id)
+    if record is None:
+        sys.exit(f"No candidate with session id {args.session_id}")
+    print(json.dumps(record, indent=2, ensure_ascii=False))
+
+
+def cmd_stats(args, store):
+    print(json.dumps(store.stats(), indent=2))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Search finished TalentScout interviews.")
+    parser.add_argument('--path', default=CANDIDATE_STORE_PATH, help="candidate store file")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    search = sub.add_parser('search', help="search candidates")
+    search.add_argument('query', nargs='?', default='', help='e.g. "Kubernetes + Go, 5+ years, Berlin"')
+    search.add_argument('--tech', action='append', help="required technology (repeatable)")
+    search.add_argument('--min-experience', type=int)
+    search.add_argument('--location')
+    search.add_argument('--position')
+    search.add_argument('--cursor', type=int, help="next_cursor from the previous page")
+    search.add_argument('--limit', type=int, default=SEARCH_PAGE_SIZE)
+    search.set_defaults(func=cmd_search)
+
+    show = sub.add_parser('show', help="print one candidate's full record")
+    show.add_argument('session_id')
+    show.set_defaults(func=cmd_show)
+
+    sub.add_parser('stats', help="count stored candidates").set_defaults(func=cmd_stats)
+
+    args = parser.parse_args(argv)
+    if not args.path or not os.path.exists(args.path):
+        sys.exit(f"No candidate store at {args.path!r}")
+    args.func(args, CandidateStore(args.path))
+
+
+if __name__ == "__main__":
+    main()
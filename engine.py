@@ -0,0 +1,531 @@
+"""
+TalentScout - Conversation Engine
+Framework-independent conversation logic driven by an explicit per-session state.
+"""
+
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+import weakref
+from collections import deque
+from contextlib import contextmanager
+
+from answer_scoring import get_answer_scorer
+from candidate_store import ANSWER_ACKNOWLEDGEMENT, candidate_record, get_candidate_store
+from intent import EXIT, OFF_TOPIC, get_intent_classifier
+from metrics import metrics
+from question_pool import PrefetchStats
+from question_scheduler import QuestionScheduler
+from questions import (
+    fill_question_pool,
+    generate_questions_with_llm,
+    infer_likely_techs,
+    start_question_generation,
+)
+from session_store import get_session_store
+from tech_taxonomy import get_taxonomy, lookup_key
+from transcript import Message, Transcript
+from transcript_export import get_transcript_exporter, transcript_record
+
+# Engine behaviour settings
+QUESTION_GEN_PROGRESSIVE = os.getenv('QUESTION_GEN_PROGRESSIVE', '1') == '1'
+QUESTION_PREFETCH = os.getenv('QUESTION_PREFETCH', '1') == '1'
+
+# Idle sessions are evicted after this many seconds (0 keeps them forever)
+SESSION_IDLE_TIMEOUT = float(os.getenv('SESSION_IDLE_TIMEOUT', '1800'))
+SESSION_REAP_INTERVAL = float(os.getenv('SESSION_REAP_INTERVAL', '60'))
+
+# What each intake stage asks for, repeated when the candidate goes off-topic
+FIELD_PROMPTS = {
+    'name': "What is your full name?",
+    'email': "What is your email address?",
+    'phone': "What is your phone number?",
+    'experience': "How many years of experience do you have?",
+    'position': "What position are you applying for?",
+    'location': "What is your current location (city)?",
+    'tech_stack': "Please enter your tech stack (comma-separated technologies, e.g., Python, Django, MySQL, React)",
+}
+
+
+class SessionState:
+    """Everything the conversation needs to remember about one candidate."""
+
+    __slots__ = (
+        'session_id', 'stage', 'candidate_info', 'messages', 'tech_stack',
+        'generated_questions', 'questions_asked', 'current_question',
+        'current_tech', 'waiting_for_answer', 'prefetch', 'stage_entered_at',
+        'scores', 'pending_scores', 'scheduler', 'saved', 'last_active', 'lock',
+        '__weakref__',
+    )
+
+    def __init__(self, session_id=None):
+        self.session_id = session_id or uuid.uuid4().hex
+        self.stage = 'greeting'
+        self.stage_entered_at = time.monotonic()
+        self.last_active = self.stage_entered_at
+        self.candidate_info = {}
+        self.messages = Transcript()
+        self.tech_stack = []
+        self.generated_questions = {}
+        self.questions_asked = []
+        self.current_question = None
+        self.current_tech = None
+        self.waiting_for_answer = False
+        self.scores = {}
+        self.pending_scores = deque()
+        self.prefetch = None
+        self.scheduler = None
+        self.saved = None
+        # Held by the thread running a turn; see session_turn
+        self.lock = threading.RLock()
+        _live_sessions.add(self)
+
+    def enter_stage(self, stage):
+        """Move to a new stage, recording how long the previous one lasted."""
+        if stage == self.stage:
+            return
+        now = time.monotonic()
+        metrics.observe('stage_dwell_seconds', now - self.stage_entered_at, stage=self.stage)
+        self.stage = stage
+        self.stage_entered_at = now
+
+    def add_message(self, text, is_user=False):
+        """Append a message to the transcript."""
+        self.messages.append(Message(text, is_user))
+
+    def touch(self):
+        """Mark the session as active now."""
+        self.last_active = time.monotonic()
+
+    def idle_seconds(self):
+        return time.monotonic() - self.last_active
+
+    def memory_bytes(self):
+        """Approximate bytes this session holds in memory."""
+        size = self.messages.memory_bytes()
+        size += sum(sys.getsizeof(v) for v in self.candidate_info.values())
+        size += sum(sys.getsizeof(q) for qs in list(self.generated_questions.values()) for q in qs)
+        size += sum(sys.getsizeof(q) for q in self.questions_asked)
+        return size
+
+    def evict(self):
+        """Release everything the session holds and mark it expired."""
+        self.messages.close()
+        self.generated_questions = {}
+        drop_prefetch(self)
+        self.scheduler = None
+        self.enter_stage('expired')
+
+    def to_dict(self):
+        """Return the session as a JSON-serializable dict."""
+        return {
+            'session_id': self.session_id,
+            'stage': self.stage,
+            'candidate_info': self.candidate_info,
+            'messages': self.messages.to_list(),
+            'tech_stack': self.tech_stack,
+            'generated_questions': dict(self.generated_questions),
+            'questions_asked': self.questions_asked,
+            'current_question': self.current_question,
+            'current_tech': self.current_tech,
+            'waiting_for_answer': self.waiting_for_answer,
+            'scores': dict(self.scores),
+        }
+
+
+_prefetch_stats = PrefetchStats()
+
+# Every SessionState still referenced somewhere, for the active session gauge
+_live_sessions = weakref.WeakSet()
+metrics.gauge_callback('active_sessions', lambda: len(_live_sessions))
+metrics.gauge_callback('session_memory_bytes', lambda: sum(s.memory_bytes() for s in list(_live_sessions)))
+metrics.gauge_callback('session_memory_bytes_max',
+                       lambda: max((s.memory_bytes() for s in list(_live_sessions)), default=0))
+
+_reaper_started = False
+_reaper_lock = threading.Lock()
+
+
+def get_prefetch_stats():
+    """Return the process-wide prefetch hit/waste counters."""
+    return _prefetch_stats
+
+
+def save_session(state, wait=False):
+    """Persist what changed in the session if a session store is configured.
+
+    Returns the stored version when wait is True, otherwise None.
+    """
+    store = get_session_store()
+    if store is None:
+        return None
+    return store.save(state, wait)
+
+
+def load_session(session_id):
+    """Rebuild a session from the session store, or return None."""
+    store = get_session_store()
+    if store is None or not session_id:
+        return None
+    state = store.load(session_id, SessionState)
+    if state is not None:
+        resume_questions(state)
+    return state
+
+
+def resume_questions(state):
+    """Restart generation for the technologies a restored session was still waiting on."""
+    pool = state.generated_questions
+    if getattr(pool, 'is_complete', True):
+        return
+    fill_question_pool(pool, [tech for tech in pool.tech_stack if tech not in pool])
+
+
+def reap_idle_sessions(timeout=None):
+    """Evict every session idle for longer than timeout seconds and return how many were evicted.
+
+    Sessions are saved to the session store first, if one is configured, so
+    they can be resumed later.
+    """
+    timeout = SESSION_IDLE_TIMEOUT if timeout is None else timeout
+    if not timeout:
+        return 0
+    evicted = 0
+    for state in list(_live_sessions):
+        if state.stage == 'expired' or state.idle_seconds() <= timeout:
+            continue
+        # A session in the middle of a turn is not idle
+        if not state.lock.acquire(blocking=False):
+            continue
+        try:
+            apply_scores(state)
+            save_session(state, wait=True)
+            state.evict()
+        finally:
+            state.lock.release()
+        evicted += 1
+    if evicted:
+        metrics.inc('sessions_evicted_total', evicted)
+    return evicted
+
+
+def _reap_forever(interval):
+    while True:
+        time.sleep(interval)
+        try:
+            reap_idle_sessions()
+        except Exception:
+            metrics.inc('session_reaper_errors_total')
+
+
+def start_session_reaper(interval=None):
+    """Start the idle-session reaper thread once per process."""
+    global _reaper_started
+    if not SESSION_IDLE_TIMEOUT:
+        return
+    with _reaper_lock:
+        if _reaper_started:
+            return
+        _reaper_started = True
+        threading.Thread(target=_reap_forever, args=(interval or SESSION_REAP_INTERVAL,),
+                         name='session-reaper', daemon=True).start()
+
+
+def validate_email(email):
+    """Validate email format."""
+    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
+    return re.match(pattern, email) is not None
+
+
+def validate_phone(phone):
+    """Validate phone number (minimum 10 digits)."""
+    digits = re.sub(r'\D', '', phone)
+    return len(digits) >= 10
+
+
+def parse_tech_stack(tech_string):
+    """Parse and normalize tech stack input."""
+    if not tech_string:
+        return []
+
+    taxonomy = get_taxonomy()
+    normalized = {}
+    for tech in tech_string.split(','):
+        tech = tech.strip()
+        if tech:
+            name = taxonomy.normalize(tech)
+            # First spelling wins, so the candidate's order is kept
+            normalized.setdefault(lookup_key(name), name)
+
+    return list(normalized.values())
+
+
+def start_prefetch(state, position):
+    """Speculatively start generating questions for technologies the position implies."""
+    if not QUESTION_PREFETCH or not QUESTION_GEN_PROGRESSIVE:
+        return
+    likely = infer_likely_techs(position)
+    if likely:
+        drop_prefetch(state)
+        state.prefetch = start_question_generation(likely)
+
+
+def take_generation_errors(state):
+    """Return the background question generation errors not yet reported for this session."""
+    take_errors = getattr(state.generated_questions, 'take_errors', None)
+    return take_errors() if take_errors is not None else []
+
+
+def drop_prefetch(state):
+    """Count a prefetch the session will never use as wasted and release it."""
+    if state.prefetch is not None:
+        get_prefetch_stats().discard(state.prefetch.tech_stack)
+        state.prefetch = None
+
+
+def get_next_question(state):
+    """Get the next question from the generated pool.
+
+    If the pool is still being filled in the background and every question
+    that has arrived so far was asked, wait for the next technology to land.
+    """
+    if not state.tech_stack:
+        return None, None
+
+    if state.scheduler is None:
+        state.scheduler = QuestionScheduler(
+            state.tech_stack,
+            experience=state.candidate_info.get('experience', 0),
+            asked=state.questions_asked,
+        )
+    question, tech, question_id = state.scheduler.next(state.generated_questions)
+    if question_id is not None:
+        state.questions_asked.append(question_id)
+    return question, tech
+
+
+def record_score(state, question_id, result):
+    """Queue a finished answer score and store it unless a turn is running.
+
+    Runs on a scoring worker. A turn in progress owns the session, so the
+    score waits for it to end (see session_turn) instead of holding up the
+    worker.
+    """
+    state.pending_scores.append((question_id, result))
+    apply_scores(state, blocking=False)
+
+
+def apply_scores(state, blocking=True):
+    """Move queued answer scores onto the session and persist them."""
+    if not state.pending_scores or not state.lock.acquire(blocking):
+        return
+    try:
+        while state.pending_scores:
+            question_id, result = state.pending_scores.popleft()
+            state.scores[question_id] = result
+        save_session(state)
+        # Scores often land after the interview ends; refresh the stored candidate
+        if state.stage == 'ended':
+            archive_candidate(state)
+    finally:
+        state.lock.release()
+
+
+@contextmanager
+def session_turn(state):
+    """Hold the session for one turn, then store the scores that arrived meanwhile."""
+    with state.lock:
+        yield
+    apply_scores(state)
+
+
+def archive_candidate(state):
+    """Queue a finished interview for the recruiter search store."""
+    store = get_candidate_store()
+    if store is not None and state.candidate_info:
+        store.submit(candidate_record(state))
+
+
+def export_transcript(state):
+    """Queue a finished interview's transcript for the export segments."""
+    exporter = get_transcript_exporter()
+    if exporter is not None:
+        exporter.submit(transcript_record(state))
+
+
+def score_answer(state, answer):
+    """Queue the answer to the current question for background scoring."""
+    scorer = get_answer_scorer()
+    if scorer is None or not state.current_question or not state.questions_asked:
+        return
+    scorer.submit(state.questions_asked[-1], state.current_tech, state.current_question, answer,
+                  lambda question_id, result: record_score(state, question_id, result))
+
+
+def off_topic_reply(state):
+    """Steer an off-topic message back to the current question or intake field."""
+    if state.stage == 'answering':
+        return ("Let's keep to the interview for now. 💡 Tip: answer in your own words - a short example "
+                "from your experience is plenty, and it's fine to say you're not sure. Please answer the question above.")
+    return ("I can't help with that here, but our recruitment team will be happy to once your application "
+            f"is in. {FIELD_PROMPTS[state.stage]}")
+
+
+def process_message(state, message):
+    """Process user message based on current conversation stage."""
+
+    stage = state.stage
+    intent = get_intent_classifier().classify(message, answering=stage == 'answering')
+    metrics.inc('message_intents_total', intent=intent)
+
+    if intent == EXIT:
+        return 'exit', None
+    if intent == OFF_TOPIC and (stage in FIELD_PROMPTS or stage == 'answering'):
+        return stage, off_topic_reply(state)
+
+    if stage == 'greeting':
+        return 'name', "Great! Let's get started. What is your full name?"
+
+    elif stage == 'name':
+        if len(message.strip()) < 2:
+            return 'name', "Please enter a valid name (at least 2 characters)."
+        state.candidate_info['name'] = message.strip()
+        return 'email', "Nice to meet you! What is your email address?"
+
+    elif stage == 'email':
+        if not validate_email(message):
+            return 'email', "Please enter a valid email address (e.g., john@example.com)."
+        state.candidate_info['email'] = message.strip()
+        return 'phone', "Thank you! What is your phone number?"
+
+    elif stage == 'phone':
+        if not validate_phone(message):
+            return 'phone', "Please enter a valid phone number (at least 10 digits)."
+        state.candidate_info['phone'] = message.strip()
+        return 'experience', "How many years of experience do you have?"
+
+    elif stage == 'experience':
+        try:
+            exp = int(message.strip())
+            if exp < 0:
+                return 'experience', "Please enter a valid number of years (0 or more)."
+            state.candidate_info['experience'] = exp
+            return 'position', "What position are you applying for?"
+        except ValueError:
+            return 'experience', "Please enter a valid number for years of experience."
+
+    elif stage == 'position':
+        if len(message.strip()) < 2:
+            return 'position', "Please enter a valid position name."
+        state.candidate_info['position'] = message.strip()
+        start_prefetch(state, message.strip())
+        return 'location', "What is your current location (city)?"
+
+    elif stage == 'location':
+        if len(message.strip()) < 2:
+            return 'location', "Please enter a valid location."
+        state.candidate_info['location'] = message.strip()
+        return 'tech_stack', "Please enter your tech stack (comma-separated technologies, e.g., Python, Django, MySQL, React)"
+
+    elif stage == 'tech_stack':
+        techs = parse_tech_stack(message)
+        if not techs:
+            return 'tech_stack', "Please enter at least one technology in your tech stack."
+        state.tech_stack = techs
+        state.candidate_info['tech_stack'] = techs
+        return 'generating_questions', None
+
+    elif stage == 'answering':
+        return 'next_question', None
+
+    return stage, None
+
+
+def handle_message(state, message):
+    """Run one candidate turn and return the new stage.
+
+    Bot replies are appended to state.messages. When the returned stage is
+    'generating_questions' the caller should follow up with start_questions.
+    """
+    with session_turn(state):
+        started = time.perf_counter()
+        stage = state.stage
+        state.touch()
+        state.add_message(message, is_user=True)
+
+        new_stage, response = process_message(state, message)
+
+        if new_stage == 'exit':
+            name = state.candidate_info.get('name', 'Candidate')
+            state.add_message(f"👋 Thank you for your time, {name}! Our recruitment team will contact you shortly. Have a great day!")
+            state.enter_stage('ended')
+            drop_prefetch(state)
+            archive_candidate(state)
+            export_transcript(state)
+
+        elif new_stage == 'generating_questions':
+            state.enter_stage(new_stage)
+
+        elif new_stage == 'next_question':
+            state.add_message(ANSWER_ACKNOWLEDGEMENT)
+            score_answer(state, message)
+
+            question, tech = get_next_question(state)
+            if question:
+                state.current_question = question
+                state.current_tech = tech
+                state.add_message(f"**{tech}**: {question}")
+            else:
+                name = state.candidate_info.get('name', 'Candidate')
+                state.add_message(f"🎉 Thank you, {name}! You've completed the technical assessment. Our team will review your responses and get back to you soon.")
+                state.enter_stage('ended')
+                archive_candidate(state)
+                export_transcript(state)
+
+        elif response:
+            state.add_message(response)
+            state.enter_stage(new_stage)
+
+        metrics.observe('turn_seconds', time.perf_counter() - started, stage=stage)
+        save_session(state)
+        return state.stage
+
+
+def start_questions(state, on_error=None):
+    """Generate questions for the parsed tech stack and ask the first one.
+
+    Blocks until the first question is available. Returns (question, tech),
+    or (None, None) if no questions could be generated.
+    """
+    with session_turn(state):
+        tech_stack = state.tech_stack
+
+        if QUESTION_GEN_PROGRESSIVE:
+            # Remaining technologies keep generating after the first one lands
+            prefetch = state.prefetch
+            if prefetch is not None:
+                get_prefetch_stats().record(prefetch.tech_stack, tech_stack)
+                state.prefetch = None
+            pool = start_question_generation(tech_stack, prefetch)
+            state.generated_questions = pool
+            state.scheduler = None
+            question, tech = get_next_question(state)
+            if on_error is not None:
+                for error in take_generation_errors(state):
+                    on_error(error)
+        else:
+            state.generated_questions = generate_questions_with_llm(tech_stack, on_error=on_error)
+            state.scheduler = None
+            question, tech = get_next_question(state)
+
+        if question:
+            state.current_question = question
+            state.current_tech = tech
+            state.waiting_for_answer = True
+            state.enter_stage('answering')
+
+        save_session(state)
+        return question, tech
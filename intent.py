@@ -0,0 +1,184 @@
+"""
+TalentScout - Intent Classification
+Labels each candidate message as an exit, an off-topic aside, an answer or a
+field value, in process and without an LLM call.
+"""
+
+import json
+import math
+import os
+import re
+import threading
+from collections import Counter
+
+# Classifier settings (INTENT_CLASSIFIER=0 keeps only the exit phrase check)
+INTENT_CLASSIFIER = os.getenv('INTENT_CLASSIFIER', '1') == '1'
+INTENT_DATA_PATH = os.getenv(
+    'INTENT_DATA_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'intents.json')
+)
+# Probability the model needs before a message counts as off-topic, and as an
+# exit (higher, since an exit ends the interview)
+INTENT_THRESHOLD = float(os.getenv('INTENT_THRESHOLD', '0.8'))
+INTENT_EXIT_THRESHOLD = float(os.getenv('INTENT_EXIT_THRESHOLD', '0.9'))
+
+EXIT = 'exit'
+OFF_TOPIC = 'off_topic'
+ANSWER = 'answer'
+FIELD_VALUE = 'field_value'
+LABELS = (EXIT, OFF_TOPIC, ANSWER, FIELD_VALUE)
+RARE = '<rare>'
+
+EXIT_PHRASES = (
+    'exit', 'quit', 'bye', 'goodbye', 'thank you', 'thanks', 'thanks for your time', 'see you', 'take care',
+    'end the interview', 'stop the interview', 'end interview', 'leave the interview',
+)
+# Words that may surround an exit phrase without changing what it means
+COURTESY = frozenset("""
+a again all alright and bye cheers day done everything for from go going good gotta great have here i
+i'm it later leave let's like lot m many me much must my need nice now ok okay please really run see
+side so soon sorry stop that that's the then this time to very want well you your thanks
+""".split())
+
+_EXIT = re.compile(
+    r"\b(?:" + '|'.join(re.escape(p) for p in sorted(EXIT_PHRASES, key=len, reverse=True)) + r")\b"
+)
+_TOKEN = re.compile(r"[a-z]+(?:'[a-z]+)?|\d+|[?@+#]")
+
+
+def tokens(text):
+    return _TOKEN.findall(text.lower())
+
+
+def features(text):
+    """Words, word pairs and a few shape markers of a message.
+
+    Exit phrases become a single 'exitphrase' word, so the words around them
+    decide whether a message is leaving or merely mentions leaving.
+    """
+    words = tokens(_EXIT.sub(' exitphrase ', text.lower()))
+    found = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+    if text.rstrip().endswith('?'):
+        found.append('<question>')
+    if len(words) <= 3:
+        found.append('<short>')
+    elif len(words) > 12:
+        found.append('<long>')
+    if any(ch.isdigit() for ch in text):
+        found.append('<digits>')
+    return found
+
+
+def exit_phrase(text):
+    """Return 'only' if text is nothing but exit phrases and courtesy, 'some' if it has one, else None."""
+    lowered = text.lower()
+    if not _EXIT.search(lowered):
+        return None
+    rest = tokens(_EXIT.sub(' ', lowered))
+    return 'only' if all(word in COURTESY for word in rest) else 'some'
+
+
+class IntentModel:
+    """Multinomial naive Bayes over message features, trained from labelled examples."""
+
+    def __init__(self, examples):
+        # Words seen only once are trained as one RARE word, which then stands
+        # in for every word the model has never seen. Technical answers are
+        # full of rare words, so they count as evidence rather than noise.
+        seen = Counter(f for texts in examples.values() for text in texts for f in features(text))
+        self._vocabulary = frozenset(f for f, n in seen.items() if n > 1 or not self._is_word(f))
+        counts = {label: Counter(f for text in texts for f in self._known(text))
+                  for label, texts in examples.items()}
+        vocabulary = set().union(*counts.values()) if counts else set()
+        total = sum(len(texts) for texts in examples.values()) or 1
+
+        self._prior = {}
+        self._weights = {}
+        self._unseen = {}
+        for label, counter in counts.items():
+            denominator = sum(counter.values()) + len(vocabulary) + 1
+            self._prior[label] = math.log((len(examples[label]) + 1) / (total + len(examples)))
+            self._weights[label] = {f: math.log((n + 1) / denominator) for f, n in counter.items()}
+            self._unseen[label] = math.log(1 / denominator)
+
+    @staticmethod
+    def _is_word(feature):
+        return ' ' not in feature and not feature.startswith('<')
+
+    def _known(self, text):
+        """Features of text, with unknown words as RARE and unknown word pairs dropped."""
+        for f in features(text):
+            if f in self._vocabulary:
+                yield f
+            elif self._is_word(f):
+                yield RARE
+
+    @classmethod
+    def from_file(cls, path):
+        """Train on an intents file; a missing file gives a model with no labels."""
+        if not path or not os.path.exists(path):
+            return cls({})
+        with open(path, encoding='utf-8') as f:
+            return cls(json.load(f).get('examples', {}))
+
+    def probabilities(self, text, labels=LABELS):
+        """Return {label: probability} over the given labels."""
+        labels = [label for label in labels if label in self._prior]
+        if not labels:
+            return {}
+        found = list(self._known(text))
+        scores = {}
+        for label in labels:
+            weights, unseen = self._weights[label], self._unseen[label]
+            scores[label] = self._prior[label] + sum(weights.get(f, unseen) for f in found)
+        top = max(scores.values())
+        exps = {label: math.exp(score - top) for label, score in scores.items()}
+        total = sum(exps.values())
+        return {label: value / total for label, value in exps.items()}
+
+
+class IntentClassifier:
+    """Exit phrase automaton in front of a small local model.
+
+    A message made only of exit phrases and courtesy ("ok, bye", "thank
+    you!") is an exit straight away. When an exit phrase comes with other
+    words ("thank you for asking, the GIL...") the model decides. Otherwise
+    the message is the stage's expected input (an answer while answering, a
+    field value before) unless the model is confident it is off-topic.
+    """
+
+    def __init__(self, model=None, threshold=INTENT_THRESHOLD, exit_threshold=INTENT_EXIT_THRESHOLD):
+        self.model = model
+        self.threshold = threshold
+        self.exit_threshold = exit_threshold
+
+    def classify(self, message, answering=False):
+        """Return the intent of message: EXIT, OFF_TOPIC, ANSWER or FIELD_VALUE."""
+        expected = ANSWER if answering else FIELD_VALUE
+        phrase = exit_phrase(message)
+        if phrase == 'only':
+            return EXIT
+        if self.model is None or not message.strip():
+            return expected
+
+        probabilities = self.model.probabilities(message, (EXIT, OFF_TOPIC, expected))
+        if phrase and probabilities.get(EXIT, 0) >= self.exit_threshold:
+            return EXIT
+        if probabilities.get(OFF_TOPIC, 0) >= self.threshold:
+            return OFF_TOPIC
+        return expected
+
+
+_classifier = None
+_classifier_lock = threading.Lock()
+
+
+def get_intent_classifier():
+    """Return the process-wide classifier, training its model on first use."""
+    global _classifier
+    if _classifier is None:
+        with _classifier_lock:
+            if _classifier is None:
+                model = IntentModel.from_file(INTENT_DATA_PATH) if INTENT_CLASSIFIER else None
+                _classifier = IntentClassifier(model)
+    return _classifier
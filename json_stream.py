@@ -0,0 +1,153 @@
+"""
+TalentScout - JSON Stream Parsing
+Incremental, tolerant parsing of the JSON that models return: code fences,
+surrounding prose and responses truncated at max_tokens still yield every
+element that arrived complete.
+"""
+
+import json
+import re
+
+# Text allowed around an array without counting as recovered: a wrapping object
+_WRAPPER_START = re.compile(r'\s*(\{\s*"[^"\\]*"\s*:\s*)?')
+_WRAPPER_END = re.compile(r'\s*\}?\s*')
+
+
+class JSONStreamParser:
+    """Parse the first JSON array or object in text fed to it piece by piece.
+
+    With container='[' each array element is returned as soon as it is
+    complete. With container='{' each member is returned as a (key, value)
+    pair. Anything before the opening bracket (prose, a ``` fence, a wrapping
+    object such as {"questions": [...]}) is skipped, and anything after the
+    closing bracket is ignored.
+    """
+
+    def __init__(self, container='['):
+        self.container = container
+        self.items = []
+        self.done = False
+        # Set when the text was not a bare JSON value (prose, fences, truncation)
+        self.recovered = False
+        self._started = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._member = []
+        self._skipped = []
+        self._in_wrapper = False
+
+    def feed(self, text):
+        """Consume more text and return the elements completed by it."""
+        completed = []
+        if self.done:
+            if not self._clean(_WRAPPER_END, text):
+                self.recovered = True
+            return completed
+        for i, ch in enumerate(text):
+            if not self._started:
+                if self._in_string:
+                    if self._escape:
+                        self._escape = False
+                    elif ch == '\\':
+                        self._escape = True
+                    elif ch == '"':
+                        self._in_string = False
+                elif ch == self.container:
+                    self._started = True
+                    self._depth = 1
+                    if not self._clean(_WRAPPER_START, ''.join(self._skipped)):
+                        self.recovered = True
+                    self._skipped = []
+                    continue
+                elif ch == '{':
+                    self._in_wrapper = True
+                elif ch == '"' and self._in_wrapper:
+                    # Brackets inside the wrapping object's strings do not start the array
+                    self._in_string = True
+                self._skipped.append(ch)
+                continue
+
+            if self._in_string:
+                self._member.append(ch)
+                if self._escape:
+                    self._escape = False
+                elif ch == '\\':
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                continue
+
+            if ch == '"':
+                self._in_string = True
+            elif ch in '[{':
+                self._depth += 1
+            elif ch in ']}':
+                self._depth -= 1
+                if self._depth == 0:
+                    self._emit(completed)
+                    self.done = True
+                    if not self._clean(_WRAPPER_END, text[i + 1:]):
+                        self.recovered = True
+                    break
+            elif ch == ',' and self._depth == 1:
+                self._emit(completed)
+                continue
+            self._member.append(ch)
+        return completed
+
+    def _clean(self, wrapper, text):
+        if self.container == '[':
+            return wrapper.fullmatch(text) is not None
+        return not text.strip()
+
+    def _emit(self, completed):
+        text = ''.join(self._member).strip()
+        self._member = []
+        if not text:
+            return
+        try:
+            if self.container == '[':
+                item = json.loads(text)
+            else:
+                item = next(iter(json.loads('{' + text + '}').items()))
+        except (json.JSONDecodeError, StopIteration):
+            self.recovered = True
+            return
+        self.items.append(item)
+        completed.append(item)
+
+    def close(self):
+        """Finish a truncated stream and return whatever could still be recovered.
+
+        A truncated array element is dropped. In an object, a member whose
+        array value was cut off keeps the elements that arrived complete.
+        """
+        if self.done or not self._started:
+            return []
+        self.recovered = True
+        member = ''.join(self._member)
+        self._member = []
+        if self.container != '{' or ':' not in member:
+            return []
+        key_text, _, value_text = member.partition(':')
+        try:
+            key = json.loads(key_text)
+        except json.JSONDecodeError:
+            return []
+        inner = JSONStreamParser('[')
+        inner.feed(value_text)
+        if not inner.items:
+            return []
+        item = (key, inner.items)
+        self.items.append(item)
+        return [item]
+
+
+def extract_json_array(text):
+    """Return the complete elements of the first JSON array in text."""
+    parser = JSONStreamParser('[')
+    parser.feed(text or '')
+    parser.close()
+    return parser.items
+
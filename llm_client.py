@@ -0,0 +1,346 @@
+"""
+TalentScout - LLM Client
+One pooled OpenAI client per process, with request and token rate limits,
+jittered exponential backoff, a circuit breaker and hedged requests.
+"""
+
+import os
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+
+from metrics import metrics
+
+# Client settings (0 disables a rate limit)
+LLM_RPM_LIMIT = int(os.getenv('LLM_RPM_LIMIT', '0'))
+LLM_TPM_LIMIT = int(os.getenv('LLM_TPM_LIMIT', '0'))
+LLM_MAX_RETRIES = int(os.getenv('LLM_MAX_RETRIES', '3'))
+LLM_BACKOFF_BASE = float(os.getenv('LLM_BACKOFF_BASE', '0.5'))
+LLM_BACKOFF_MAX = float(os.getenv('LLM_BACKOFF_MAX', '8'))
+LLM_BREAKER_THRESHOLD = int(os.getenv('LLM_BREAKER_THRESHOLD', '5'))
+LLM_BREAKER_COOLDOWN = float(os.getenv('LLM_BREAKER_COOLDOWN', '30'))
+# Ask for JSON output mode on requests that expect JSON
+LLM_JSON_MODE = os.getenv('LLM_JSON_MODE', '1') == '1'
+
+# Hedging: resend requests still running at this latency percentile (LLM_HEDGE=0 disables)
+LLM_HEDGE = os.getenv('LLM_HEDGE', '1') == '1'
+LLM_HEDGE_PERCENTILE = float(os.getenv('LLM_HEDGE_PERCENTILE', '95'))
+LLM_HEDGE_DELAY = float(os.getenv('LLM_HEDGE_DELAY', '5'))
+LLM_HEDGE_MODEL = os.getenv('LLM_HEDGE_MODEL', '')
+# Largest share of requests that may be hedged, so a slow provider is not flooded
+LLM_HEDGE_BUDGET = float(os.getenv('LLM_HEDGE_BUDGET', '0.1'))
+
+# Recent latencies kept per request kind, and how many are needed before the
+# percentile replaces LLM_HEDGE_DELAY as the hedge deadline
+HEDGE_WINDOW = 200
+HEDGE_MIN_SAMPLES = 20
+
+# Rough prompt size used to charge the token bucket before the response arrives
+CHARS_PER_TOKEN = 4
+
+
+def retryable_errors():
+    """Return the OpenAI errors worth retrying.
+
+    openai is imported on first use because it dominates start-up time and
+    sessions served from the bank, cache or fallbacks never need it.
+    """
+    import openai
+    return (
+        openai.RateLimitError,
+        openai.APITimeoutError,
+        openai.APIConnectionError,
+        openai.InternalServerError,
+    )
+
+
+class LLMUnavailable(Exception):
+    """The request was not sent because the provider is degraded or over its limits."""
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at rate_per_minute."""
+
+    def __init__(self, rate_per_minute):
+        self.capacity = float(rate_per_minute)
+        self.rate = rate_per_minute / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, amount=1, timeout=None):
+        """Take amount tokens, waiting up to timeout seconds. Returns False if they never arrive."""
+        amount = min(amount, self.capacity)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return True
+                wait = (amount - self.tokens) / self.rate
+            if deadline is not None and now + wait > deadline:
+                return False
+            time.sleep(wait)
+
+    def refund(self, amount):
+        """Return unused tokens, e.g. when a response used fewer than estimated."""
+        with self._lock:
+            self.tokens = min(self.capacity, self.tokens + amount)
+
+
+class CircuitBreaker:
+    """Opens after consecutive failures and lets one probe through after a cooldown.
+
+    A probe that neither succeeds nor fails within another cooldown counts as
+    lost, and the next caller probes instead.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+    def __init__(self, threshold, cooldown):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probe_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """Return True if a request may be sent now."""
+        if not self.threshold:
+            return True
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            now = time.monotonic()
+            if (self.state == self.OPEN and now - self.opened_at >= self.cooldown or
+                    self.state == self.HALF_OPEN and now - self.probe_at >= self.cooldown):
+                self.state = self.HALF_OPEN
+                self.probe_at = now
+                return True
+            return False
+
+    def is_open(self):
+        """True while requests are being short-circuited."""
+        with self._lock:
+            return self.state != self.CLOSED and time.monotonic() - self.opened_at < self.cooldown
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.state = self.CLOSED
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or (self.threshold and self.failures >= self.threshold):
+                if self.state != self.OPEN:
+                    metrics.inc('llm_circuit_opened_total')
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+    def abort_probe(self):
+        """Reopen the circuit if a probe ended without a result (e.g. a non-retryable error)."""
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                metrics.inc('llm_circuit_opened_total')
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+
+def backoff_delay(attempt, error=None):
+    """Full-jitter exponential backoff, honouring a Retry-After header when given."""
+    response = getattr(error, 'response', None)
+    retry_after = response.headers.get('retry-after') if response is not None else None
+    if retry_after:
+        try:
+            return min(float(retry_after), LLM_BACKOFF_MAX)
+        except ValueError:
+            pass
+    return random.uniform(0, min(LLM_BACKOFF_MAX, LLM_BACKOFF_BASE * 2 ** attempt))
+
+
+class LLMClient:
+    """Chat completions through a single reused OpenAI client."""
+
+    def __init__(self, api_key=None, base_url=None, rpm_limit=LLM_RPM_LIMIT, tpm_limit=LLM_TPM_LIMIT,
+                 max_retries=LLM_MAX_RETRIES, breaker_threshold=LLM_BREAKER_THRESHOLD,
+                 breaker_cooldown=LLM_BREAKER_COOLDOWN, hedge=LLM_HEDGE, hedge_model=LLM_HEDGE_MODEL):
+        import openai
+
+        # Retries are handled here so they share the limiter and breaker
+        self.retryable = retryable_errors()
+        self.client = openai.OpenAI(api_key=api_key or os.getenv('OPENAI_API_KEY'),
+                                    base_url=base_url or os.getenv('OPENAI_BASE_URL') or None,
+                                    max_retries=0)
+        self.requests = TokenBucket(rpm_limit) if rpm_limit else None
+        self.tokens = TokenBucket(tpm_limit) if tpm_limit else None
+        self.max_retries = max_retries
+        self.breaker = CircuitBreaker(breaker_threshold, breaker_cooldown)
+        self.hedge = hedge
+        self.hedge_model = hedge_model
+        self._latencies = {}
+        self._hedge_lock = threading.Lock()
+        self._hedge_calls = 0
+        self._hedges_sent = 0
+        metrics.gauge_callback('llm_circuit_open', lambda: int(self.breaker.is_open()))
+
+    def _acquire(self, estimate, timeout):
+        started = time.perf_counter()
+        if self.requests is not None and not self.requests.acquire(1, timeout):
+            metrics.inc('llm_rate_limited_total', limit='requests')
+            raise LLMUnavailable("request rate limit reached")
+        if self.tokens is not None and not self.tokens.acquire(estimate, timeout):
+            if self.requests is not None:
+                self.requests.refund(1)
+            metrics.inc('llm_rate_limited_total', limit='tokens')
+            raise LLMUnavailable("token rate limit reached")
+        waited = time.perf_counter() - started
+        if waited > 0.001:
+            metrics.observe('llm_rate_limit_wait_seconds', waited)
+
+    def create(self, messages, model, temperature, max_tokens, timeout=None, kind='llm',
+               json_mode=False, stream=False):
+        """Send a chat completion, retrying transient errors with backoff.
+
+        Raises LLMUnavailable without sending anything while the circuit is
+        open or when the rate limits cannot be met within the timeout. With
+        stream=True the open response stream is returned; only errors before
+        it opens are retried.
+        """
+        if not self.breaker.allow():
+            metrics.inc('llm_short_circuited_total', kind=kind)
+            raise LLMUnavailable("LLM provider is temporarily unavailable")
+
+        options = {}
+        if json_mode and LLM_JSON_MODE:
+            options['response_format'] = {'type': 'json_object'}
+        if stream:
+            options['stream'] = True
+            options['stream_options'] = {'include_usage': True}
+
+        estimate = sum(len(m['content']) for m in messages) // CHARS_PER_TOKEN + max_tokens
+        started = time.perf_counter()
+        try:
+            for attempt in range(self.max_retries + 1):
+                self._acquire(estimate, timeout)
+                try:
+                    response = self.client.chat.completions.create(
+                        model=model,
+                        messages=messages,
+                        temperature=temperature,
+                        max_tokens=max_tokens,
+                        timeout=timeout,
+                        **options
+                    )
+                except self.retryable as e:
+                    self.breaker.record_failure()
+                    if attempt == self.max_retries or not self.breaker.allow():
+                        raise
+                    metrics.inc('llm_retries_total', kind=kind, error=type(e).__name__)
+                    time.sleep(backoff_delay(attempt, e))
+                    continue
+
+                self.breaker.record_success()
+                if not stream:
+                    # An open stream says nothing about how long the answer takes
+                    self._latencies.setdefault(kind, deque(maxlen=HEDGE_WINDOW)).append(time.perf_counter() - started)
+                usage = getattr(response, 'usage', None)
+                if self.tokens is not None and usage is not None and usage.total_tokens:
+                    self.tokens.refund(max(0, estimate - usage.total_tokens))
+                return response
+        except BaseException:
+            # A probe must not leave the circuit half-open
+            self.breaker.abort_probe()
+            raise
+
+    def hedge_delay(self, kind):
+        """Seconds to wait before hedging a request of this kind."""
+        samples = self._latencies.get(kind)
+        if samples is None or len(samples) < HEDGE_MIN_SAMPLES:
+            return LLM_HEDGE_DELAY
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * LLM_HEDGE_PERCENTILE / 100))]
+
+    def _submit(self, *args):
+        # One thread per request: a bounded pool would queue requests under
+        # load, which looks like provider latency and triggers more hedges
+        future = Future()
+
+        def run():
+            future.set_running_or_notify_cancel()
+            try:
+                future.set_result(self.create(*args))
+            except BaseException as e:
+                future.set_exception(e)
+
+        threading.Thread(target=run, name='llm-request', daemon=True).start()
+        return future
+
+    def _take_hedge(self):
+        with self._hedge_lock:
+            if self._hedges_sent >= LLM_HEDGE_BUDGET * self._hedge_calls:
+                return False
+            self._hedges_sent += 1
+            return True
+
+    def create_hedged(self, messages, model, temperature, max_tokens, timeout=None, kind='llm',
+                      json_mode=False, stream=False):
+        """Like create(), but send a duplicate request if the first is slow.
+
+        If no response has arrived by the hedge deadline (the configured
+        percentile of recent latencies for this kind), the same request goes
+        out again, to LLM_HEDGE_MODEL if set, and whichever succeeds first is
+        returned. At most LLM_HEDGE_BUDGET of all calls are hedged. The other
+        request is left to finish and its answer dropped. Streamed requests
+        are not hedged, since create() returns them as soon as the stream
+        opens, long before the answer is complete.
+        """
+        if not self.hedge or stream:
+            return self.create(messages, model, temperature, max_tokens, timeout, kind, json_mode, stream)
+
+        with self._hedge_lock:
+            self._hedge_calls += 1
+        primary = self._submit(messages, model, temperature, max_tokens, timeout, kind, json_mode)
+        done, _ = wait([primary], timeout=self.hedge_delay(kind))
+        if done:
+            return primary.result()
+        if not self._take_hedge():
+            metrics.inc('llm_hedges_total', kind=kind, outcome='over_budget')
+            return primary.result()
+
+        hedge = self._submit(messages, self.hedge_model or model, temperature, max_tokens, timeout, kind, json_mode)
+        pending = {primary, hedge}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    metrics.inc('llm_hedges_total', kind=kind, outcome='won' if future is hedge else 'wasted')
+                    return future.result()
+                error = error or future.exception()
+        metrics.inc('llm_hedges_total', kind=kind, outcome='failed')
+        raise error
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_llm_client():
+    """Return the process-wide LLM client, creating it on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = LLMClient()
+    return _client
@@ -0,0 +1,229 @@
+"""
+TalentScout - Metrics
+Lightweight in-process counters, gauges and histograms with Prometheus text
+and periodic JSONL exporters.
+"""
+
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Exporter settings
+METRICS_PORT = int(os.getenv('METRICS_PORT', '0'))
+METRICS_JSONL_PATH = os.getenv('METRICS_JSONL_PATH', '')
+METRICS_JSONL_INTERVAL = float(os.getenv('METRICS_JSONL_INTERVAL', '60'))
+
+METRIC_PREFIX = 'talentscout_'
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _label_key(labels):
+    return tuple(sorted(labels.items()))
+
+
+def _format_labels(key, extra=None):
+    pairs = list(key) + (extra or [])
+    if not pairs:
+        return ''
+    inner = ','.join(f'{name}="{str(value)}"' for name, value in pairs)
+    return '{' + inner + '}'
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus style."""
+
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class _Timer:
+    __slots__ = ('registry', 'name', 'labels', 'started')
+
+    def __init__(self, registry, name, labels):
+        self.registry = registry
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.registry.observe(self.name, time.perf_counter() - self.started, **self.labels)
+        return False
+
+
+class MetricsRegistry:
+    """Thread-safe store for every metric the process records."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+        self._gauges = {}
+        self._gauge_callbacks = {}
+
+    def inc(self, name, amount=1, **labels):
+        """Add to a counter."""
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def observe(self, name, value, buckets=DEFAULT_BUCKETS, **labels):
+        """Record a value (usually seconds) in a histogram."""
+        key = (name, _label_key(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(buckets)
+            histogram.observe(value)
+
+    def set_gauge(self, name, value, **labels):
+        """Set a gauge to an absolute value."""
+        with self._lock:
+            self._gauges[(name, _label_key(labels))] = value
+
+    def gauge_callback(self, name, callback):
+        """Register a gauge whose value is read from callback() at export time."""
+        with self._lock:
+            self._gauge_callbacks[name] = callback
+
+    def timer(self, name, **labels):
+        """Context manager that observes its elapsed time in a histogram."""
+        return _Timer(self, name, labels)
+
+    def _gauge_values(self):
+        # Callbacks may take other locks or record metrics, so run them unlocked
+        with self._lock:
+            gauges = dict(self._gauges)
+            callbacks = list(self._gauge_callbacks.items())
+        for name, callback in callbacks:
+            try:
+                gauges[(name, ())] = callback()
+            except Exception:
+                continue
+        return gauges
+
+    def snapshot(self):
+        """Return every metric as a JSON-serializable dict."""
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {key: (h.sum, h.count) for key, h in self._histograms.items()}
+        gauges = self._gauge_values()
+
+        def label_name(name, key):
+            return name + _format_labels(key)
+
+        return {
+            'timestamp': time.time(),
+            'counters': {label_name(n, k): v for (n, k), v in counters.items()},
+            'gauges': {label_name(n, k): v for (n, k), v in gauges.items()},
+            'histograms': {
+                label_name(n, k): {'count': c, 'sum': s, 'mean': s / c if c else 0.0}
+                for (n, k), (s, c) in histograms.items()
+            },
+        }
+
+    def render_prometheus(self):
+        """Render every metric in the Prometheus text exposition format."""
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {
+                key: (h.buckets, list(h.counts), h.sum, h.count)
+                for key, h in self._histograms.items()
+            }
+        gauges = self._gauge_values()
+
+        lines = []
+        typed = set()
+
+        def declare(name, kind):
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE {METRIC_PREFIX}{name} {kind}")
+
+        for (name, key), value in sorted(counters.items()):
+            declare(name, 'counter')
+            lines.append(f"{METRIC_PREFIX}{name}{_format_labels(key)} {value}")
+
+        for (name, key), value in sorted(gauges.items()):
+            declare(name, 'gauge')
+            lines.append(f"{METRIC_PREFIX}{name}{_format_labels(key)} {value}")
+
+        for (name, key), (buckets, counts, total, count) in sorted(histograms.items()):
+            declare(name, 'histogram')
+            cumulative = 0
+            for bound, bucket_count in zip(buckets, counts):
+                cumulative += bucket_count
+                lines.append(f"{METRIC_PREFIX}{name}_bucket{_format_labels(key, [('le', bound)])} {cumulative}")
+            lines.append(f"{METRIC_PREFIX}{name}_bucket{_format_labels(key, [('le', '+Inf')])} {count}")
+            lines.append(f"{METRIC_PREFIX}{name}_sum{_format_labels(key)} {total}")
+            lines.append(f"{METRIC_PREFIX}{name}_count{_format_labels(key)} {count}")
+
+        return '\n'.join(lines) + '\n'
+
+
+metrics = MetricsRegistry()
+
+_exporters_started = False
+_exporters_lock = threading.Lock()
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = metrics.render_prometheus().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _dump_jsonl(path, interval):
+    while True:
+        time.sleep(interval)
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(metrics.snapshot()) + '\n')
+
+
+def start_exporters(port=None, jsonl_path=None, interval=None):
+    """Start the configured exporters once per process.
+
+    METRICS_PORT serves /metrics in the Prometheus text format and
+    METRICS_JSONL_PATH appends a snapshot every METRICS_JSONL_INTERVAL seconds.
+    """
+    global _exporters_started
+    port = METRICS_PORT if port is None else port
+    jsonl_path = METRICS_JSONL_PATH if jsonl_path is None else jsonl_path
+    interval = interval or METRICS_JSONL_INTERVAL
+
+    with _exporters_lock:
+        if _exporters_started:
+            return
+        _exporters_started = True
+
+        if port:
+            server = ThreadingHTTPServer(('0.0.0.0', port), _MetricsHandler)
+            threading.Thread(target=server.serve_forever, name='metrics-http', daemon=True).start()
+        if jsonl_path:
+            threading.Thread(target=_dump_jsonl, args=(jsonl_path, interval),
+                             name='metrics-jsonl', daemon=True).start()
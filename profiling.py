@@ -0,0 +1,132 @@
+"""
+TalentScout - Profiling
+Sampling profiler for individual Streamlit reruns. It writes collapsed-stack
+files (for flamegraph.pl, speedscope or inferno) and a per-function summary.
+"""
+
+import hmac
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+
+from metrics import metrics
+
+# Profiling settings: share of reruns profiled, and the ?profile= token that
+# profiles every rerun of one session (empty disables the query parameter)
+PROFILE_SAMPLE_RATE = float(os.getenv('PROFILE_SAMPLE_RATE', '0'))
+PROFILE_ADMIN_TOKEN = os.getenv('PROFILE_ADMIN_TOKEN', '')
+PROFILE_DIR = os.getenv('PROFILE_DIR', '.cache/profiles')
+PROFILE_INTERVAL = float(os.getenv('PROFILE_INTERVAL', '0.001'))
+
+# Functions listed in the summary file
+SUMMARY_FUNCTIONS = 40
+
+
+def frame_name(code):
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+
+class SamplingProfiler:
+    """Samples one thread's stack from a background thread.
+
+    Each sample is weighted by the microseconds since the previous one, so
+    the totals are wall time even when the sampler is delayed by the GIL.
+    """
+
+    def __init__(self, interval=PROFILE_INTERVAL, thread_id=None):
+        self.interval = interval
+        self.thread_id = thread_id or threading.get_ident()
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        own = sys._getframe()
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            now = time.perf_counter()
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None and frame is not own:
+                stack.append(frame_name(frame.f_code))
+                frame = frame.f_back
+            self.stacks[';'.join(reversed(stack))] += int((now - last) * 1e6)
+            last = now
+
+    def start(self):
+        self._thread = threading.Thread(target=self._sample, name='profiler', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop sampling and return {collapsed stack: microseconds}."""
+        self._stop.set()
+        self._thread.join()
+        return self.stacks
+
+
+def summarize(stacks):
+    """Return [(function, inclusive_us, self_us)] sorted by inclusive time."""
+    inclusive = Counter()
+    own = Counter()
+    for stack, weight in stacks.items():
+        functions = stack.split(';')
+        own[functions[-1]] += weight
+        for function in set(functions):
+            inclusive[function] += weight
+    return sorted(((f, inclusive[f], own[f]) for f in inclusive), key=lambda row: -row[1])
+
+
+def write_profile(stacks, label, elapsed, directory=None):
+    """Write the collapsed stacks and a per-function summary; return both paths."""
+    directory = directory or PROFILE_DIR
+    os.makedirs(directory, exist_ok=True)
+    base = os.path.join(directory, f"{time.strftime('%Y%m%d-%H%M%S')}-{label}-{uuid.uuid4().hex[:6]}")
+
+    with open(base + '.folded', 'w', encoding='utf-8') as f:
+        for stack, weight in stacks.most_common():
+            f.write(f"{stack} {weight}\n")
+
+    with open(base + '.txt', 'w', encoding='utf-8') as f:
+        f.write(f"{label}: {elapsed * 1000:.1f} ms wall, {sum(stacks.values()) / 1000:.1f} ms sampled\n\n")
+        f.write(f"{'inclusive ms':>12} {'self ms':>9}  function\n")
+        for function, inclusive, own in summarize(stacks)[:SUMMARY_FUNCTIONS]:
+            f.write(f"{inclusive / 1000:12.1f} {own / 1000:9.1f}  {function}\n")
+    return base + '.folded', base + '.txt'
+
+
+def is_admin_token(token):
+    """Check a ?profile= value against PROFILE_ADMIN_TOKEN."""
+    return bool(PROFILE_ADMIN_TOKEN and token) and hmac.compare_digest(
+        token.encode('utf-8'), PROFILE_ADMIN_TOKEN.encode('utf-8'))
+
+
+@contextmanager
+def profile_rerun(label='rerun', flagged=False):
+    """Profile the enclosed block if the session is flagged or the rerun is sampled.
+
+    When neither applies this costs one random number per call.
+    """
+    if not flagged and not (PROFILE_SAMPLE_RATE and random.random() < PROFILE_SAMPLE_RATE):
+        yield
+        return
+
+    profiler = SamplingProfiler().start()
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        stacks = profiler.stop()
+        try:
+            write_profile(stacks, label, elapsed)
+            metrics.inc('profiles_written_total', reason='flagged' if flagged else 'sampled')
+        except OSError:
+            metrics.inc('profile_errors_total')
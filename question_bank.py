@@ -0,0 +1,339 @@
+"""
+TalentScout - Question Bank
+Compact on-disk question bank with O(1) per-technology sampling, and the
+offline command used to build it.
+
+Usage:
+    python question_bank.py build --techs "Python, React, MySQL" --per-tech 50
+    python question_bank.py build --techs-file techs.txt --workers 8
+    python question_bank.py import questions.jsonl
+    python question_bank.py stats
+    python question_bank.py sample Python
+"""
+
+import argparse
+import json
+import mmap
+import os
+import random
+import struct
+import sys
+from array import array
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+if __name__ == "__main__":
+    # Run as a command: load .env before this module and its imports read their settings
+    from dotenv import load_dotenv
+    load_dotenv()
+
+from question_cache import normalize_tech  # noqa: E402
+from question_dedup import NearDuplicateIndex, drop_near_duplicates  # noqa: E402
+
+# File layout: MAGIC, uint32 index length, JSON index, uint32 offsets, UTF-8 question data.
+# The index maps each normalized tech to [display name, first question, question count].
+MAGIC = b'TSQB1\n'
+DEFAULT_BANK_PATH = os.getenv('QUESTION_BANK_PATH', 'data/questions.bank')
+
+
+class QuestionBank:
+    """Read-only, memory-mapped question bank."""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._map[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a question bank file")
+
+        pos = len(MAGIC)
+        (index_length,) = struct.unpack_from('<I', self._map, pos)
+        pos += 4
+        header = json.loads(self._map[pos:pos + index_length].decode('utf-8'))
+        pos += index_length
+
+        self._index = header['techs']
+        self.total = header['total']
+        self._offsets = array('I')
+        self._offsets.frombytes(self._map[pos:pos + 4 * (self.total + 1)])
+        if sys.byteorder == 'big':
+            self._offsets.byteswap()
+        self._data_start = pos + 4 * (self.total + 1)
+
+    def __contains__(self, tech):
+        return normalize_tech(tech) in self._index
+
+    def __len__(self):
+        return len(self._index)
+
+    def techs(self):
+        """Return the display names of every technology in the bank."""
+        return [entry[0] for entry in self._index.values()]
+
+    def count(self, tech):
+        """Return how many questions the bank holds for a technology."""
+        entry = self._index.get(normalize_tech(tech))
+        return entry[2] if entry else 0
+
+    def _question(self, position):
+        start = self._data_start + self._offsets[position]
+        end = self._data_start + self._offsets[position + 1]
+        return self._map[start:end].decode('utf-8')
+
+    def questions(self, tech):
+        """Return every question stored for a technology."""
+        entry = self._index.get(normalize_tech(tech))
+        if not entry:
+            return []
+        _, first, count = entry
+        return [self._question(first + i) for i in range(count)]
+
+    def sample(self, tech, k, rng=random):
+        """Return k random questions for a technology without reading the rest."""
+        entry = self._index.get(normalize_tech(tech))
+        if not entry:
+            return []
+        _, first, count = entry
+        return [self._question(first + i) for i in rng.sample(range(count), min(k, count))]
+
+    def to_dict(self):
+        """Return the whole bank as {tech: [questions]}."""
+        return {entry[0]: self.questions(entry[0]) for entry in self._index.values()}
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+
+def write_bank(path, bank):
+    """Write {tech: [questions]} to path in the bank format, replacing it atomically."""
+    index = {}
+    offsets = array('I', [0])
+    chunks = []
+    position = 0
+    size = 0
+
+    for tech, questions in bank.items():
+        if not questions:
+            continue
+        index[normalize_tech(tech)] = [tech, position, len(questions)]
+        for question in questions:
+            data = question.encode('utf-8')
+            chunks.append(data)
+            size += len(data)
+            offsets.append(size)
+        position += len(questions)
+
+    if sys.byteorder == 'big':
+        offsets.byteswap()
+    header = json.dumps({'techs': index, 'total': position}, separators=(',', ':')).encode('utf-8')
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack('<I', len(header)))
+        f.write(header)
+        f.write(offsets.tobytes())
+        for data in chunks:
+            f.write(data)
+    os.replace(tmp_path, path)
+
+
+def load_bank(path):
+    """Open the bank at path, or return None if it does not exist."""
+    if not path or not os.path.exists(path):
+        return None
+    return QuestionBank(path)
+
+
+def generate_bank_questions(tech, count, timeout=None):
+    """Ask the LLM for a fresh batch of distinct questions for one technology."""
+    from json_stream import extract_json_array
+    from llm_client import get_llm_client
+    from questions import QUESTION_MODEL
+
+    prompt = f"""Generate {count} distinct intermediate-level technical interview questions for {tech}.
+Cover different topics and avoid rephrasing the same question.
+Format as a JSON object: {{"questions": ["Q1", "Q2", ...]}}"""
+
+    response = get_llm_client().create(
+        messages=[
+            {"role": "system", "content": "You are a technical interview question generator. Respond with valid JSON."},
+            {"role": "user", "content": prompt}
+        ],
+        model=QUESTION_MODEL,
+        temperature=0.9,
+        max_tokens=min(4000, 80 * count),
+        timeout=timeout,
+        kind='bank',
+        json_mode=True
+    )
+
+    content = response.choices[0].message.content
+    return [q for q in extract_json_array(content) if isinstance(q, str)]
+
+
+def index_bank(bank):
+    """Build a near-duplicate index over every question in a bank dict, scoped by technology."""
+    index = NearDuplicateIndex()
+    for tech, questions in bank.items():
+        for question in questions:
+            index.add(question, normalize_tech(tech), tech)
+    return index
+
+
+def top_up_tech(tech, existing, per_tech, batch_size, max_rounds, timeout, index=None):
+    """Generate questions for one technology until it reaches per_tech.
+
+    New questions that near-duplicate one already in index (built from
+    existing when not given) are discarded.
+    """
+    questions = list(existing)
+    index = index_bank({tech: questions}) if index is None else index
+    stale_rounds = 0
+
+    while len(questions) < per_tech and stale_rounds < max_rounds:
+        batch = generate_bank_questions(tech, batch_size, timeout)
+        fresh = drop_near_duplicates(batch, index, normalize_tech(tech), tech)
+        questions.extend(fresh)
+        stale_rounds = 0 if fresh else stale_rounds + 1
+
+    return questions[:max(per_tech, len(existing))]
+
+
+def build_bank(techs, bank, per_tech=50, batch_size=10, workers=4, max_rounds=3, timeout=60, log=print):
+    """Top up every technology in the bank dict to per_tech questions."""
+    by_key = {normalize_tech(tech): tech for tech in bank}
+    todo = []
+    for tech in techs:
+        name = by_key.get(normalize_tech(tech), tech)
+        if len(bank.get(name, [])) < per_tech:
+            todo.append(name)
+
+    index = index_bank(bank)
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        futures = {
+            executor.submit(top_up_tech, tech, bank.get(tech, []), per_tech, batch_size, max_rounds, timeout,
+                            index): tech
+            for tech in todo
+        }
+        for done, future in enumerate(as_completed(futures), 1):
+            tech = futures[future]
+            try:
+                bank[tech] = future.result()
+                log(f"[{done}/{len(todo)}] {tech}: {len(bank[tech])} questions")
+            except Exception as e:
+                log(f"[{done}/{len(todo)}] {tech}: failed ({str(e)})")
+
+    return bank
+
+
+def read_techs(args):
+    """Collect technology names from --techs and --techs-file."""
+    techs = []
+    if args.techs:
+        techs.extend(t.strip() for t in args.techs.split(','))
+    if args.techs_file:
+        with open(args.techs_file, encoding='utf-8') as f:
+            techs.extend(line.strip() for line in f)
+    return list(dict.fromkeys(t for t in techs if t))
+
+
+def cmd_build(args):
+    if not os.getenv('OPENAI_API_KEY'):
+        sys.exit("OPENAI_API_KEY is required to build the question bank.")
+
+    existing = load_bank(args.bank)
+    bank = existing.to_dict() if existing else {}
+    if existing:
+        existing.close()
+
+    techs = read_techs(args) or list(bank)
+    if not techs:
+        sys.exit("No technologies given; use --techs or --techs-file.")
+
+    build_bank(techs, bank, args.per_tech, args.batch_size, args.workers, args.max_rounds, args.timeout)
+    write_bank(args.bank, bank)
+    print(f"Wrote {sum(len(q) for q in bank.values())} questions for {len(bank)} technologies to {args.bank}")
+
+
+def cmd_import(args):
+    existing = load_bank(args.bank)
+    bank = existing.to_dict() if existing else {}
+    if existing:
+        existing.close()
+    by_key = {normalize_tech(tech): tech for tech in bank}
+    index = index_bank(bank)
+
+    added = 0
+    with open(args.source, encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            incoming = record.get('questions') or [record.get('question')]
+            tech = by_key.setdefault(normalize_tech(record['tech']), record['tech'])
+            current = bank.setdefault(tech, [])
+            fresh = drop_near_duplicates(incoming, index, normalize_tech(tech), tech)
+            current.extend(fresh)
+            added += len(fresh)
+
+    write_bank(args.bank, bank)
+    print(f"Imported {added} new questions; bank now covers {len(bank)} technologies")
+
+
+def cmd_stats(args):
+    bank = load_bank(args.bank)
+    if bank is None:
+        sys.exit(f"No question bank at {args.bank}")
+    print(f"{args.bank}: {len(bank)} technologies, {bank.total} questions, "
+          f"{os.path.getsize(args.bank)} bytes")
+    for tech in sorted(bank.techs(), key=str.lower):
+        print(f"  {tech}: {bank.count(tech)}")
+
+
+def cmd_sample(args):
+    bank = load_bank(args.bank)
+    if bank is None:
+        sys.exit(f"No question bank at {args.bank}")
+    for question in bank.sample(args.tech, args.count):
+        print(f"- {question}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build and inspect the TalentScout question bank.")
+    parser.add_argument('--bank', default=DEFAULT_BANK_PATH, help="path to the bank file")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    build = commands.add_parser('build', help="generate questions with the LLM and merge them into the bank")
+    build.add_argument('--techs', help="comma-separated technologies")
+    build.add_argument('--techs-file', help="file with one technology per line")
+    build.add_argument('--per-tech', type=int, default=50, help="target questions per technology")
+    build.add_argument('--batch-size', type=int, default=10, help="questions requested per LLM call")
+    build.add_argument('--workers', type=int, default=4, help="concurrent LLM requests")
+    build.add_argument('--max-rounds', type=int, default=3, help="give up after this many calls with no new questions")
+    build.add_argument('--timeout', type=float, default=60, help="per-request timeout in seconds")
+    build.set_defaults(func=cmd_build)
+
+    import_ = commands.add_parser('import', help="merge questions from a JSONL file of {tech, question(s)}")
+    import_.add_argument('source')
+    import_.set_defaults(func=cmd_import)
+
+    stats = commands.add_parser('stats', help="show per-technology question counts")
+    stats.set_defaults(func=cmd_stats)
+
+    sample = commands.add_parser('sample', help="print random questions for a technology")
+    sample.add_argument('tech')
+    sample.add_argument('--count', type=int, default=3)
+    sample.set_defaults(func=cmd_sample)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+TalentScout - Question Cache
+SQLite-backed cache for generated questions, shared across sessions and processes.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS questions (
+    cache_key TEXT PRIMARY KEY,
+    tech TEXT NOT NULL,
+    questions TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_questions_last_used ON questions (last_used);
+CREATE TABLE IF NOT EXISTS stats (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+STAT_NAMES = ('hits', 'misses', 'expired', 'evictions')
+
+
+def normalize_tech(tech):
+    """Normalize a technology name for use in a cache key."""
+    return ' '.join(tech.lower().split())
+
+
+def make_cache_key(tech, model, temperature, prompt_version):
+    """Build the cache key for a technology and generation settings."""
+    return f"{normalize_tech(tech)}|{model}|{float(temperature):.2f}|{prompt_version}"
+
+
+class QuestionCache:
+    """Persistent LRU cache with TTL expiry and hit/miss counters."""
+
+    def __init__(self, path, max_entries=5000, ttl_seconds=7 * 24 * 3600):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._local = threading.local()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        conn = self._connect()
+        with conn:
+            conn.executescript(SCHEMA)
+            conn.executemany(
+                "INSERT OR IGNORE INTO stats (name, value) VALUES (?, 0)",
+                [(name,) for name in STAT_NAMES]
+            )
+
+    def _connect(self):
+        """Return the connection for the current thread, opening it if needed."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _bump(self, conn, name, amount=1):
+        conn.execute("UPDATE stats SET value = value + ? WHERE name = ?", (amount, name))
+
+    def get(self, tech, model, temperature, prompt_version):
+        """Return cached questions for a technology, or None on a miss."""
+        key = make_cache_key(tech, model, temperature, prompt_version)
+        now = time.time()
+        conn = self._connect()
+
+        with conn:
+            row = conn.execute(
+                "SELECT questions, created_at FROM questions WHERE cache_key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                self._bump(conn, 'misses')
+                return None
+
+            questions, created_at = row
+            if self.ttl_seconds and now - created_at > self.ttl_seconds:
+                conn.execute("DELETE FROM questions WHERE cache_key = ?", (key,))
+                self._bump(conn, 'expired')
+                self._bump(conn, 'misses')
+                return None
+
+            conn.execute("UPDATE questions SET last_used = ? WHERE cache_key = ?", (now, key))
+            self._bump(conn, 'hits')
+
+        return json.loads(questions)
+
+    def set(self, tech, model, temperature, prompt_version, questions):
+        """Store questions for a technology, evicting least recently used entries."""
+        key = make_cache_key(tech, model, temperature, prompt_version)
+        now = time.time()
+        conn = self._connect()
+
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO questions (cache_key, tech, questions, created_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, normalize_tech(tech), json.dumps(questions), now, now)
+            )
+
+            if self.max_entries:
+                overflow = conn.execute("SELECT COUNT(*) FROM questions").fetchone()[0] - self.max_entries
+                if overflow > 0:
+                    conn.execute(
+                        "DELETE FROM questions WHERE cache_key IN "
+                        "(SELECT cache_key FROM questions ORDER BY last_used LIMIT ?)",
+                        (overflow,)
+                    )
+                    self._bump(conn, 'evictions', overflow)
+
+    def clear(self):
+        """Remove every cached entry and reset the counters."""
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM questions")
+            conn.execute("UPDATE stats SET value = 0")
+
+    def stats(self):
+        """Return hit/miss counters and the current entry count."""
+        conn = self._connect()
+        stats = dict(conn.execute("SELECT name, value FROM stats").fetchall())
+        stats['entries'] = conn.execute("SELECT COUNT(*) FROM questions").fetchone()[0]
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
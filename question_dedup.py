@@ -0,0 +1,183 @@
+"""
+TalentScout - Question Deduplication
+MinHash/LSH index that spots near-duplicate questions, such as the same
+question reworded by another sample of the model.
+"""
+
+import bisect
+import os
+import random
+import re
+import threading
+import zlib
+from array import array
+from itertools import chain
+
+# Deduplication settings (QUESTION_DEDUP=0 disables it)
+QUESTION_DEDUP = os.getenv('QUESTION_DEDUP', '1') == '1'
+QUESTION_DEDUP_THRESHOLD = float(os.getenv('QUESTION_DEDUP_THRESHOLD', '0.6'))
+
+# Signatures are BANDS x ROWS 16-bit minimums; each band packs into one 64-bit key
+BANDS = 10
+ROWS = 4
+NUM_PERM = BANDS * ROWS
+# Questions added since the last merge stay in dicts until there are MERGE_SIZE
+# of them and they make up MERGE_FRACTION of the index
+MERGE_SIZE = 1024
+MERGE_FRACTION = 8
+
+_PRIME = (1 << 31) - 1
+_rng = random.Random(1729)
+_PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(_PRIME)) for _ in range(NUM_PERM)]
+
+_WORD = re.compile(r'[a-z0-9+#]+')
+
+# Words that say how a question is asked rather than what it is about
+STOPWORDS = frozenset("""
+a about an and any are as at be between by can compare could define describe did difference
+differences do does example explain for from give how in into is it its me of on one or some tell
+that the their them this to use used using what when where which who why will with work works
+would you your
+""".split())
+
+
+def stem(word):
+    """Strip a plural ending so 'decorators' and 'decorator' match."""
+    if word.endswith('ies') and len(word) > 4:
+        return word[:-3] + 'y'
+    if word.endswith('s') and not word.endswith('ss') and len(word) > 3:
+        return word[:-1]
+    return word
+
+
+def shingles(question, context=''):
+    """Return the set of stemmed topic words in a question, minus the words of context."""
+    ignored = STOPWORDS.union(_WORD.findall(context.lower())) if context else STOPWORDS
+    return {stem(word) for word in _WORD.findall(question.lower()) if len(word) > 1 and word not in ignored}
+
+
+def signature(question, context=''):
+    """Return the MinHash signature of a question as NUM_PERM 16-bit values."""
+    hashes = [zlib.crc32(word.encode('utf-8')) for word in shingles(question, context)] or [0]
+    return array('H', (min((a * h + b) % _PRIME for h in hashes) & 0xFFFF for a, b in _PERMUTATIONS))
+
+
+def scope_hash(scope):
+    return zlib.crc32(' '.join(scope.lower().split()).encode('utf-8')) if scope else 0
+
+
+class NearDuplicateIndex:
+    """Near-duplicate lookup over question text in sublinear time.
+
+    Each question's MinHash signature is split into BANDS bands, and questions
+    sharing a band become candidates that are compared signature to
+    signature. Bands are kept as sorted arrays searched by bisection, with
+    recent insertions in dicts that are merged in as they grow, so the index
+    stays compact at hundreds of thousands of questions. Questions only
+    match others in the same scope; only signatures are stored, not the text.
+
+    The words of context, usually the technology a question is about, are
+    ignored: every question on a technology shares them, so they would make
+    short questions look alike.
+    """
+
+    def __init__(self, threshold=QUESTION_DEDUP_THRESHOLD):
+        self.threshold = threshold
+        self._signatures = array('H')
+        self._scopes = array('I')
+        self._keys = [array('Q') for _ in range(BANDS)]
+        self._ids = [array('I') for _ in range(BANDS)]
+        self._recent = [{} for _ in range(BANDS)]
+        self._recent_count = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._scopes)
+
+    def _band_keys(self, sig, scope):
+        return [int.from_bytes(sig[band * ROWS:(band + 1) * ROWS].tobytes(), 'little') ^ scope
+                for band in range(BANDS)]
+
+    def _candidates(self, keys):
+        found = set()
+        for band, key in enumerate(keys):
+            sorted_keys = self._keys[band]
+            i = bisect.bisect_left(sorted_keys, key)
+            while i < len(sorted_keys) and sorted_keys[i] == key:
+                found.add(self._ids[band][i])
+                i += 1
+            recent = self._recent[band].get(key)
+            if isinstance(recent, list):
+                found.update(recent)
+            elif recent is not None:
+                found.add(recent)
+        return found
+
+    def _similarity(self, sig, question_id):
+        start = question_id * NUM_PERM
+        stored = self._signatures[start:start + NUM_PERM]
+        return sum(a == b for a, b in zip(sig, stored)) / NUM_PERM
+
+    def _find(self, sig, scope, keys):
+        for question_id in self._candidates(keys):
+            if self._scopes[question_id] == scope and self._similarity(sig, question_id) >= self.threshold:
+                return True
+        return False
+
+    def _insert(self, sig, scope, keys):
+        question_id = len(self._scopes)
+        self._signatures.extend(sig)
+        self._scopes.append(scope)
+        for band, key in enumerate(keys):
+            # A bucket holds a bare id until a second question lands in it
+            recent = self._recent[band]
+            bucket = recent.get(key)
+            if bucket is None:
+                recent[key] = question_id
+            elif isinstance(bucket, list):
+                bucket.append(question_id)
+            else:
+                recent[key] = [bucket, question_id]
+        self._recent_count += 1
+        if self._recent_count >= max(MERGE_SIZE, len(self._scopes) // MERGE_FRACTION):
+            self._merge()
+
+    def _merge(self):
+        for band in range(BANDS):
+            recent = ((key, question_id) for key, bucket in self._recent[band].items()
+                      for question_id in (bucket if isinstance(bucket, list) else (bucket,)))
+            entries = sorted(chain(zip(self._keys[band], self._ids[band]), recent))
+            self._keys[band] = array('Q', (key for key, _ in entries))
+            self._ids[band] = array('I', (question_id for _, question_id in entries))
+            self._recent[band] = {}
+        self._recent_count = 0
+
+    def contains(self, question, scope='', context=''):
+        """True if a near-duplicate of question is stored in this scope."""
+        sig, scope = signature(question, context), scope_hash(scope)
+        with self._lock:
+            return self._find(sig, scope, self._band_keys(sig, scope))
+
+    def add(self, question, scope='', context=''):
+        """Store question unless a near-duplicate is already stored; return True if it was added."""
+        sig, scope = signature(question, context), scope_hash(scope)
+        keys = self._band_keys(sig, scope)
+        with self._lock:
+            if self._find(sig, scope, keys):
+                return False
+            self._insert(sig, scope, keys)
+            return True
+
+
+def drop_near_duplicates(questions, index=None, scope='', context=''):
+    """Keep the questions that near-duplicate neither each other nor anything in index.
+
+    Blank and non-string entries are dropped too. Kept questions are added to
+    index, so it can be carried across calls.
+    """
+    index = NearDuplicateIndex() if index is None else index
+    unique = []
+    for question in questions:
+        if isinstance(question, str) and question.strip() and index.add(question, scope, context):
+            unique.append(question.strip())
+    return unique
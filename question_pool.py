@@ -0,0 +1,150 @@
+"""
+TalentScout - Question Pool
+Thread-safe question pool that background generation fills as results arrive.
+"""
+
+import threading
+
+from metrics import metrics
+
+
+class QuestionPool(dict):
+    """A {tech: [questions]} dict that is filled in while it is being read.
+    
+    A pool is complete once every source feeding it has finished. Its own
+    generation thread is one source; each pool forwarding prefetched
+    technologies into it adds another.
+    """
+
+    def __init__(self, tech_stack):
+        super().__init__()
+        self.tech_stack = list(tech_stack)
+        self.errors = []
+        self._reported = 0
+        self._sources = 1
+        self._forwards = []
+        self._condition = threading.Condition()
+
+    def add(self, tech, questions):
+        """Store the questions for a technology and wake up any waiters."""
+        with self._condition:
+            self[tech] = questions
+            for forward in list(self._forwards):
+                waiting, target = forward
+                if tech in waiting:
+                    target.add(tech, questions)
+                    waiting.discard(tech)
+                    if not waiting:
+                        self._forwards.remove(forward)
+                        target.finish()
+            self._condition.notify_all()
+
+    def add_error(self, message):
+        """Record a generation error to surface on the script thread."""
+        with self._condition:
+            self.errors.append(message)
+        metrics.inc('question_generation_errors_total')
+
+    def take_errors(self):
+        """Return the errors recorded since the last call."""
+        with self._condition:
+            errors = self.errors[self._reported:]
+            self._reported = len(self.errors)
+            return errors
+
+    def add_source(self):
+        """Register another producer that must finish before the pool is complete."""
+        with self._condition:
+            self._sources += 1
+
+    def finish(self):
+        """Mark one source as done; the pool completes when all sources are."""
+        with self._condition:
+            self._sources -= 1
+            if self._sources <= 0:
+                for _, target in self._forwards:
+                    target.finish()
+                self._forwards = []
+            self._condition.notify_all()
+
+    def forward(self, techs, target):
+        """Deliver these technologies to another pool, now or as they arrive.
+        
+        Returns the technologies this pool will supply; the caller must
+        generate the rest itself.
+        """
+        with self._condition:
+            supplied = set()
+            waiting = set()
+            for tech in techs:
+                if tech in self:
+                    target.add(tech, self[tech])
+                    supplied.add(tech)
+                elif tech in self.tech_stack and self._sources > 0:
+                    waiting.add(tech)
+                    supplied.add(tech)
+            if waiting:
+                target.add_source()
+                self._forwards.append((waiting, target))
+            return supplied
+
+    @property
+    def is_complete(self):
+        return self._sources <= 0 or all(tech in self for tech in self.tech_stack)
+
+    def wait(self, arrived, timeout=None):
+        """Block until more than `arrived` technologies are present or generation ends."""
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: len(self) > arrived or self.is_complete, timeout
+            )
+
+
+class PrefetchStats:
+    """Process-wide counters for speculative question prefetching.
+
+    Every prefetched technology is also counted in the
+    question_prefetch_total metric as a hit or as wasted, and every
+    technology the prefetch missed as a miss.
+    """
+
+    def __init__(self):
+        self.prefetched = 0
+        self.hits = 0
+        self.misses = 0
+        self.wasted = 0
+        self._lock = threading.Lock()
+
+    def record(self, predicted, final):
+        """Compare the prefetched technologies with the candidate's final stack."""
+        predicted = set(predicted)
+        final = set(final)
+        self._add(len(predicted), len(predicted & final), len(final - predicted), len(predicted - final))
+
+    def discard(self, predicted):
+        """Count a prefetch the session never used (it ended or was evicted first) as wasted."""
+        predicted = set(predicted)
+        self._add(len(predicted), 0, 0, len(predicted))
+
+    def _add(self, prefetched, hits, misses, wasted):
+        with self._lock:
+            self.prefetched += prefetched
+            self.hits += hits
+            self.misses += misses
+            self.wasted += wasted
+        for outcome, count in (('hit', hits), ('miss', misses), ('wasted', wasted)):
+            if count:
+                metrics.inc('question_prefetch_total', count, outcome=outcome)
+
+    def snapshot(self):
+        """Return the counters with derived hit and waste rates."""
+        with self._lock:
+            needed = self.hits + self.misses
+            return {
+                'prefetched': self.prefetched,
+                'hits': self.hits,
+                'misses': self.misses,
+                'wasted': self.wasted,
+                'hit_rate': self.hits / needed if needed else 0.0,
+                'waste_rate': self.wasted / self.prefetched if self.prefetched else 0.0,
+            }
@@ -0,0 +1,125 @@
+"""
+TalentScout - Question Scheduler
+Per-session queue deciding which generated question to ask next.
+"""
+
+import os
+from collections import deque
+
+# Question ordering: round_robin | sequential | experience
+QUESTION_ORDER = os.getenv('QUESTION_ORDER', 'round_robin')
+
+
+def asked_questions(question_ids, questions):
+    """Return (question id, tech, text) for each asked id that resolves in questions."""
+    asked = []
+    for question_id in question_ids:
+        tech, _, index = question_id.rpartition('_')
+        try:
+            asked.append((question_id, tech, questions[tech][int(index)]))
+        except (KeyError, IndexError, ValueError):
+            continue
+    return asked
+
+
+def order_sequential(pending, experience):
+    """Every question of the first technology, then the next technology."""
+    return [(tech, index) for tech, indices in pending.items() for index in indices]
+
+
+def order_round_robin(pending, experience):
+    """One question per technology in turn."""
+    queues = [(tech, deque(indices)) for tech, indices in pending.items() if indices]
+    order = []
+    while queues:
+        for tech, indices in queues:
+            order.append((tech, indices.popleft()))
+        queues = [(tech, indices) for tech, indices in queues if indices]
+    return order
+
+
+def order_experience_weighted(pending, experience):
+    """Round robin weighted towards the first-listed technologies as experience grows.
+
+    Juniors get an even spread. Seniors get more questions on the technologies
+    they listed first, interleaved by smooth weighted round robin.
+    """
+    seniority = 1 + min(int(experience or 0), 12) // 4
+    weights = {tech: max(1, seniority - position) for position, tech in enumerate(pending)}
+    queues = {tech: deque(indices) for tech, indices in pending.items() if indices}
+    current = dict.fromkeys(queues, 0)
+    order = []
+    while queues:
+        total = sum(weights[tech] for tech in queues)
+        for tech in queues:
+            current[tech] += weights[tech]
+        best = max(queues, key=current.__getitem__)
+        current[best] -= total
+        order.append((best, queues[best].popleft()))
+        if not queues[best]:
+            del queues[best]
+    return order
+
+
+ORDERINGS = {
+    'sequential': order_sequential,
+    'round_robin': order_round_robin,
+    'experience': order_experience_weighted,
+}
+
+
+class QuestionScheduler:
+    """Queue of (tech, question index) pairs popped in O(1) per question.
+
+    The queue is rebuilt only when new technologies arrive in the question
+    pool, so background generation can keep adding to it between questions.
+    Questions whose ids are in `asked` (e.g. a session restored from the
+    session store) are never scheduled again.
+    """
+
+    __slots__ = ('tech_stack', 'ordering', 'experience', '_asked', '_queue', '_arrived', '_seen')
+
+    def __init__(self, tech_stack, ordering=None, experience=0, asked=()):
+        self.tech_stack = list(tech_stack)
+        self.ordering = ORDERINGS.get(ordering or QUESTION_ORDER, order_round_robin)
+        self.experience = experience
+        self._asked = set(asked)
+        self._queue = deque()
+        self._arrived = set()
+        self._seen = 0
+
+    def _sync(self, questions):
+        """Fold technologies that arrived since the last call into the queue."""
+        if len(questions) == self._seen:
+            return
+        self._seen = len(questions)
+
+        pending = {tech: [] for tech in self.tech_stack}
+        for tech, index in self._queue:
+            pending[tech].append(index)
+        for tech in self.tech_stack:
+            if tech in questions and tech not in self._arrived:
+                self._arrived.add(tech)
+                pending[tech] = [i for i in range(len(questions[tech]))
+                                 if f"{tech}_{i}" not in self._asked]
+        self._queue = deque(self.ordering({t: i for t, i in pending.items() if i}, self.experience))
+
+    def next(self, questions):
+        """Return (question, tech, question id) for the next question, or (None, None, None).
+
+        If the pool is still being filled and everything that arrived was
+        asked, wait for the next technology to land.
+        """
+        while True:
+            arrived = len(questions)
+            self._sync(questions)
+            if self._queue:
+                tech, index = self._queue.popleft()
+                return questions[tech][index], tech, f"{tech}_{index}"
+            if getattr(questions, 'is_complete', True):
+                return None, None, None
+            questions.wait(arrived)
+
+    def remaining(self):
+        """Number of questions scheduled but not yet asked."""
+        return len(self._queue)
@@ -0,0 +1,540 @@
+"""
+TalentScout - Question Generation
+Technical question generation via the OpenAI API, with caching and fallbacks.
+"""
+
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from json_stream import JSONStreamParser
+from llm_client import LLMUnavailable, get_llm_client
+from metrics import metrics
+from question_bank import load_bank
+from question_cache import QuestionCache
+from question_dedup import QUESTION_DEDUP, NearDuplicateIndex, drop_near_duplicates
+from question_pool import QuestionPool
+
+# Question generation settings
+QUESTION_GEN_MODE = os.getenv('QUESTION_GEN_MODE', 'concurrent')
+QUESTION_GEN_CONCURRENCY = int(os.getenv('QUESTION_GEN_CONCURRENCY', '4'))
+QUESTION_GEN_TIMEOUT = float(os.getenv('QUESTION_GEN_TIMEOUT', '20'))
+QUESTION_GEN_BATCH_MAX_TOKENS = int(os.getenv('QUESTION_GEN_BATCH_MAX_TOKENS', '1500'))
+# Stream batched requests so each technology is served as soon as its questions are parsed
+QUESTION_GEN_STREAM = os.getenv('QUESTION_GEN_STREAM', '1') == '1'
+QUESTION_PREFETCH_MAX_TECHS = int(os.getenv('QUESTION_PREFETCH_MAX_TECHS', '4'))
+QUESTION_MODEL = "gpt-3.5-turbo"
+QUESTION_TEMPERATURE = 0.7
+
+# Rough completion budget for three questions, used to size batched requests
+TOKENS_PER_TECH_ESTIMATE = 200
+
+# Bump whenever the question prompt changes so stale cache entries are ignored
+PROMPT_VERSION = '2'
+
+# Keywords in the desired position that hint at the candidate's tech stack
+POSITION_TECH_HINTS = {
+    'python': ['Python'], 'django': ['Django', 'Python'], 'flask': ['Flask', 'Python'],
+    'java': ['Java', 'Spring Boot'], 'spring': ['Spring Boot', 'Java'],
+    'javascript': ['JavaScript'], 'typescript': ['TypeScript'],
+    'react': ['React', 'JavaScript'], 'angular': ['Angular', 'TypeScript'],
+    'vue': ['Vue.js', 'JavaScript'], 'node': ['Node.js', 'JavaScript'],
+    'frontend': ['JavaScript', 'React'], 'front-end': ['JavaScript', 'React'],
+    'backend': ['Python', 'Node.js', 'MySQL'], 'back-end': ['Python', 'Node.js', 'MySQL'],
+    'full stack': ['JavaScript', 'React', 'Node.js'], 'fullstack': ['JavaScript', 'React', 'Node.js'],
+    'devops': ['Docker', 'Kubernetes', 'AWS'], 'sre': ['Kubernetes', 'Docker'],
+    'cloud': ['AWS', 'Docker'], 'data': ['Python', 'MySQL'],
+    'machine learning': ['Python'], 'ml': ['Python'],
+    'database': ['MySQL', 'PostgreSQL'], 'dba': ['MySQL', 'PostgreSQL'],
+}
+
+# Question bank settings (see question_bank.py for building the bank)
+QUESTION_BANK_PATH = os.getenv('QUESTION_BANK_PATH', 'data/questions.bank')
+QUESTION_BANK_FIRST = os.getenv('QUESTION_BANK_FIRST', '1') == '1'
+QUESTIONS_PER_TECH = 3
+
+# Serve technologies with curated template questions without calling the LLM
+QUESTION_TEMPLATES_FIRST = os.getenv('QUESTION_TEMPLATES_FIRST', '0') == '1'
+
+# Question cache settings (set QUESTION_CACHE_PATH to an empty string to disable)
+QUESTION_CACHE_PATH = os.getenv('QUESTION_CACHE_PATH', '.cache/questions.sqlite3')
+QUESTION_CACHE_MAX_ENTRIES = int(os.getenv('QUESTION_CACHE_MAX_ENTRIES', '5000'))
+QUESTION_CACHE_TTL = int(os.getenv('QUESTION_CACHE_TTL', str(7 * 24 * 3600)))
+
+
+# Curated questions for common technologies, used when the LLM is unavailable
+FALLBACK_QUESTIONS = {
+    'Python': [
+        "Explain the difference between list and tuple in Python.",
+        "What are Python decorators and how would you create one?",
+        "Describe the concept of Python's Global Interpreter Lock (GIL).",
+    ],
+    'Django': [
+        "Explain the Django ORM and how model queries work.",
+        "What is Django middleware and how do you create custom middleware?",
+        "Describe Django's authentication system.",
+    ],
+    'React': [
+        "Explain the difference between useState and useEffect hooks.",
+        "What is the Virtual DOM and how does React use it?",
+        "Describe React's component lifecycle methods.",
+    ],
+    'JavaScript': [
+        "Explain closures in JavaScript with an example.",
+        "What is the difference between == and ===?",
+        "Describe the event loop in JavaScript.",
+    ],
+    'Java': [
+        "Explain the difference between abstract class and interface.",
+        "What is the purpose of the 'final' keyword in Java?",
+        "Describe the Java garbage collection mechanism.",
+    ],
+    'Spring Boot': [
+        "What is dependency injection in Spring?",
+        "Explain the difference between @Component, @Service, and @Repository.",
+        "How does Spring Boot auto-configuration work?",
+    ],
+    'MySQL': [
+        "Explain the difference between INNER JOIN and LEFT JOIN.",
+        "What are database indexes and how do they improve performance?",
+        "Describe the concept of database normalization.",
+    ],
+    'MongoDB': [
+        "Explain the difference between SQL and NoSQL databases.",
+        "What are MongoDB aggregation pipelines?",
+        "Describe MongoDB's document structure.",
+    ],
+    'Node.js': [
+        "Explain the event-driven architecture of Node.js.",
+        "What is the purpose of package.json in a Node.js project?",
+        "Describe asynchronous programming in Node.js.",
+    ],
+}
+
+
+_question_cache = None
+_question_cache_lock = threading.Lock()
+
+
+def get_question_cache():
+    """Return the process-wide question cache, or None when caching is disabled."""
+    global _question_cache
+    if not QUESTION_CACHE_PATH:
+        return None
+    with _question_cache_lock:
+        if _question_cache is None:
+            _question_cache = QuestionCache(
+                QUESTION_CACHE_PATH,
+                max_entries=QUESTION_CACHE_MAX_ENTRIES,
+                ttl_seconds=QUESTION_CACHE_TTL
+            )
+    return _question_cache
+
+
+_question_bank = None
+_question_bank_loaded = False
+
+
+def get_question_bank():
+    """Return the process-wide question bank, or None if none has been built."""
+    global _question_bank, _question_bank_loaded
+    with _question_cache_lock:
+        if not _question_bank_loaded:
+            _question_bank = load_bank(QUESTION_BANK_PATH)
+            _question_bank_loaded = True
+    return _question_bank
+
+
+def sample_bank_questions(tech, count=QUESTIONS_PER_TECH):
+    """Return questions sampled from the bank, or None if it does not cover the tech."""
+    bank = get_question_bank()
+    if bank is None or bank.count(tech) < count:
+        return None
+    return bank.sample(tech, count)
+
+
+def record_fallback(reason, count=1):
+    """Count technologies served from fallback templates instead of the LLM."""
+    metrics.inc('questions_served_total', count, source='fallback')
+    metrics.inc('question_fallbacks_total', count, reason=reason)
+
+
+def fallback_reason(error):
+    """Label a generation failure for the fallback counter."""
+    return 'unavailable' if isinstance(error, LLMUnavailable) else 'error'
+
+
+def read_stream(response, on_text):
+    """Pass each piece of streamed text to on_text; return (content, usage)."""
+    parts = []
+    usage = None
+    try:
+        for chunk in response:
+            usage = getattr(chunk, 'usage', None) or usage
+            if not chunk.choices:
+                continue
+            text = chunk.choices[0].delta.content
+            if text:
+                parts.append(text)
+                on_text(text)
+    finally:
+        response.close()
+    return ''.join(parts), usage
+
+
+def request_completion(kind, prompt, max_tokens, timeout=None, system=None, hedge=False, on_text=None):
+    """Send a prompt (question generation unless another system prompt is given) and return the response text.
+    
+    Records request latency, token usage and errors under the given kind.
+    With hedge=True a slow request is duplicated (see LLMClient.create_hedged).
+    With on_text the response is streamed and each piece of text is passed to
+    on_text as it arrives.
+    """
+    started = time.perf_counter()
+    client = get_llm_client()
+    try:
+        response = (client.create_hedged if hedge else client.create)(
+            messages=[
+                {"role": "system", "content": system or "You are a technical interview question generator. Respond with valid JSON."},
+                {"role": "user", "content": prompt}
+            ],
+            model=QUESTION_MODEL,
+            temperature=QUESTION_TEMPERATURE,
+            max_tokens=max_tokens,
+            timeout=timeout,
+            kind=kind,
+            json_mode=True,
+            stream=on_text is not None
+        )
+        if on_text is not None:
+            content, usage = read_stream(response, on_text)
+        else:
+            content, usage = response.choices[0].message.content, getattr(response, 'usage', None)
+    except Exception as e:
+        metrics.inc('llm_errors_total', kind=kind, error=type(e).__name__)
+        raise
+    finally:
+        metrics.observe('llm_request_seconds', time.perf_counter() - started, kind=kind)
+        metrics.inc('llm_requests_total', kind=kind)
+    
+    if usage is not None:
+        metrics.inc('llm_tokens_total', usage.prompt_tokens or 0, kind=kind, type='prompt')
+        metrics.inc('llm_tokens_total', usage.completion_tokens or 0, kind=kind, type='completion')
+    return content
+
+
+def parse_streamed(kind, container, prompt, max_tokens, timeout=None, on_item=None, stream=False):
+    """Request JSON and return the tolerant parser after every complete element was read.
+    
+    With stream=True each element is passed to on_item as soon as it has
+    streamed in; otherwise the whole response is parsed when it arrives.
+    """
+    parser = JSONStreamParser(container)
+    on_item = on_item or (lambda item: None)
+    
+    def on_text(text):
+        for item in parser.feed(text):
+            on_item(item)
+    
+    if stream:
+        request_completion(kind, prompt, max_tokens, timeout, hedge=True, on_text=on_text)
+    else:
+        on_text(request_completion(kind, prompt, max_tokens, timeout, hedge=True))
+    for item in parser.close():
+        on_item(item)
+    
+    if not parser.items:
+        metrics.inc('llm_json_parse_failures_total', kind=kind)
+    elif parser.recovered:
+        metrics.inc('llm_json_recovered_total', kind=kind)
+    return parser
+
+
+def valid_questions(value):
+    """Keep the non-empty string questions from a parsed value."""
+    if not isinstance(value, list):
+        return []
+    return [q.strip() for q in value if isinstance(q, str) and q.strip()]
+
+
+def unique_questions(tech_questions, context, index=None, source='llm'):
+    """Drop near-duplicate questions, within the list and against index, when deduplication is on.
+
+    context holds the technology names whose words are ignored when comparing.
+    """
+    if not QUESTION_DEDUP:
+        return tech_questions
+    unique = drop_near_duplicates(tech_questions, index, context=context)
+    if len(unique) < len(tech_questions):
+        metrics.inc('questions_deduplicated_total', len(tech_questions) - len(unique), source=source)
+    return unique
+
+
+def generate_questions_for_tech(tech, timeout=None, cache=None):
+    """Generate technical questions for a single technology."""
+    prompt = f"""Generate 3 intermediate-level technical interview questions for {tech}.
+Format as a JSON object: {{"questions": ["Q1", "Q2", "Q3"]}}"""
+
+    parser = parse_streamed('tech', '[', prompt, 500, timeout)
+    tech_questions = unique_questions(valid_questions(parser.items), tech)
+    if not tech_questions:
+        record_fallback('invalid_json')
+        return generate_fallback_for_tech(tech)
+    
+    metrics.inc('questions_served_total', source='llm')
+    if cache is not None and len(tech_questions) >= QUESTIONS_PER_TECH:
+        cache.set(tech, QUESTION_MODEL, QUESTION_TEMPERATURE, PROMPT_VERSION, tech_questions)
+    return tech_questions
+
+
+def chunk_tech_stack(tech_stack, max_tokens=None):
+    """Split a tech stack into chunks whose combined answer fits in max_tokens."""
+    max_tokens = max_tokens or QUESTION_GEN_BATCH_MAX_TOKENS
+    chunk_size = max(1, max_tokens // TOKENS_PER_TECH_ESTIMATE)
+    return [tech_stack[i:i + chunk_size] for i in range(0, len(tech_stack), chunk_size)]
+
+
+def generate_questions_for_batch(techs, timeout=None, cache=None, on_tech=None):
+    """Generate technical questions for several technologies in one request.
+    
+    on_tech(tech, questions) is called for each technology as soon as its
+    questions have streamed in.
+    """
+    tech_list = '\n'.join(f"- {tech}" for tech in techs)
+    prompt = f"""Generate 3 intermediate-level technical interview questions for each of these technologies:
+{tech_list}
+Format as a JSON object mapping each technology name exactly as written above to its questions:
+{{"Technology": ["Q1", "Q2", "Q3"]}}"""
+
+    by_name = {tech.lower(): tech for tech in techs}
+    questions = {}
+    
+    def accept(member):
+        name, value = member
+        tech = by_name.get(str(name).strip().lower())
+        if tech is None or tech in questions:
+            return
+        tech_questions = unique_questions(valid_questions(value), tech)
+        if not tech_questions:
+            return
+        questions[tech] = tech_questions
+        metrics.inc('questions_served_total', source='llm')
+        if cache is not None and len(tech_questions) >= QUESTIONS_PER_TECH:
+            cache.set(tech, QUESTION_MODEL, QUESTION_TEMPERATURE, PROMPT_VERSION, tech_questions)
+        if on_tech is not None:
+            on_tech(tech, tech_questions)
+    
+    parse_streamed('batch', '{', prompt, QUESTION_GEN_BATCH_MAX_TOKENS, timeout, on_item=accept,
+                   stream=QUESTION_GEN_STREAM)
+    
+    for tech in techs:
+        if tech not in questions:
+            record_fallback('missing_from_batch')
+            questions[tech] = generate_fallback_for_tech(tech)
+    return {tech: questions[tech] for tech in techs}
+
+
+def generate_questions_with_llm(tech_stack, mode=None, max_workers=None, timeout=None,
+                                on_result=None, on_error=None):
+    """Generate technical questions using OpenAI API.
+    
+    In 'concurrent' mode the per-technology requests run in a bounded thread
+    pool and each failed technology falls back on its own. 'batched' mode asks
+    for the whole stack in one request, split into chunks that fit the token
+    budget. 'sequential' mode keeps the original one-request-at-a-time
+    behaviour. Technologies covered by the offline question bank or found in
+    the shared question cache are served without a network call, so the LLM
+    only tops up what the bank is missing. Questions that near-duplicate one
+    already served for another technology are dropped.
+    
+    on_result(tech, questions) is called as soon as each technology resolves
+    and on_error(message) reports generation errors (ignored when not given).
+    """
+    if not tech_stack:
+        return {}
+    
+    on_error = on_error or (lambda message: None)
+    questions = {}
+    served = NearDuplicateIndex()
+    stack_words = ' '.join(tech_stack)
+    
+    def resolve(tech, tech_questions):
+        # Keep the set as it was if every question repeats one already served
+        tech_questions = unique_questions(tech_questions, stack_words, served, 'session') or tech_questions
+        questions[tech] = tech_questions
+        if on_result is not None:
+            on_result(tech, tech_questions)
+    
+    if QUESTION_BANK_FIRST:
+        for tech in tech_stack:
+            banked = sample_bank_questions(tech)
+            if banked is not None:
+                metrics.inc('questions_served_total', source='bank')
+                resolve(tech, banked)
+    
+    cache = get_question_cache()
+    if cache is not None:
+        for tech in tech_stack:
+            if tech in questions:
+                continue
+            cached = cache.get(tech, QUESTION_MODEL, QUESTION_TEMPERATURE, PROMPT_VERSION)
+            if cached is not None:
+                metrics.inc('questions_served_total', source='cache')
+                resolve(tech, cached)
+    
+    if QUESTION_TEMPLATES_FIRST:
+        for tech in tech_stack:
+            if tech not in questions and tech in FALLBACK_QUESTIONS:
+                metrics.inc('questions_served_total', source='templates')
+                resolve(tech, FALLBACK_QUESTIONS[tech])
+    
+    pending = [tech for tech in tech_stack if tech not in questions]
+    if not pending:
+        return {tech: questions[tech] for tech in tech_stack}
+    
+    api_key = os.getenv('OPENAI_API_KEY')
+    if not api_key:
+        record_fallback('no_api_key', len(pending))
+        for tech, tech_questions in generate_fallback_questions(pending).items():
+            resolve(tech, tech_questions)
+        return {tech: questions[tech] for tech in tech_stack}
+    
+    # While the provider is degraded, serve templates instead of queueing requests
+    if get_llm_client().breaker.is_open():
+        record_fallback('circuit_open', len(pending))
+        on_error("Question generation is temporarily unavailable; using standard questions.")
+        for tech, tech_questions in generate_fallback_questions(pending).items():
+            resolve(tech, tech_questions)
+        return {tech: questions[tech] for tech in tech_stack}
+    
+    mode = mode or QUESTION_GEN_MODE
+    max_workers = max_workers or QUESTION_GEN_CONCURRENCY
+    timeout = timeout or QUESTION_GEN_TIMEOUT
+    
+    if mode == 'sequential':
+        try:
+            for tech in pending:
+                resolve(tech, generate_questions_for_tech(tech, timeout, cache))
+        except Exception as e:
+            on_error(f"Error generating questions: {str(e)}")
+            remaining = [tech for tech in pending if tech not in questions]
+            record_fallback(fallback_reason(e), len(remaining))
+            for tech, tech_questions in generate_fallback_questions(remaining).items():
+                resolve(tech, tech_questions)
+        return {tech: questions[tech] for tech in tech_stack}
+    
+    if mode == 'batched':
+        chunks = chunk_tech_stack(pending)
+    else:
+        chunks = [[tech] for tech in pending]
+    
+    failed = []
+    workers = max(1, min(max_workers, len(chunks)))
+    
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {}
+        for chunk in chunks:
+            if mode == 'batched':
+                future = executor.submit(generate_questions_for_batch, chunk, timeout, cache, resolve)
+            else:
+                future = executor.submit(generate_questions_for_tech, chunk[0], timeout, cache)
+            futures[future] = chunk
+        
+        for future in as_completed(futures):
+            chunk = futures[future]
+            try:
+                result = future.result()
+                result = result if mode == 'batched' else {chunk[0]: result}
+            except Exception as e:
+                failed.append(f"{', '.join(chunk)} ({str(e)})")
+                record_fallback(fallback_reason(e), len(chunk))
+                result = {tech: generate_fallback_for_tech(tech) for tech in chunk}
+            for tech, tech_questions in result.items():
+                if tech not in questions:
+                    resolve(tech, tech_questions)
+    
+    if failed:
+        on_error(f"Error generating questions for: {', '.join(failed)}")
+    
+    return {tech: questions[tech] for tech in tech_stack}
+
+
+def start_question_generation(tech_stack, prefetch=None):
+    """Start generating questions in the background and return the filling pool.
+    
+    Technologies already covered by a prefetch pool are forwarded from it
+    instead of being requested again.
+    """
+    pool = QuestionPool(tech_stack)
+    pending = list(tech_stack)
+    if prefetch is not None:
+        supplied = prefetch.forward(tech_stack, pool)
+        pending = [tech for tech in tech_stack if tech not in supplied]
+    
+    if not pending:
+        pool.finish()
+        return pool
+    
+    fill_question_pool(pool, pending)
+    return pool
+
+
+def fill_question_pool(pool, techs):
+    """Generate questions for techs into pool in the background, then finish the pool."""
+    def fill():
+        try:
+            generate_questions_with_llm(techs, on_result=pool.add, on_error=pool.add_error)
+        except Exception as e:
+            pool.add_error(f"Error generating questions: {str(e)}")
+            for tech, tech_questions in generate_fallback_questions(techs).items():
+                if tech not in pool:
+                    pool.add(tech, tech_questions)
+        finally:
+            pool.finish()
+    
+    threading.Thread(target=fill, name="question-generation", daemon=True).start()
+
+
+def infer_likely_techs(position):
+    """Guess the candidate's likely technologies from their desired position."""
+    position = position.lower()
+    matches = []
+    for keyword, techs in POSITION_TECH_HINTS.items():
+        match = re.search(r'\b' + re.escape(keyword) + r'\b', position)
+        if match:
+            matches.append((match.start(), techs))
+    
+    likely = []
+    for _, techs in sorted(matches, key=lambda m: m[0]):
+        for tech in techs:
+            if tech not in likely:
+                likely.append(tech)
+    return likely[:QUESTION_PREFETCH_MAX_TECHS]
+
+
+def generate_fallback_questions(tech_stack):
+    """Generate fallback questions when API is not available."""
+    
+    questions = {}
+    for tech in tech_stack:
+        banked = sample_bank_questions(tech)
+        if banked is not None:
+            questions[tech] = banked
+            continue
+        questions[tech] = FALLBACK_QUESTIONS.get(tech, [
+            f"Explain your experience with {tech}.",
+            f"What are the best practices for using {tech}?",
+            f"Describe a challenging project you worked on using {tech}.",
+        ])
+    
+    return questions
+
+
+def generate_fallback_for_tech(tech):
+    """Generate fallback questions for a single technology."""
+    return [
+        f"Explain your experience with {tech}.",
+        f"What are the best practices for using {tech}?",
+        f"Describe a challenging project you worked on using {tech}.",
+    ]
@@ -0,0 +1,368 @@
+"""
+TalentScout - API Server
+Asyncio HTTP/WebSocket front end driving the headless conversation engine.
+
+Usage:
+    python server.py --host 0.0.0.0 --port 8080
+
+Endpoints:
+    POST   /sessions                  start a session
+    GET    /sessions/{id}             current session state
+    POST   /sessions/{id}/messages    send {"text": ...}, returns the bot replies
+    GET    /sessions/{id}/ws          WebSocket; each text frame is a candidate turn
+    DELETE /sessions/{id}             discard a session
+    GET    /candidates                recruiter search over finished interviews
+    GET    /candidates/{id}           one finished interview in full
+    GET    /metrics                   Prometheus text metrics
+
+The /candidates endpoints need RECRUITER_API_TOKEN set and sent as
+"Authorization: Bearer <token>".
+"""
+
+import argparse
+import asyncio
+import hmac
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from aiohttp import WSMsgType, web
+from dotenv import load_dotenv
+
+# Load environment variables before the modules below read their settings
+load_dotenv()
+
+from candidate_store import MAX_PAGE_SIZE, SEARCH_PAGE_SIZE, get_candidate_store, search_query  # noqa: E402
+from engine import (  # noqa: E402
+    SESSION_IDLE_TIMEOUT,
+    SESSION_REAP_INTERVAL,
+    SessionState,
+    handle_message,
+    resume_questions,
+    start_questions,
+    take_generation_errors,
+)
+from metrics import metrics, start_exporters  # noqa: E402
+from session_store import get_session_store  # noqa: E402
+
+# Worker threads for engine calls that may wait on question generation
+SERVER_WORKERS = int(os.getenv('SERVER_WORKERS', '64'))
+
+# Bearer token for the recruiter endpoints (empty disables them)
+RECRUITER_API_TOKEN = os.getenv('RECRUITER_API_TOKEN', '')
+
+
+class SessionRegistry:
+    """Map of session id to state, with one turn lock per session.
+
+    With a session store configured, sessions are reloaded from the store
+    whenever another process has saved a newer version, so any replica can
+    serve any turn.
+    """
+
+    def __init__(self, store=None):
+        self.store = store
+        self._sessions = {}
+        self._locks = {}
+
+    def create(self):
+        state = SessionState()
+        self._sessions[state.session_id] = [state, None]
+        self._locks[state.session_id] = asyncio.Lock()
+        return state
+
+    def lock(self, session_id):
+        """Return the turn lock for a session id."""
+        lock = self._locks.get(session_id)
+        if lock is None:
+            lock = self._locks[session_id] = asyncio.Lock()
+        return lock
+
+    def fetch(self, session_id):
+        """Return the current state of a session. Blocking; run it in the executor."""
+        entry = self._sessions.get(session_id)
+        if self.store is not None:
+            version = self.store.version(session_id)
+            if not version:
+                if entry is not None and entry[1]:
+                    # Stored before, so another replica deleted it or it expired
+                    self._sessions.pop(session_id, None)
+                    entry = None
+            elif entry is None or version not in (entry[1], (entry[0].saved or {}).get('version')):
+                # Saved by another replica; background saves made here are recorded in state.saved
+                state = self.store.load(session_id, SessionState)
+                if state is not None:
+                    resume_questions(state)
+                    entry = self._sessions[session_id] = [state, version]
+        if entry is None:
+            self._locks.pop(session_id, None)
+            raise web.HTTPNotFound(text=json.dumps({'error': 'unknown session'}),
+                                   content_type='application/json')
+        return entry[0]
+
+    def commit(self, state):
+        """Wait until the session's latest changes are stored. Blocking."""
+        if self.store is None:
+            return
+        self.store.save(state)
+        self.store.flush()
+        entry = self._sessions.get(state.session_id)
+        if entry is not None:
+            entry[1] = self.store.version(state.session_id)
+
+    def reap(self, timeout):
+        """Evict sessions idle for longer than timeout seconds. Blocking.
+
+        With a session store they are saved first and reloaded on their next turn.
+        """
+        evicted = 0
+        for session_id, (state, _) in list(self._sessions.items()):
+            lock = self._locks.get(session_id)
+            if state.idle_seconds() <= timeout or (lock is not None and lock.locked()):
+                continue
+            self.commit(state)
+            self._sessions.pop(session_id, None)
+            self._locks.pop(session_id, None)
+            state.evict()
+            evicted += 1
+        if evicted:
+            metrics.inc('sessions_evicted_total', evicted)
+        return evicted
+
+    def remove(self, session_id):
+        self._sessions.pop(session_id, None)
+        self._locks.pop(session_id, None)
+        if self.store is not None:
+            self.store.delete(session_id)
+
+    def __len__(self):
+        return len(self._sessions)
+
+
+async def run_turn(app, session_id, text):
+    """Run one candidate turn through the engine and describe the result."""
+    loop = asyncio.get_running_loop()
+    executor = app['executor']
+    registry = app['sessions']
+
+    async with registry.lock(session_id):
+        state = await loop.run_in_executor(executor, registry.fetch, session_id)
+        before = len(state.messages)
+        await loop.run_in_executor(executor, handle_message, state, text)
+        replies = [msg.text for msg in state.messages[before + 1:]]
+        # Background generation can fail after the first question was served
+        errors = take_generation_errors(state)
+
+        if state.stage == 'generating_questions':
+            question, tech = await loop.run_in_executor(executor, start_questions, state, errors.append)
+            if question:
+                replies.append(f"Great! I've generated technical questions based on your tech stack: {', '.join(state.tech_stack)}")
+            else:
+                replies.append("I wasn't able to generate questions. Would you like to continue with the application process?")
+
+        await loop.run_in_executor(executor, registry.commit, state)
+        return {
+            'session_id': state.session_id,
+            'stage': state.stage,
+            'replies': replies,
+            'question': {'text': state.current_question, 'tech': state.current_tech}
+            if state.stage == 'answering' else None,
+            'errors': errors,
+        }
+
+
+async def create_session(request):
+    registry = request.app['sessions']
+    state = registry.create()
+    await asyncio.get_running_loop().run_in_executor(request.app['executor'], registry.commit, state)
+    return web.json_response({'session_id': state.session_id, 'stage': state.stage}, status=201)
+
+
+async def get_session(request):
+    state = await asyncio.get_running_loop().run_in_executor(
+        request.app['executor'], request.app['sessions'].fetch, request.match_info['session_id'])
+    return web.json_response({**state.to_dict(), 'memory_bytes': state.memory_bytes()})
+
+
+async def delete_session(request):
+    await asyncio.get_running_loop().run_in_executor(
+        request.app['executor'], request.app['sessions'].remove, request.match_info['session_id'])
+    return web.json_response({'deleted': True})
+
+
+def message_text(body):
+    """Return the stripped text of a message body, or '' if it has no string text."""
+    text = body.get('text') if isinstance(body, dict) else None
+    return text.strip() if isinstance(text, str) else ''
+
+
+async def post_message(request):
+    try:
+        body = await request.json()
+    except json.JSONDecodeError:
+        raise web.HTTPBadRequest(text=json.dumps({'error': 'invalid JSON'}), content_type='application/json')
+    if not isinstance(body, dict):
+        raise web.HTTPBadRequest(text=json.dumps({'error': 'expected a JSON object'}),
+                                 content_type='application/json')
+
+    text = message_text(body)
+    if not text:
+        raise web.HTTPBadRequest(text=json.dumps({'error': 'text is required'}), content_type='application/json')
+
+    result = await run_turn(request.app, request.match_info['session_id'], text)
+    return web.json_response(result)
+
+
+async def session_socket(request):
+    session_id = request.match_info['session_id']
+    await asyncio.get_running_loop().run_in_executor(
+        request.app['executor'], request.app['sessions'].fetch, session_id)
+
+    ws = web.WebSocketResponse(heartbeat=30)
+    await ws.prepare(request)
+
+    async for msg in ws:
+        if msg.type != WSMsgType.TEXT:
+            continue
+        text = msg.data.strip()
+        if text.startswith('{'):
+            try:
+                text = message_text(json.loads(text))
+            except json.JSONDecodeError:
+                pass
+        if not text:
+            await ws.send_json({'error': 'text is required'})
+            continue
+        try:
+            result = await run_turn(request.app, session_id, text)
+        except web.HTTPNotFound as e:
+            # The session was deleted or expired while the socket was open
+            await ws.send_str(e.text)
+            continue
+        await ws.send_json(result)
+
+    return ws
+
+
+def json_error(error_class, message):
+    return error_class(text=json.dumps({'error': message}), content_type='application/json')
+
+
+def recruiter_store(request):
+    """Check the recruiter token and return the candidate store."""
+    if not RECRUITER_API_TOKEN:
+        raise json_error(web.HTTPForbidden, 'recruiter API is disabled; set RECRUITER_API_TOKEN')
+    header = request.headers.get('Authorization', '')
+    if not hmac.compare_digest(header.encode('utf-8'), f"Bearer {RECRUITER_API_TOKEN}".encode('utf-8')):
+        raise json_error(web.HTTPUnauthorized, 'invalid recruiter token')
+    store = get_candidate_store()
+    if store is None:
+        raise json_error(web.HTTPNotFound, 'candidate store is disabled')
+    return store
+
+
+def int_param(request, name, default=None):
+    value = request.query.get(name)
+    if value in (None, ''):
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise json_error(web.HTTPBadRequest, f'{name} must be an integer')
+
+
+async def search_candidates(request):
+    """Search finished interviews, e.g. ?q=Kubernetes+%2B+Go,+5%2B+years&location=Berlin.
+
+    tech may be repeated or comma-separated. Follow next_cursor with ?cursor=.
+    """
+    store = recruiter_store(request)
+    query = request.query
+    techs = [t.strip() for value in query.getall('tech', []) for t in value.split(',') if t.strip()]
+    filters = {
+        'techs': techs,
+        'min_experience': int_param(request, 'min_experience'),
+        'max_experience': int_param(request, 'max_experience'),
+        'location': query.get('location') or None,
+        'position': query.get('position') or None,
+        'cursor': int_param(request, 'cursor'),
+        'limit': min(int_param(request, 'limit', SEARCH_PAGE_SIZE), MAX_PAGE_SIZE),
+    }
+    with metrics.timer('candidate_search_seconds'):
+        page = await asyncio.get_running_loop().run_in_executor(
+            request.app['executor'], lambda: search_query(store, query.get('q', ''), **filters))
+    return web.json_response(page)
+
+
+async def get_candidate(request):
+    store = recruiter_store(request)
+    record = await asyncio.get_running_loop().run_in_executor(
+        request.app['executor'], store.get, request.match_info['session_id'])
+    if record is None:
+        raise json_error(web.HTTPNotFound, 'no such candidate')
+    return web.json_response(record)
+
+
+async def health(request):
+    return web.json_response({'status': 'ok', 'sessions': len(request.app['sessions'])})
+
+
+async def metrics_endpoint(request):
+    return web.Response(text=metrics.render_prometheus(), content_type='text/plain')
+
+
+async def reap_sessions(app):
+    loop = asyncio.get_running_loop()
+    while True:
+        await asyncio.sleep(SESSION_REAP_INTERVAL)
+        await loop.run_in_executor(app['executor'], app['sessions'].reap, SESSION_IDLE_TIMEOUT)
+
+
+async def start_reaper(app):
+    if SESSION_IDLE_TIMEOUT:
+        app['reaper'] = asyncio.get_running_loop().create_task(reap_sessions(app))
+
+
+async def close_executor(app):
+    reaper = app.get('reaper')
+    if reaper is not None:
+        reaper.cancel()
+    app['executor'].shutdown(wait=False)
+
+
+def create_app(workers=None):
+    """Build the aiohttp application."""
+    app = web.Application()
+    app['sessions'] = SessionRegistry(get_session_store())
+    app['executor'] = ThreadPoolExecutor(max_workers=workers or SERVER_WORKERS,
+                                         thread_name_prefix='engine')
+    app.on_startup.append(start_reaper)
+    app.on_cleanup.append(close_executor)
+
+    app.router.add_get('/health', health)
+    app.router.add_get('/metrics', metrics_endpoint)
+    app.router.add_post('/sessions', create_session)
+    app.router.add_get('/sessions/{session_id}', get_session)
+    app.router.add_delete('/sessions/{session_id}', delete_session)
+    app.router.add_post('/sessions/{session_id}/messages', post_message)
+    app.router.add_get('/sessions/{session_id}/ws', session_socket)
+    app.router.add_get('/candidates', search_candidates)
+    app.router.add_get('/candidates/{session_id}', get_candidate)
+    return app
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the TalentScout API server.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--workers', type=int, default=SERVER_WORKERS,
+                        help="threads for engine calls that wait on question generation")
+    args = parser.parse_args(argv)
+
+    # /metrics is served by the app itself; only the JSONL dump needs a thread
+    start_exporters(port=0)
+    web.run_app(create_app(args.workers), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
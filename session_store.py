@@ -0,0 +1,380 @@
+"""
+TalentScout - Session Store
+Shared session persistence so several app or API replicas can serve the same
+candidates and a restart does not lose interviews in progress.
+
+Each save appends only what changed since the previous save (a delta). A
+background writer commits queued deltas from every session in one batch, and
+a session's log is compacted into a single snapshot every
+SESSION_STORE_COMPACT_EVERY deltas.
+"""
+
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+from metrics import metrics
+from question_pool import QuestionPool
+from transcript import Message
+
+# Store settings: sqlite:///path/to/file.sqlite3 or redis://host:port/db (empty disables)
+SESSION_STORE_URL = os.getenv('SESSION_STORE_URL', '')
+SESSION_STORE_FLUSH_INTERVAL = float(os.getenv('SESSION_STORE_FLUSH_INTERVAL', '0.05'))
+SESSION_STORE_COMPACT_EVERY = int(os.getenv('SESSION_STORE_COMPACT_EVERY', '50'))
+SESSION_STORE_TTL = int(os.getenv('SESSION_STORE_TTL', str(7 * 24 * 3600)))
+
+# Scalar SessionState fields saved whenever their value changes
+TRACKED_FIELDS = ('stage', 'tech_stack', 'current_question', 'current_tech', 'waiting_for_answer')
+
+# Largest number of deltas committed in one write
+MAX_BATCH = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS session_deltas (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_id TEXT NOT NULL,
+    data TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_session_deltas_session ON session_deltas (session_id, id);
+"""
+
+
+def make_delta(state):
+    """Return (delta, reset) describing what changed since state was last saved.
+
+    The first save of a session, and every SESSION_STORE_COMPACT_EVERY-th one,
+    is a full snapshot (reset=True) that replaces the earlier deltas. Returns
+    (None, False) when nothing changed.
+    """
+    saved = state.saved
+    reset = saved is None or saved['deltas'] >= SESSION_STORE_COMPACT_EVERY
+    if reset:
+        saved = {'deltas': 0, 'messages': 0, 'questions_asked': 0, 'scores': 0,
+                 'questions': set(), 'pending': [], 'candidate_info': {}, 'fields': {}}
+
+    # Background generation and scoring keep changing the state, so every
+    # count below is taken once and the saved marks come from the delta itself
+    delta = {}
+    fields = {}
+    for name in TRACKED_FIELDS:
+        value = getattr(state, name)
+        fields[name] = list(value) if isinstance(value, list) else value
+        if reset or saved['fields'].get(name) != value:
+            delta[name] = fields[name]
+
+    info = {k: v for k, v in list(state.candidate_info.items()) if saved['candidate_info'].get(k) != v}
+    if info:
+        delta['candidate_info'] = info
+    messages = len(state.messages)
+    if messages > saved['messages']:
+        delta['messages'] = [message.to_dict() for message in state.messages[saved['messages']:messages]]
+    asked = len(state.questions_asked)
+    if asked > saved['questions_asked']:
+        delta['questions_asked'] = state.questions_asked[saved['questions_asked']:asked]
+
+    # Technologies still being generated are saved too, so a restored session
+    # restarts their generation instead of ending the interview early
+    generating = not getattr(state.generated_questions, 'is_complete', True)
+    generated = list(state.generated_questions.items())
+    new_questions = {tech: list(questions) for tech, questions in generated if tech not in saved['questions']}
+    if new_questions:
+        delta['generated_questions'] = new_questions
+    present = {tech for tech, _ in generated}
+    pending = [tech for tech in state.tech_stack if tech not in present] if generating else []
+    if pending != saved['pending']:
+        delta['questions_pending'] = pending
+    # Scores are added by the scoring workers, so count the ones actually sent
+    scores = list(state.scores.items())[saved['scores']:]
+    if scores:
+        delta['scores'] = dict(scores)
+
+    if not delta:
+        return None, False
+    state.saved = {
+        'deltas': saved['deltas'] + 1,
+        'messages': messages,
+        'questions_asked': asked,
+        'scores': saved['scores'] + len(scores),
+        'questions': saved['questions'] | set(new_questions),
+        'pending': pending,
+        'candidate_info': {**saved['candidate_info'], **info},
+        'fields': fields,
+    }
+    return delta, reset
+
+
+def mark_saved(state, deltas, pending=()):
+    """Remember the parts of a restored state that are persisted."""
+    state.saved = {
+        'deltas': deltas,
+        'messages': len(state.messages),
+        'questions_asked': len(state.questions_asked),
+        'scores': len(state.scores),
+        'questions': set(state.generated_questions),
+        'pending': list(pending),
+        'candidate_info': dict(state.candidate_info),
+        'fields': {name: getattr(state, name) for name in TRACKED_FIELDS},
+    }
+
+
+def apply_delta(state, delta):
+    """Replay one saved delta onto a state."""
+    for name in TRACKED_FIELDS:
+        if name in delta:
+            setattr(state, name, delta[name])
+    state.candidate_info.update(delta.get('candidate_info', {}))
+    state.messages.extend(Message.from_dict(message) for message in delta.get('messages', ()))
+    state.questions_asked.extend(delta.get('questions_asked', ()))
+    state.scores.update(delta.get('scores', {}))
+    if 'generated_questions' in delta:
+        state.generated_questions = {**state.generated_questions, **delta['generated_questions']}
+
+
+class SQLiteSessionBackend:
+    """Delta log in a SQLite table, shared by every process using the same file."""
+
+    def __init__(self, path, ttl_seconds=SESSION_STORE_TTL):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self._local = threading.local()
+        self._last_purge = 0.0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._connect()
+        with conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self):
+        """Return the connection for the current thread, opening it if needed."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def write_batch(self, items):
+        """Append (session_id, data, reset) items in one transaction; return {session_id: version}."""
+        conn = self._connect()
+        now = time.time()
+        versions = {}
+        with conn:
+            for session_id, data, reset in items:
+                if reset:
+                    conn.execute("DELETE FROM session_deltas WHERE session_id = ?", (session_id,))
+                cursor = conn.execute(
+                    "INSERT INTO session_deltas (session_id, data, created_at) VALUES (?, ?, ?)",
+                    (session_id, data, now)
+                )
+                versions[session_id] = cursor.lastrowid
+            if self.ttl_seconds and now - self._last_purge > 3600:
+                self._last_purge = now
+                conn.execute(
+                    "DELETE FROM session_deltas WHERE session_id IN "
+                    "(SELECT session_id FROM session_deltas GROUP BY session_id HAVING MAX(created_at) < ?)",
+                    (now - self.ttl_seconds,)
+                )
+        return versions
+
+    def read(self, session_id):
+        rows = self._connect().execute(
+            "SELECT data FROM session_deltas WHERE session_id = ? ORDER BY id", (session_id,)
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def version(self, session_id):
+        row = self._connect().execute(
+            "SELECT MAX(id) FROM session_deltas WHERE session_id = ?", (session_id,)
+        ).fetchone()
+        return row[0] or 0
+
+    def delete(self, session_id):
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM session_deltas WHERE session_id = ?", (session_id,))
+
+
+class RedisSessionBackend:
+    """Delta log in Redis lists; works with any Redis-protocol server."""
+
+    KEY_PREFIX = 'talentscout:session:'
+
+    def __init__(self, url, ttl_seconds=SESSION_STORE_TTL):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("SESSION_STORE_URL points at Redis but the 'redis' package is not installed")
+        self.client = redis.Redis.from_url(url)
+        self.ttl_seconds = ttl_seconds
+
+    def write_batch(self, items):
+        """Append (session_id, data, reset) items in one pipeline; return {session_id: version}."""
+        pipe = self.client.pipeline(transaction=True)
+        for session_id, data, reset in items:
+            key = self.KEY_PREFIX + session_id
+            if reset:
+                pipe.delete(key)
+            pipe.rpush(key, data)
+            pipe.incr(key + ':version')
+            if self.ttl_seconds:
+                pipe.expire(key, self.ttl_seconds)
+                pipe.expire(key + ':version', self.ttl_seconds)
+
+        results = iter(pipe.execute())
+        versions = {}
+        for session_id, _, reset in items:
+            if reset:
+                next(results)
+            next(results)
+            versions[session_id] = next(results)
+            if self.ttl_seconds:
+                next(results)
+                next(results)
+        return versions
+
+    def read(self, session_id):
+        return [data.decode('utf-8') for data in self.client.lrange(self.KEY_PREFIX + session_id, 0, -1)]
+
+    def version(self, session_id):
+        return int(self.client.get(self.KEY_PREFIX + session_id + ':version') or 0)
+
+    def delete(self, session_id):
+        key = self.KEY_PREFIX + session_id
+        self.client.delete(key, key + ':version')
+
+
+class _Write:
+    __slots__ = ('state', 'session_id', 'data', 'reset', 'done', 'version')
+
+    def __init__(self, state, data, reset):
+        self.state = state
+        self.session_id = state.session_id if state is not None else None
+        self.data = data
+        self.reset = reset
+        self.done = threading.Event()
+        self.version = None
+
+
+class SessionStore:
+    """Saves session deltas through a batching background writer."""
+
+    def __init__(self, backend, flush_interval=SESSION_STORE_FLUSH_INTERVAL):
+        self.backend = backend
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue()
+        # Scoring workers save sessions too, so deltas are cut one at a time
+        self._save_lock = threading.Lock()
+        threading.Thread(target=self._writer, name='session-store', daemon=True).start()
+
+    def _writer(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < MAX_BATCH:
+                remaining = deadline - time.monotonic()
+                try:
+                    batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            writes = [w for w in batch if w.session_id is not None]
+            started = time.perf_counter()
+            try:
+                if writes:
+                    versions = self.backend.write_batch([(w.session_id, w.data, w.reset) for w in writes])
+                    for w in writes:
+                        w.version = versions.get(w.session_id)
+                        if w.state.saved is not None:
+                            w.state.saved['version'] = w.version
+                    metrics.observe('session_store_write_seconds', time.perf_counter() - started)
+                    metrics.inc('session_store_deltas_total', len(writes))
+            except Exception as e:
+                metrics.inc('session_store_errors_total', error=type(e).__name__)
+                # Resend these sessions in full with their next save
+                for w in writes:
+                    w.state.saved = None
+            finally:
+                for w in batch:
+                    w.done.set()
+
+    def save(self, state, wait=False):
+        """Queue whatever changed in state. With wait=True, block until it is written and return the version."""
+        with self._save_lock:
+            delta, reset = make_delta(state)
+            if delta is None:
+                return None
+            write = _Write(state, json.dumps(delta, ensure_ascii=False), reset)
+            self._queue.put(write)
+        if not wait:
+            return None
+        write.done.wait()
+        return write.version
+
+    def flush(self):
+        """Block until everything queued so far has been written."""
+        marker = _Write(None, None, False)
+        self._queue.put(marker)
+        marker.done.wait()
+
+    def load(self, session_id, state_factory):
+        """Rebuild a session from its deltas, or return None if the store has none.
+
+        A session saved while its questions were still being generated comes
+        back with an unfinished QuestionPool; see engine.resume_questions.
+        """
+        self.flush()
+        records = self.backend.read(session_id)
+        if not records:
+            return None
+        state = state_factory(session_id)
+        pending = []
+        for record in records:
+            delta = json.loads(record)
+            apply_delta(state, delta)
+            pending = delta.get('questions_pending', pending)
+        pending = [tech for tech in pending if tech not in state.generated_questions]
+        if pending:
+            # Saved mid-generation: an unfinished pool the caller restarts generation for
+            pool = QuestionPool(state.tech_stack)
+            pool.update(state.generated_questions)
+            state.generated_questions = pool
+        mark_saved(state, len(records), pending)
+        return state
+
+    def version(self, session_id):
+        """Return a number that changes whenever the session is saved."""
+        return self.backend.version(session_id)
+
+    def delete(self, session_id):
+        self.flush()
+        self.backend.delete(session_id)
+
+
+def open_store(url):
+    """Create a store for a sqlite:/// or redis:// URL."""
+    if url.startswith('sqlite:///'):
+        return SessionStore(SQLiteSessionBackend(url[len('sqlite:///'):]))
+    if url.startswith(('redis://', 'rediss://', 'unix://')):
+        return SessionStore(RedisSessionBackend(url))
+    raise ValueError(f"Unsupported SESSION_STORE_URL: {url}")
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_session_store():
+    """Return the process-wide session store, or None if SESSION_STORE_URL is unset."""
+    global _store
+    if _store is None and SESSION_STORE_URL:
+        with _store_lock:
+            if _store is None:
+                _store = open_store(SESSION_STORE_URL)
+    return _store
@@ -0,0 +1,224 @@
+"""
+TalentScout - Technology Taxonomy
+Alias and typo-tolerant lookup of technology names, built once per process
+from a JSON taxonomy file.
+"""
+
+import json
+import os
+import re
+import threading
+from collections import Counter
+
+# Taxonomy file: {"categories": {category: {canonical name: [aliases]}}}
+TECH_TAXONOMY_PATH = os.getenv(
+    'TECH_TAXONOMY_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'technologies.json')
+)
+
+# Keys shorter than this are only matched exactly ("C", "Go", "Rust", ...)
+FUZZY_MIN_LENGTH = 5
+# Keys at least this long may be two edits away from their match
+FUZZY_TWO_EDIT_LENGTH = 7
+FUZZY_CANDIDATES = 8
+LOOKUP_MEMO_SIZE = 4096
+
+_SEPARATORS = re.compile(r'[\s._/-]+')
+_VERSION_SUFFIX = re.compile(r'^(.*?[^\s\d.v-])[\s-]*v?\d+(?:\.\d+)*(?:\.x)?$')
+
+
+def lookup_key(text):
+    """Reduce a technology name to the form used for lookups ("React.js" -> "reactjs")."""
+    return _SEPARATORS.sub('', text.strip().lower())
+
+
+def strip_version(text):
+    """Drop a trailing version number ("Postgres 15" -> "Postgres"), or return None."""
+    match = _VERSION_SUFFIX.match(text.strip())
+    return match.group(1) if match else None
+
+
+def deletions(key):
+    """Return key and every string made by deleting one character from it."""
+    return {key} | {key[:i] + key[i + 1:] for i in range(len(key))}
+
+
+def trigrams(key):
+    """Return the set of padded character trigrams of a lookup key."""
+    padded = f"^{key}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def one_edit_apart(a, b):
+    """True if b is a, or a with one character inserted, deleted, replaced or two adjacent ones swapped."""
+    if len(a) > len(b):
+        a, b = b, a
+    if len(b) - len(a) > 1:
+        return False
+    i = 0
+    while i < len(a) and a[i] == b[i]:
+        i += 1
+    if len(a) < len(b):
+        return a[i:] == b[i + 1:]
+    if a[i + 1:] == b[i + 1:]:
+        return True
+    return i + 1 < len(a) and a[i] == b[i + 1] and a[i + 1] == b[i] and a[i + 2:] == b[i + 2:]
+
+
+def edit_distance(a, b, limit):
+    """Edit distance counting adjacent transpositions as one edit, capped at limit + 1."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    before, previous = None, list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            cost = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb))
+            if before is not None and j > 1 and ca == b[j - 2] and a[i - 2] == cb:
+                cost = min(cost, before[j - 2] + 1)
+            current.append(cost)
+        if min(current) > limit:
+            return limit + 1
+        before, previous = previous, current
+    return previous[-1]
+
+
+class TechTaxonomy:
+    """Exact alias index plus deletion and trigram indexes for near-miss spellings.
+
+    A typo one edit away shares a one-deletion variant with the intended key,
+    so it is found with a handful of dict lookups. Longer keys that are two
+    edits away are found through shared trigrams instead.
+    """
+
+    def __init__(self, categories=None):
+        self._aliases = {}
+        self._categories = {}
+        self._keys = []
+        self._names = []
+        self._deletions = {}
+        self._postings = {}
+        self._memo = {}
+        self._memo_lock = threading.Lock()
+
+        for category, techs in (categories or {}).items():
+            for name, aliases in techs.items():
+                self.add(name, aliases, category)
+
+    @classmethod
+    def from_file(cls, path):
+        """Load a taxonomy file; a missing file gives an empty taxonomy."""
+        if not path or not os.path.exists(path):
+            return cls()
+        with open(path, encoding='utf-8') as f:
+            return cls(json.load(f).get('categories', {}))
+
+    def add(self, name, aliases=(), category=None):
+        """Register a canonical name and its aliases. Earlier entries win on clashes."""
+        self._categories.setdefault(name, category)
+        for alias in (name, *aliases):
+            key = lookup_key(alias)
+            if not key or key in self._aliases:
+                continue
+            self._aliases[key] = name
+            if len(key) >= FUZZY_MIN_LENGTH:
+                key_id = len(self._keys)
+                self._keys.append(key)
+                self._names.append(name)
+                for variant in deletions(key):
+                    self._deletions.setdefault(variant, []).append(key_id)
+                for gram in trigrams(key):
+                    self._postings.setdefault(gram, []).append(key_id)
+        self._memo.clear()
+
+    def __len__(self):
+        return len(self._categories)
+
+    def __contains__(self, name):
+        return name in self._categories
+
+    def category(self, name):
+        """Return the category of a canonical name, or None."""
+        return self._categories.get(name)
+
+    def _closest(self, key, candidates, limit):
+        best = None
+        for key_id in candidates:
+            distance = edit_distance(key, self._keys[key_id], limit)
+            if distance <= limit and (best is None or (distance, key_id) < best):
+                best = (distance, key_id)
+        return self._names[best[1]] if best else None
+
+    def _fuzzy(self, key):
+        candidates = set()
+        for variant in deletions(key):
+            candidates.update(self._deletions.get(variant, ()))
+        matches = [key_id for key_id in candidates if one_edit_apart(key, self._keys[key_id])]
+        if matches:
+            return self._names[min(matches)]
+        if len(key) < FUZZY_TWO_EDIT_LENGTH:
+            return None
+
+        # Two edits change at most eight trigrams, so keys sharing fewer
+        # cannot be close enough and never reach the edit distance check
+        grams = trigrams(key)
+        shared = Counter()
+        for gram in grams:
+            shared.update(self._postings.get(gram, ()))
+        needed = len(grams) - 8
+        ranked = sorted(
+            (key_id for key_id, count in shared.items()
+             if count >= needed and abs(len(self._keys[key_id]) - len(key)) <= 2),
+            key=lambda key_id: (-shared[key_id], key_id)
+        )
+        return self._closest(key, ranked[:FUZZY_CANDIDATES], 2)
+
+    def _resolve(self, text):
+        key = lookup_key(text)
+        if not key:
+            return None
+        name = self._aliases.get(key)
+        if name:
+            return name
+
+        unversioned = strip_version(text)
+        if unversioned:
+            key = lookup_key(unversioned)
+            name = self._aliases.get(key)
+            if name:
+                return name
+
+        if len(key) >= FUZZY_MIN_LENGTH:
+            return self._fuzzy(key)
+        return None
+
+    def lookup(self, text):
+        """Return the canonical name for text, or None if nothing matches closely enough."""
+        try:
+            return self._memo[text]
+        except KeyError:
+            pass
+        name = self._resolve(text)
+        with self._memo_lock:
+            if len(self._memo) >= LOOKUP_MEMO_SIZE:
+                self._memo.clear()
+            self._memo[text] = name
+        return name
+
+    def normalize(self, text):
+        """Return the canonical name for text, or the trimmed text itself if unknown."""
+        return self.lookup(text) or text.strip()
+
+
+_taxonomy = None
+_taxonomy_lock = threading.Lock()
+
+
+def get_taxonomy():
+    """Return the process-wide taxonomy, loading it on first use."""
+    global _taxonomy
+    if _taxonomy is None:
+        with _taxonomy_lock:
+            if _taxonomy is None:
+                _taxonomy = TechTaxonomy.from_file(TECH_TAXONOMY_PATH)
+    return _taxonomy
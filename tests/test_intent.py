@@ -0,0 +1,96 @@
+"""
+TalentScout - Intent Classification Tests
+"""
+
+import pytest
+
+from intent import (
+    ANSWER,
+    EXIT,
+    FIELD_VALUE,
+    INTENT_DATA_PATH,
+    OFF_TOPIC,
+    IntentClassifier,
+    IntentModel,
+    exit_phrase,
+)
+
+
+@pytest.fixture(scope='module')
+def model():
+    return IntentModel.from_file(INTENT_DATA_PATH)
+
+
+def test_exit_phrase():
+    assert exit_phrase("ok, bye!") == 'only'
+    assert exit_phrase("Thank you so much, have a nice day") == 'only'
+    assert exit_phrase("thank you for asking, the GIL is a mutex") == 'some'
+    assert exit_phrase("exiting early") is None
+    assert exit_phrase("The GIL is a mutex") is None
+
+
+def test_exit_without_a_model():
+    classifier = IntentClassifier(None)
+    assert classifier.classify("bye") == EXIT
+    assert classifier.classify("what's the salary?", answering=True) == ANSWER
+    assert classifier.classify("Berlin") == FIELD_VALUE
+
+
+@pytest.mark.parametrize('message', [
+    "thank you for asking, the GIL is a mutex that protects the interpreter state",
+    "sys.exit() ends the script with an exit code",
+    "I'd quit the loop with break",
+    "I don't know",
+])
+def test_answers_mentioning_exit_words_are_answers(model, message):
+    assert IntentClassifier(model).classify(message, answering=True) == ANSWER
+
+
+@pytest.mark.parametrize('message', ["I want to quit the interview now", "sorry I need to leave, goodbye"])
+def test_exits_with_extra_words(model, message):
+    assert IntentClassifier(model).classify(message, answering=True) == EXIT
+
+
+def test_off_topic_needs_the_threshold(model):
+    message = "what is the salary for this role?"
+    probability = model.probabilities(message, (EXIT, OFF_TOPIC, ANSWER))[OFF_TOPIC]
+    assert IntentClassifier(model, threshold=probability).classify(message, answering=True) == OFF_TOPIC
+    assert IntentClassifier(model, threshold=min(1.0, probability + 1e-9)).classify(
+        message, answering=True) == ANSWER
+
+
+def test_exit_needs_the_exit_threshold(model):
+    message = "I want to quit the interview now"
+    probability = model.probabilities(message, (EXIT, OFF_TOPIC, ANSWER))[EXIT]
+    assert IntentClassifier(model, exit_threshold=probability).classify(message, answering=True) == EXIT
+    assert IntentClassifier(model, exit_threshold=min(1.0, probability + 1e-9)).classify(
+        message, answering=True) != EXIT
+
+
+def test_field_values_before_answering(model):
+    classifier = IntentClassifier(model)
+    for message in ("Priya Sharma", "priya@example.com", "5", "Python, Django, React"):
+        assert classifier.classify(message) == FIELD_VALUE
+
+
+@pytest.mark.parametrize('message', [
+    "Los Angeles?",
+    "New York?",
+    "Senior Backend Engineer?",
+    "5?",
+    "thank you for asking, I'm based in Los Angeles",
+    "thank you for asking, the GIL is a mutex",
+])
+def test_unsure_or_polite_field_values_are_field_values(model, message):
+    assert IntentClassifier(model).classify(message) == FIELD_VALUE
+
+
+@pytest.mark.parametrize('message', ["thanks", "thanks!", "see you", "take care", "thanks, that's all"])
+def test_closing_phrases_are_exits(model, message):
+    classifier = IntentClassifier(model)
+    assert classifier.classify(message) == EXIT
+    assert classifier.classify(message, answering=True) == EXIT
+
+
+def test_missing_data_file_gives_an_empty_model(tmp_path):
+    assert IntentModel.from_file(str(tmp_path / 'missing.json')).probabilities("hi") == {}
@@ -0,0 +1,61 @@
+"""
+TalentScout - JSON Stream Parsing Tests
+"""
+
+from json_stream import JSONStreamParser, extract_json_array
+
+
+def test_bare_array_is_not_recovered():
+    parser = JSONStreamParser('[')
+    assert parser.feed('["a", "b"]') == ['a', 'b']
+    assert parser.done
+    assert not parser.recovered
+
+
+def test_elements_are_returned_as_they_complete():
+    parser = JSONStreamParser('[')
+    assert parser.feed('["first", "sec') == ['first']
+    assert parser.feed('ond", {"k": [1, 2]}') == ['second']
+    assert parser.feed(']') == [{'k': [1, 2]}]
+
+
+def test_fences_and_prose_are_skipped():
+    assert extract_json_array('Sure!\n```json\n["a", "b, c"]\n```\nGood luck!') == ['a', 'b, c']
+    parser = JSONStreamParser('[')
+    parser.feed('Here you go: ["a"] hope that helps')
+    assert parser.items == ['a']
+    assert parser.recovered
+
+
+def test_wrapping_object_is_not_recovered():
+    parser = JSONStreamParser('[')
+    parser.feed('{"questions": ["a", "b"]}')
+    assert parser.items == ['a', 'b']
+    assert not parser.recovered
+
+
+def test_truncated_array_keeps_complete_elements():
+    assert extract_json_array('["a", "b", "unfinish') == ['a', 'b']
+    assert extract_json_array('no json here') == []
+    assert extract_json_array(None) == []
+
+
+def test_escaped_quotes_and_brackets_inside_strings():
+    assert extract_json_array(r'["say \"hi\"", "a [b] {c}, d"]') == ['say "hi"', 'a [b] {c}, d']
+
+
+def test_object_members_and_truncated_member():
+    parser = JSONStreamParser('{')
+    assert parser.feed('{"Python": ["p1", "p2"], "Go": ["g1", "g') == [('Python', ['p1', 'p2'])]
+    assert parser.close() == [('Go', ['g1'])]
+    assert parser.items == [('Python', ['p1', 'p2']), ('Go', ['g1'])]
+    assert parser.recovered
+
+
+def test_brackets_in_wrapper_strings_before_the_array_are_skipped():
+    assert extract_json_array('{"note": "see [1]", "questions": ["x"]}') == ['x']
+    parser = JSONStreamParser('[')
+    assert parser.feed('{"note": "a \\"[quoted]') == []
+    assert parser.feed('\\" one", "questions": ["x", "y"]}') == ['x', 'y']
+    # A stray quote in prose before the array does not hide it
+    assert extract_json_array('Questions for 5" screens: ["a"]') == ['a']
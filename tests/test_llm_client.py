@@ -0,0 +1,78 @@
+"""
+TalentScout - LLM Client Tests
+"""
+
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from llm_client import CircuitBreaker, LLMClient, LLMUnavailable, TokenBucket
+
+COOLDOWN = 0.05
+
+
+def test_breaker_opens_and_probes_after_cooldown():
+    breaker = CircuitBreaker(2, COOLDOWN)
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert not breaker.allow()
+    time.sleep(COOLDOWN)
+    assert breaker.allow()
+    assert not breaker.allow()  # one probe at a time
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_lost_probe_expires():
+    breaker = CircuitBreaker(1, COOLDOWN)
+    breaker.record_failure()
+    time.sleep(COOLDOWN)
+    assert breaker.allow()
+    time.sleep(COOLDOWN)
+    assert breaker.allow()
+
+
+def open_client(error):
+    def create(**kwargs):
+        raise error
+
+    client = LLMClient(api_key='test', max_retries=0, breaker_threshold=1, breaker_cooldown=COOLDOWN)
+    client.client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    client.breaker.record_failure()
+    time.sleep(COOLDOWN)
+    return client
+
+
+def test_probe_failing_with_non_retryable_error_reopens_the_circuit():
+    client = open_client(ValueError("bad request"))
+    with pytest.raises(ValueError):
+        client.create([{'role': 'user', 'content': 'hi'}], 'model', 0, 10)
+    assert client.breaker.state == CircuitBreaker.OPEN
+    assert client.breaker.is_open()
+
+
+def test_probe_stopped_by_the_rate_limiter_reopens_the_circuit():
+    client = open_client(AssertionError("must not be sent"))
+    client.requests = TokenBucket(1)
+    client.requests.tokens = 0
+    with pytest.raises(LLMUnavailable):
+        client.create([{'role': 'user', 'content': 'hi'}], 'model', 0, 10, timeout=0.01)
+    assert client.breaker.state == CircuitBreaker.OPEN
+    time.sleep(COOLDOWN)
+    assert client.breaker.allow()
+
+
+def test_streamed_requests_are_not_hedged():
+    sent = []
+
+    def create(**kwargs):
+        sent.append(kwargs)
+        return SimpleNamespace(usage=None)
+
+    client = LLMClient(api_key='test', hedge=True)
+    client.client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    client.create_hedged([{'role': 'user', 'content': 'hi'}], 'model', 0, 10, kind='batch', stream=True)
+    assert len(sent) == 1 and sent[0]['stream']
+    assert 'batch' not in client._latencies
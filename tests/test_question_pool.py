@@ -0,0 +1,87 @@
+"""
+TalentScout - Question Pool Tests
+"""
+
+import threading
+
+from question_pool import PrefetchStats, QuestionPool
+
+
+def test_complete_when_every_tech_arrives_or_generation_finishes():
+    pool = QuestionPool(['Python', 'Go'])
+    assert not pool.is_complete
+    pool.add('Python', ['p'])
+    assert not pool.is_complete
+    pool.finish()
+    assert pool.is_complete
+
+    pool = QuestionPool(['Python'])
+    pool.add('Python', ['p'])
+    assert pool.is_complete
+
+
+def test_wait_returns_when_a_tech_arrives():
+    pool = QuestionPool(['Python', 'Go'])
+    threading.Timer(0.05, pool.add, ('Python', ['p'])).start()
+    assert pool.wait(0, timeout=5)
+    assert 'Python' in pool
+
+
+def test_wait_times_out_while_nothing_arrives():
+    pool = QuestionPool(['Python'])
+    assert not pool.wait(0, timeout=0.05)
+
+
+def test_wait_returns_when_generation_ends_empty():
+    pool = QuestionPool(['Python'])
+    threading.Timer(0.05, pool.finish).start()
+    assert pool.wait(0, timeout=5)
+    assert pool.is_complete and 'Python' not in pool
+
+
+def test_forward_supplies_present_and_pending_techs():
+    prefetch = QuestionPool(['Python', 'Django'])
+    prefetch.add('Python', ['p'])
+    pool = QuestionPool(['Python', 'Django', 'Go'])
+    assert prefetch.forward(['Python', 'Django', 'Go'], pool) == {'Python', 'Django'}
+    assert pool['Python'] == ['p']
+
+    pool.finish()  # the pool's own generation (Go) is done
+    assert not pool.is_complete  # still waiting on the forwarded Django
+    prefetch.add('Django', ['d'])
+    assert pool['Django'] == ['d']
+    prefetch.finish()
+    assert pool.is_complete
+
+
+def test_finished_prefetch_supplies_only_what_arrived():
+    prefetch = QuestionPool(['Python', 'Django'])
+    prefetch.add('Python', ['p'])
+    prefetch.finish()
+    pool = QuestionPool(['Python', 'Django'])
+    assert prefetch.forward(['Python', 'Django'], pool) == {'Python'}
+
+
+def test_prefetch_stats():
+    stats = PrefetchStats()
+    stats.record(['Python', 'Django', 'Flask', 'React'], ['Python', 'Django', 'Go'])
+    snapshot = stats.snapshot()
+    assert (snapshot['prefetched'], snapshot['hits'], snapshot['misses'], snapshot['wasted']) == (4, 2, 1, 2)
+    assert snapshot['hit_rate'] == 2 / 3
+    assert snapshot['waste_rate'] == 0.5
+
+
+def test_unused_prefetch_is_wasted():
+    stats = PrefetchStats()
+    stats.discard(['Python', 'Django'])
+    snapshot = stats.snapshot()
+    assert (snapshot['prefetched'], snapshot['wasted'], snapshot['waste_rate']) == (2, 2, 1.0)
+
+
+def test_errors_are_taken_once():
+    pool = QuestionPool(['Python', 'Go'])
+    pool.add_error('first')
+    assert pool.take_errors() == ['first']
+    pool.add_error('second')
+    assert pool.take_errors() == ['second']
+    assert pool.take_errors() == []
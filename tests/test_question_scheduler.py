@@ -0,0 +1,80 @@
+"""
+TalentScout - Question Scheduler Tests
+"""
+
+import threading
+
+from question_pool import QuestionPool
+from question_scheduler import (
+    QuestionScheduler,
+    asked_questions,
+    order_experience_weighted,
+    order_round_robin,
+    order_sequential,
+)
+
+PENDING = {'Python': [0, 1, 2], 'Go': [0, 1], 'SQL': [0]}
+QUESTIONS = {tech: [f"{tech} q{i}" for i in range(3)] for tech in ('Python', 'Go', 'SQL')}
+
+
+def ask_all(scheduler, questions):
+    asked = []
+    while True:
+        _, _, question_id = scheduler.next(questions)
+        if question_id is None:
+            return asked
+        asked.append(question_id)
+
+
+def test_sequential():
+    assert order_sequential(PENDING, 0) == [
+        ('Python', 0), ('Python', 1), ('Python', 2), ('Go', 0), ('Go', 1), ('SQL', 0)]
+
+
+def test_round_robin():
+    assert order_round_robin(PENDING, 0) == [
+        ('Python', 0), ('Go', 0), ('SQL', 0), ('Python', 1), ('Go', 1), ('Python', 2)]
+
+
+def test_experience_weighted():
+    # Juniors get an even spread
+    assert order_experience_weighted(PENDING, 0) == order_round_robin(PENDING, 0)
+    # Seniors get more questions on the technologies they listed first
+    pending = {tech: list(range(6)) for tech in ('Python', 'Go', 'SQL')}
+    first = [tech for tech, _ in order_experience_weighted(pending, 12)[:9]]
+    assert first.count('Python') > first.count('Go') > first.count('SQL')
+    assert sorted(order_experience_weighted(PENDING, 12)) == sorted(order_sequential(PENDING, 0))
+
+
+def test_every_question_is_asked_once_in_order():
+    scheduler = QuestionScheduler(['Python', 'Go', 'SQL'], ordering='round_robin')
+    asked = ask_all(scheduler, QUESTIONS)
+    assert asked[:3] == ['Python_0', 'Go_0', 'SQL_0']
+    assert sorted(asked) == sorted(f"{tech}_{i}" for tech in QUESTIONS for i in range(3))
+    assert scheduler.remaining() == 0
+
+
+def test_resume_after_restore_skips_asked_questions():
+    asked = ['Python_0', 'Go_0']
+    scheduler = QuestionScheduler(['Python', 'Go'], ordering='sequential', asked=asked)
+    assert ask_all(scheduler, QUESTIONS) == ['Python_1', 'Python_2', 'Go_1', 'Go_2']
+
+
+def test_waits_for_technologies_still_being_generated():
+    pool = QuestionPool(['Python', 'Go'])
+    pool.add('Python', ['p0'])
+    scheduler = QuestionScheduler(['Python', 'Go'])
+    assert scheduler.next(pool)[2] == 'Python_0'
+
+    def finish():
+        pool.add('Go', ['g0'])
+        pool.finish()
+
+    threading.Timer(0.05, finish).start()
+    assert scheduler.next(pool)[2] == 'Go_0'
+    assert scheduler.next(pool) == (None, None, None)
+
+
+def test_asked_questions_skips_unknown_ids():
+    assert asked_questions(['Python_1', 'Rust_0', 'Go_9', 'bad'], QUESTIONS) == [
+        ('Python_1', 'Python', 'Python q1')]
@@ -0,0 +1,139 @@
+"""
+TalentScout - Session Store Tests
+"""
+
+import os
+import threading
+
+import pytest
+
+import questions
+import session_store
+from engine import SessionState, get_next_question, record_score, resume_questions, session_turn
+from question_pool import QuestionPool
+from session_store import SessionStore, SQLiteSessionBackend, apply_delta, make_delta
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SessionStore(SQLiteSessionBackend(os.path.join(tmp_path, 'sessions.sqlite3')))
+
+
+def interview(session_id='s1'):
+    state = SessionState(session_id)
+    state.stage = 'answering'
+    state.candidate_info = {'name': 'Ann Lee', 'experience': 4}
+    state.tech_stack = ['Python', 'Go']
+    state.generated_questions = {'Python': ['p0', 'p1'], 'Go': ['g0']}
+    state.add_message("Hello!")
+    state.add_message("hi", is_user=True)
+    return state
+
+
+def test_first_save_is_a_full_snapshot_then_deltas():
+    state = interview()
+    delta, reset = make_delta(state)
+    assert reset
+    assert delta['stage'] == 'answering' and len(delta['messages']) == 2
+
+    assert make_delta(state) == (None, False)
+
+    state.add_message("answer", is_user=True)
+    state.candidate_info['location'] = 'Berlin'
+    delta, reset = make_delta(state)
+    assert not reset
+    assert delta['candidate_info'] == {'location': 'Berlin'}
+    assert [message['text'] for message in delta['messages']] == ['answer']
+    assert set(delta) == {'candidate_info', 'messages'}
+
+
+def test_deltas_merge_back_into_the_same_state():
+    state = interview()
+    replayed = SessionState(state.session_id)
+    apply_delta(replayed, make_delta(state)[0])
+    state.questions_asked.append('Python_0')
+    state.current_question = 'p0'
+    state.scores['Python_0'] = {'score': 7}
+    state.generated_questions['Rust'] = ['r0']
+    apply_delta(replayed, make_delta(state)[0])
+    assert replayed.to_dict() == state.to_dict()
+
+
+def test_store_round_trip_and_compaction(store, monkeypatch):
+    monkeypatch.setattr(session_store, 'SESSION_STORE_COMPACT_EVERY', 3)
+    state = interview()
+    for i in range(5):
+        state.add_message(f"message {i}", is_user=True)
+        store.save(state, wait=True)
+    # A snapshot after three deltas replaced the log
+    assert len(store.backend.read(state.session_id)) == 2
+    loaded = store.load(state.session_id, SessionState)
+    assert loaded.to_dict() == state.to_dict()
+    assert store.save(loaded) is None
+
+
+class ChangingQuestions(dict):
+    """Questions dict that lets another 'thread' change the state while a delta is being cut."""
+
+    def __init__(self, questions, change):
+        super().__init__(questions)
+        self.change = change
+
+    def items(self):
+        self.change()
+        return super().items()
+
+
+def test_changes_made_while_cutting_a_delta_are_saved_next_time():
+    state = interview()
+    make_delta(state)
+    state.generated_questions = ChangingQuestions(state.generated_questions, lambda: (
+        state.add_message("late", is_user=True), state.questions_asked.append('Go_0')))
+    state.current_question = 'p1'
+    make_delta(state)
+
+    state.generated_questions = dict(state.generated_questions)
+    delta, _ = make_delta(state)
+    assert [m['text'] for m in delta['messages']] == ['late']
+    assert delta['questions_asked'] == ['Go_0']
+
+
+def test_session_saved_mid_generation_resumes_it(store, monkeypatch):
+    state = interview()
+    pool = QuestionPool(state.tech_stack)
+    pool.add('Python', ['p0'])
+    state.generated_questions = pool
+    state.questions_asked.append('Python_0')
+    store.save(state, wait=True)
+
+    loaded = store.load(state.session_id, SessionState)
+    assert not loaded.generated_questions.is_complete
+
+    monkeypatch.setattr(questions, 'generate_questions_with_llm',
+                        lambda techs, on_result, on_error: [on_result(tech, [f"{tech} q"]) for tech in techs])
+    resume_questions(loaded)
+    assert get_next_question(loaded) == ('Go q', 'Go')
+    assert get_next_question(loaded) == (None, None)
+
+
+def test_finished_generation_is_not_resumed(store):
+    state = interview()
+    pool = QuestionPool(state.tech_stack)
+    pool.add('Python', ['p0'])
+    pool.finish()
+    state.generated_questions = pool
+    store.save(state, wait=True)
+    loaded = store.load(state.session_id, SessionState)
+    assert getattr(loaded.generated_questions, 'is_complete', True)
+
+
+def test_score_landing_during_a_turn_waits_for_it_to_end():
+    state = interview()
+    with session_turn(state):
+        worker = threading.Thread(target=record_score, args=(state, 'Python_0', {'score': 7}))
+        worker.start()
+        worker.join()
+        assert state.scores == {}
+    assert state.scores == {'Python_0': {'score': 7}}
+    record_score(state, 'Python_1', {'score': 5})
+    assert state.scores['Python_1'] == {'score': 5}
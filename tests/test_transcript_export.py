@@ -0,0 +1,60 @@
+"""
+TalentScout - Transcript Export Tests
+"""
+
+import os
+
+from transcript_export import OPEN_SUFFIX, TranscriptExporter, read_segment, segments
+
+
+def records(count, start=0):
+    return [{'session_id': f"s{i}", 'messages': [{'text': 'x' * 200, 'is_user': True}]}
+            for i in range(start, start + count)]
+
+
+def test_batches_are_read_back_in_order(tmp_path):
+    exporter = TranscriptExporter(str(tmp_path), flush_interval=0.05)
+    for record in records(5):
+        exporter.submit(record)
+    exporter.flush()
+    # Still open: only visible when asked for, but already readable
+    assert segments(str(tmp_path)) == []
+    [path] = segments(str(tmp_path), include_open=True)
+    assert path.endswith(OPEN_SUFFIX)
+    assert [r['session_id'] for r in read_segment(path)] == [f"s{i}" for i in range(5)]
+
+    exporter.close()
+    [path] = segments(str(tmp_path))
+    assert [r['session_id'] for r in read_segment(path)] == [f"s{i}" for i in range(5)]
+
+
+def test_segments_rotate_by_size(tmp_path):
+    exporter = TranscriptExporter(str(tmp_path), segment_bytes=1, flush_interval=0.05)
+    exporter.write_batch(records(2))
+    exporter.write_batch(records(2, 2))
+    exporter.write_batch(records(2, 4))
+    exporter.close()
+    paths = segments(str(tmp_path))
+    assert len(paths) == 3
+    assert [r['session_id'] for path in paths for r in read_segment(path)] == [f"s{i}" for i in range(6)]
+
+
+def test_segments_rotate_by_age(tmp_path):
+    exporter = TranscriptExporter(str(tmp_path), segment_seconds=0, flush_interval=0.05)
+    exporter.write_batch(records(1))
+    exporter.write_batch(records(1, 1))
+    exporter.close()
+    assert len(segments(str(tmp_path))) == 2
+
+
+def test_truncated_segment_keeps_complete_batches(tmp_path):
+    exporter = TranscriptExporter(str(tmp_path), flush_interval=0.05)
+    exporter.write_batch(records(3))
+    second = exporter.write_batch(records(3, 3))
+    exporter.close()
+    [path] = segments(str(tmp_path))
+
+    # A crash part way through writing the second batch
+    with open(path, 'r+b') as f:
+        f.truncate(os.path.getsize(path) - second // 2)
+    assert [r['session_id'] for r in read_segment(path)] == ['s0', 's1', 's2']
@@ -0,0 +1,157 @@
+"""
+TalentScout - Transcript
+Compact chat transcript that keeps recent messages in memory and spills
+older ones to a per-session file on disk.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+import weakref
+from array import array
+from datetime import datetime
+
+# Messages kept in memory per session before older ones are spilled
+TRANSCRIPT_MEMORY_MESSAGES = int(os.getenv('TRANSCRIPT_MEMORY_MESSAGES', '200'))
+# Directory for spilled messages (empty keeps every message in memory)
+TRANSCRIPT_SPILL_DIR = os.getenv('TRANSCRIPT_SPILL_DIR', '.cache/transcripts')
+
+
+class Message:
+    """One chat message with an integer (epoch seconds) timestamp."""
+
+    __slots__ = ('text', 'is_user', 'timestamp')
+
+    def __init__(self, text, is_user=False, timestamp=None):
+        # Bot messages repeat across sessions, so share one copy of each
+        self.text = text if is_user else sys.intern(text)
+        self.is_user = is_user
+        self.timestamp = int(time.time()) if timestamp is None else timestamp
+
+    def to_dict(self):
+        return {
+            'text': self.text,
+            'is_user': self.is_user,
+            'timestamp': datetime.fromtimestamp(self.timestamp).isoformat(),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        timestamp = data.get('timestamp')
+        if isinstance(timestamp, str):
+            timestamp = int(datetime.fromisoformat(timestamp).timestamp())
+        return cls(data['text'], bool(data.get('is_user')), timestamp)
+
+    def size(self):
+        """Approximate bytes held by this message."""
+        size = sys.getsizeof(self) + sys.getsizeof(self.timestamp)
+        return size + (sys.getsizeof(self.text) if self.is_user else 0)
+
+
+def _remove_file(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class Transcript:
+    """Append-only message list indexed from the first message of the session.
+
+    Once more than `keep` messages are in memory, the oldest are written to a
+    spill file and read back only when something asks for them (paging back
+    through the chat, exports, full snapshots).
+    """
+
+    def __init__(self, keep=None, spill_dir=None):
+        self.keep = TRANSCRIPT_MEMORY_MESSAGES if keep is None else keep
+        self.spill_dir = TRANSCRIPT_SPILL_DIR if spill_dir is None else spill_dir
+        self._recent = []
+        self._offsets = array('Q', [0])
+        self._path = None
+        self._finalizer = None
+        self._bytes = 0
+
+    def __len__(self):
+        return len(self._offsets) - 1 + len(self._recent)
+
+    @property
+    def spilled(self):
+        """Number of messages that live on disk."""
+        return len(self._offsets) - 1
+
+    def append(self, message):
+        self._recent.append(message)
+        self._bytes += message.size()
+        if self.spill_dir and self.keep and len(self._recent) > self.keep:
+            self._spill(len(self._recent) - self.keep // 2)
+
+    def extend(self, messages):
+        for message in messages:
+            self.append(message)
+
+    def _spill(self, count):
+        if self._path is None:
+            os.makedirs(self.spill_dir, exist_ok=True)
+            fd, self._path = tempfile.mkstemp(suffix='.jsonl', prefix='transcript-', dir=self.spill_dir)
+            os.close(fd)
+            self._finalizer = weakref.finalize(self, _remove_file, self._path)
+
+        spilled, self._recent = self._recent[:count], self._recent[count:]
+        end = self._offsets[-1]
+        with open(self._path, 'ab') as f:
+            for message in spilled:
+                line = json.dumps([message.text, message.is_user, message.timestamp],
+                                  ensure_ascii=False).encode('utf-8') + b'\n'
+                f.write(line)
+                end += len(line)
+                self._offsets.append(end)
+                self._bytes -= message.size()
+
+    def _read_spilled(self, start, stop):
+        if start >= stop:
+            return []
+        with open(self._path, 'rb') as f:
+            f.seek(self._offsets[start])
+            data = f.read(self._offsets[stop] - self._offsets[start])
+        return [Message(*json.loads(line)) for line in data.splitlines()]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            spilled = self.spilled
+            head = self._read_spilled(min(start, spilled), min(stop, spilled))
+            return head + self._recent[max(start - spilled, 0):max(stop - spilled, 0)]
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('transcript index out of range')
+        if index >= self.spilled:
+            return self._recent[index - self.spilled]
+        return self._read_spilled(index, index + 1)[0]
+
+    def __iter__(self):
+        return iter(self[:])
+
+    def to_list(self):
+        """Return every message as a JSON-serializable dict."""
+        return [message.to_dict() for message in self]
+
+    def memory_bytes(self):
+        """Approximate bytes this transcript holds in memory."""
+        return (self._bytes + sys.getsizeof(self._recent) + self._offsets.itemsize * len(self._offsets))
+
+    def close(self):
+        """Drop every message and delete the spill file."""
+        self._recent = []
+        self._offsets = array('Q', [0])
+        self._bytes = 0
+        if self._finalizer is not None:
+            self._finalizer()
+            self._finalizer = None
+            self._path = None
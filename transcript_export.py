@@ -0,0 +1,287 @@
+"""
+TalentScout - Transcript Export
+Appends every finished interview to rotating, compressed JSON Lines segments
+for downstream applicant tracking systems, from a background writer.
+
+Usage:
+    python transcript_export.py list
+    python transcript_export.py read transcripts-20250101-090000-1234-0001.jsonl.gz > day.jsonl
+    python transcript_export.py stats
+"""
+
+import argparse
+import atexit
+import gzip
+import io
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from datetime import datetime
+
+if __name__ == "__main__":
+    # Run as a command: load .env before this module and its imports read their settings
+    from dotenv import load_dotenv
+    load_dotenv()
+
+from metrics import metrics  # noqa: E402
+from question_scheduler import asked_questions  # noqa: E402
+
+# Export settings (empty directory disables the export)
+TRANSCRIPT_EXPORT_DIR = os.getenv('TRANSCRIPT_EXPORT_DIR', '')
+# gzip, or zstd with `pip install zstandard`
+TRANSCRIPT_EXPORT_COMPRESSION = os.getenv('TRANSCRIPT_EXPORT_COMPRESSION', 'gzip')
+# A segment is sealed once it holds this many compressed bytes or has been open this long
+TRANSCRIPT_EXPORT_SEGMENT_BYTES = int(os.getenv('TRANSCRIPT_EXPORT_SEGMENT_BYTES', str(64 * 1024 * 1024)))
+TRANSCRIPT_EXPORT_SEGMENT_SECONDS = float(os.getenv('TRANSCRIPT_EXPORT_SEGMENT_SECONDS', '3600'))
+TRANSCRIPT_EXPORT_FLUSH_INTERVAL = float(os.getenv('TRANSCRIPT_EXPORT_FLUSH_INTERVAL', '1.0'))
+
+MAX_BATCH = 1000
+EXTENSIONS = {'gzip': '.jsonl.gz', 'zstd': '.jsonl.zst'}
+# Segments still being written carry this suffix until they are sealed
+OPEN_SUFFIX = '.part'
+
+
+def transcript_record(state):
+    """Build the export record for a session: candidate details, questions asked and every message."""
+    return {
+        'session_id': state.session_id,
+        'exported_at': datetime.now().isoformat(timespec='seconds'),
+        'candidate_info': dict(state.candidate_info),
+        'tech_stack': list(state.tech_stack),
+        'questions': [{'id': question_id, 'tech': tech, 'question': text}
+                      for question_id, tech, text in asked_questions(state.questions_asked, state.generated_questions)],
+        'messages': state.messages.to_list(),
+    }
+
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError:
+        raise RuntimeError("zstd transcript export needs the 'zstandard' package")
+    return zstandard
+
+
+def compressor(compression):
+    """Return a function compressing bytes into one self-contained gzip member or zstd frame.
+
+    Members and frames can be concatenated, so each batch is appended to the
+    segment as it is and a segment cut short by a crash is still readable up
+    to its last complete batch.
+    """
+    if compression == 'gzip':
+        return lambda data: gzip.compress(data, compresslevel=6)
+    if compression == 'zstd':
+        return _zstandard().ZstdCompressor(level=3).compress
+    raise ValueError(f"unknown transcript export compression: {compression}")
+
+
+class TranscriptExporter:
+    """Batching writer that appends records to the current segment and rotates it.
+
+    Segments are named transcripts-<opened>-<pid>-<sequence> so several
+    processes can export into one directory, and keep the OPEN_SUFFIX until
+    they are sealed, so a consumer only has to pick up sealed ones.
+    """
+
+    def __init__(self, directory, compression=TRANSCRIPT_EXPORT_COMPRESSION,
+                 segment_bytes=TRANSCRIPT_EXPORT_SEGMENT_BYTES, segment_seconds=TRANSCRIPT_EXPORT_SEGMENT_SECONDS,
+                 flush_interval=TRANSCRIPT_EXPORT_FLUSH_INTERVAL):
+        self.directory = directory
+        self.compression = compression
+        self.segment_bytes = segment_bytes
+        self.segment_seconds = segment_seconds
+        self.flush_interval = flush_interval
+        self._compress = compressor(compression)
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._file = None
+        self._path = None
+        self._opened_at = 0.0
+        self._size = 0
+        self._sequence = 0
+
+        os.makedirs(directory, exist_ok=True)
+        threading.Thread(target=self._writer, name='transcript-export', daemon=True).start()
+        atexit.register(self.close)
+
+    def submit(self, record):
+        """Queue a record for export."""
+        self._queue.put(record)
+
+    def flush(self):
+        """Block until everything queued so far has been written."""
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait()
+
+    def close(self):
+        """Write everything queued and seal the current segment."""
+        self.flush()
+        with self._lock:
+            self._seal()
+
+    def _writer(self):
+        while True:
+            try:
+                batch = [self._queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                # Seal segments that went quiet once their time is up
+                with self._lock:
+                    self._rotate_if_due()
+                continue
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < MAX_BATCH:
+                remaining = deadline - time.monotonic()
+                try:
+                    batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            records = [item for item in batch if isinstance(item, dict)]
+            started = time.perf_counter()
+            try:
+                if records:
+                    written = self.write_batch(records)
+                    metrics.observe('transcript_export_write_seconds', time.perf_counter() - started)
+                    metrics.inc('transcript_export_records_total', len(records))
+                    metrics.inc('transcript_export_bytes_total', written)
+            except Exception as e:
+                metrics.inc('transcript_export_errors_total', error=type(e).__name__)
+            finally:
+                for item in batch:
+                    if isinstance(item, threading.Event):
+                        item.set()
+
+    def write_batch(self, records):
+        """Append records to the current segment as one compressed block; return its size."""
+        data = b''.join(json.dumps(record, ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b'\n'
+                        for record in records)
+        block = self._compress(data)
+        with self._lock:
+            self._rotate_if_due()
+            if self._file is None:
+                self._open()
+            self._file.write(block)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._size += len(block)
+        return len(block)
+
+    def _open(self):
+        self._sequence += 1
+        name = (f"transcripts-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{self._sequence:04d}"
+                f"{EXTENSIONS[self.compression]}")
+        self._path = os.path.join(self.directory, name)
+        self._file = open(self._path + OPEN_SUFFIX, 'ab')
+        self._opened_at = time.monotonic()
+        self._size = 0
+
+    def _rotate_if_due(self):
+        if self._file is not None and (self._size >= self.segment_bytes or
+                                       time.monotonic() - self._opened_at >= self.segment_seconds):
+            self._seal()
+
+    def _seal(self):
+        if self._file is None:
+            return
+        self._file.close()
+        os.replace(self._path + OPEN_SUFFIX, self._path)
+        self._file = None
+        metrics.inc('transcript_export_segments_total')
+
+
+def segments(directory, include_open=False):
+    """Return segment paths in the order they were opened."""
+    if not os.path.isdir(directory):
+        return []
+    names = [name for name in os.listdir(directory) if name.startswith('transcripts-') and (
+        name.endswith(tuple(EXTENSIONS.values())) or
+        include_open and name.endswith(tuple(ext + OPEN_SUFFIX for ext in EXTENSIONS.values())))]
+    return [os.path.join(directory, name) for name in sorted(names)]
+
+
+def read_segment(path):
+    """Yield the records of a segment one at a time, in bounded memory.
+
+    A segment that is still open, or was cut short by a crash, yields every
+    complete record it holds.
+    """
+    with open(path, 'rb') as raw:
+        if '.jsonl.zst' in os.path.basename(path):
+            stream = _zstandard().ZstdDecompressor().stream_reader(raw, read_across_frames=True)
+        else:
+            stream = gzip.GzipFile(fileobj=raw)
+        try:
+            for line in io.TextIOWrapper(stream, encoding='utf-8'):
+                if line.endswith('\n'):
+                    yield json.loads(line)
+        except EOFError:
+            return
+
+
+_exporter = None
+_exporter_lock = threading.Lock()
+
+
+def get_transcript_exporter():
+    """Return the process-wide exporter, or None when TRANSCRIPT_EXPORT_DIR is empty."""
+    global _exporter
+    if not TRANSCRIPT_EXPORT_DIR:
+        return None
+    if _exporter is None:
+        with _exporter_lock:
+            if _exporter is None:
+                _exporter = TranscriptExporter(TRANSCRIPT_EXPORT_DIR)
+    return _exporter
+
+
+def cmd_list(args):
+    for path in segments(args.dir, include_open=True):
+        print(f"{os.path.getsize(path):>12}  {os.path.basename(path)}")
+
+
+def cmd_read(args):
+    path = args.segment if os.path.exists(args.segment) else os.path.join(args.dir, args.segment)
+    for record in read_segment(path):
+        sys.stdout.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+
+def cmd_stats(args):
+    paths = segments(args.dir, include_open=True)
+    records = messages = 0
+    for path in paths:
+        for record in read_segment(path):
+            records += 1
+            messages += len(record.get('messages', ()))
+    print(json.dumps({
+        'segments': len(paths),
+        'open_segments': sum(path.endswith(OPEN_SUFFIX) for path in paths),
+        'compressed_bytes': sum(os.path.getsize(path) for path in paths),
+        'transcripts': records,
+        'messages': messages,
+    }, indent=2))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect exported interview transcripts.")
+    parser.add_argument('--dir', default=TRANSCRIPT_EXPORT_DIR or '.cache/exports', help="export directory")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    commands.add_parser('list', help="list segments with their compressed size").set_defaults(func=cmd_list)
+
+    read = commands.add_parser('read', help="write a segment's transcripts to stdout as JSON Lines")
+    read.add_argument('segment')
+    read.set_defaults(func=cmd_read)
+
+    commands.add_parser('stats', help="count transcripts and messages").set_defaults(func=cmd_stats)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()